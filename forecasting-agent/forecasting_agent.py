@@ -14,41 +14,141 @@ Day Check Integration:
 - Date context available to all agents/skills
 """
 
-import csv
+from __future__ import annotations
+
+import atexit
+import sys
+import time
+
+
+class _ImportProfiler:
+    """Records wall time of first-time imports (for --profile-startup)"""
+
+    def __init__(self):
+        import builtins
+        self._builtins = builtins
+        self._original_import = builtins.__import__
+        self._depth = 0
+        self.timings: List[Tuple[str, int, float]] = []
+
+    def install(self) -> None:
+        self._builtins.__import__ = self._import
+        # Report on any exit, including argparse's exit for --help
+        atexit.register(self._print_report)
+
+    def uninstall(self) -> None:
+        self._builtins.__import__ = self._original_import
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.timings.append((name, self._depth, time.perf_counter() - start))
+
+    def _print_report(self) -> None:
+        self.uninstall()
+        print(self.report(), file=sys.stderr)
+
+    def report(self, limit: int = 15) -> str:
+        """Top-level imports sorted by cumulative time"""
+        top_level = sorted((t for t in self.timings if t[1] == 0), key=lambda t: t[2], reverse=True)
+        total = sum(t[2] for t in top_level)
+        lines = [f"Startup imports: {total * 1000:.1f} ms across {len(self.timings)} modules"]
+        for name, _, elapsed in top_level[:limit]:
+            lines.append(f"  {elapsed * 1000:8.1f} ms  {name}")
+        return '\n'.join(lines)
+
+
+# Installed before the remaining imports so that they appear in the report
+if __name__ == '__main__' and '--profile-startup' in sys.argv:
+    _ImportProfiler().install()
+
 import json
 import logging
-import numpy as np
-import pandas as pd
-import yaml
-import sys
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
-
-# Day check integration
-try:
-    day_check_path = Path.home() / ".local" / "lib"
-    sys.path.insert(0, str(day_check_path))
-    from day_check import inject_day_context, DayCheck
-    DAY_CHECK_AVAILABLE = True
-except ImportError:
-    DAY_CHECK_AVAILABLE = False
-
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Any
+
+# numpy/pandas (and the monte_carlo/portfolio_core modules built on them)
+# are imported inside the methods that need them, so --help and hook-driven
+# runs do not pay for them at startup.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from portfolio_core.config import PortfolioConfig
+
 logger = logging.getLogger('forecasting_agent')
 
-# Log session start with day context
-if DAY_CHECK_AVAILABLE:
-    day_context = inject_day_context()
-    logger.info(f"Forecasting Agent started on {day_context['day_name']}, {day_context['current_day']}")
-else:
-    logger.warning("Day check not available - using system datetime")
+EXPORT_FORMATS = ('csv', 'parquet', 'feather')
+
+# Monthly growth models: 'winner_only' (the default everywhere) compounds every
+# trade at avg_winner_pct; 'expected' weights winners and losers by win rate
+PROJECTION_MODELS = ('winner_only', 'expected')
+
+DAY_CHECK_AVAILABLE: Optional[bool] = None
+
+# Shared portfolio_core package lives at the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _ensure_portfolio_core() -> None:
+    """Make portfolio_core importable when running from a checkout (called on agent init)"""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.append(str(REPO_ROOT))
+
+
+def _log_session_start() -> None:
+    """Day check integration: log the session day once per process"""
+    global DAY_CHECK_AVAILABLE
+    if DAY_CHECK_AVAILABLE is not None:
+        return
+
+    try:
+        day_check_path = Path.home() / ".local" / "lib"
+        if str(day_check_path) not in sys.path:
+            sys.path.insert(0, str(day_check_path))
+        from day_check import inject_day_context
+        DAY_CHECK_AVAILABLE = True
+    except ImportError:
+        DAY_CHECK_AVAILABLE = False
+
+    # Log session start with day context
+    if DAY_CHECK_AVAILABLE:
+        day_context = inject_day_context()
+        logger.info(f"Forecasting Agent started on {day_context['day_name']}, {day_context['current_day']}")
+    else:
+        logger.warning("Day check not available - using system datetime")
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily re-export MonteCarloParams, which lives in the numpy-backed monte_carlo module"""
+    if name == 'MonteCarloParams':
+        from monte_carlo import MonteCarloParams
+        return MonteCarloParams
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def monthly_factor(model: str, win_rate, avg_winner_pct, avg_loser_pct, trades_per_month):
+    """
+    Pre-tax monthly growth factor under one of PROJECTION_MODELS (broadcasts over arrays)
+
+    winner_only: (1 + avg_winner_pct) ** trades_per_month
+    expected:    (1 + win_rate * avg_winner_pct + (1 - win_rate) * avg_loser_pct) ** trades_per_month
+    """
+    if model == 'winner_only':
+        return (1 + avg_winner_pct) ** trades_per_month
+    if model == 'expected':
+        from portfolio_core.projection import expected_monthly_factor
+        return expected_monthly_factor(win_rate, avg_winner_pct, avg_loser_pct, trades_per_month)
+    raise ValueError(f"Unknown projection model: {model} (expected one of {PROJECTION_MODELS})")
 
 
 @dataclass
@@ -63,19 +163,7 @@ class ForecastParams:
     tax_rate: float
     forecast_years: int
     scenario_name: str
-
-
-@dataclass
-class MonteCarloParams:
-    """Monte Carlo simulation parameters"""
-    paths: int
-    months: int
-    trades_per_month: float
-    win_probability: float
-    avg_winner_pct: float
-    avg_loser_pct: float
-    monthly_deposits: float
-    initial_capital: float
+    start_date: Optional[str] = None  # First projected month (YYYY-MM-DD); default: current month
 
 
 class PortfolioForecastingAgent:
@@ -88,17 +176,25 @@ class PortfolioForecastingAgent:
         Args:
             config_path: Path to PORTFOLIO_PARAMETERS_COMPLETE.yaml
         """
-        self.config_path = config_path or "/home/aaron/projects/portfolio/PORTFOLIO_PARAMETERS_COMPLETE.yaml"
-        self.config = self._load_config()
+        _log_session_start()
+        _ensure_portfolio_core()
+
+        from portfolio_core.config import DEFAULT_CONFIG_PATH
+
+        self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self.params = self._load_config()
+        self.config = self.params.raw
         self.results = {}
+        self.monte_carlo_results = {}
 
         logger.info(f"Initialized PortfolioForecastingAgent with config: {self.config_path}")
 
-    def _load_config(self) -> Dict:
-        """Load configuration from YAML file"""
+    def _load_config(self) -> PortfolioConfig:
+        """Load configuration from YAML (cached on file mtime and hash)"""
+        from portfolio_core.config import load_portfolio_config
+
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = load_portfolio_config(self.config_path)
             logger.info("Configuration loaded successfully")
             return config
         except Exception as e:
@@ -115,27 +211,20 @@ class PortfolioForecastingAgent:
         Returns:
             DataFrame with trading metrics
         """
+        import pandas as pd
+
+        from portfolio_core.ib_statement import parse_statement
+
         logger.info(f"Loading trading data from: {csv_path}")
 
         try:
-            # Parse IB CSV
-            trades = []
-            with open(csv_path, 'r') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) < 3:
-                        continue
-                    if row[0] == 'Trades' and row[1] == 'Data' and row[2] == 'Order':
-                        # Extract trade data
-                        # This is simplified - extend based on actual CSV format
-                        trades.append({
-                            'symbol': row[5] if len(row) > 5 else '',
-                            'date': row[6] if len(row) > 6 else '',
-                            'quantity': float(row[7]) if len(row) > 7 else 0,
-                            'price': float(row[8]) if len(row) > 8 else 0,
-                        })
-
-            df = pd.DataFrame(trades)
+            executions = parse_statement(csv_path).executions()
+            df = pd.DataFrame({
+                'symbol': executions['symbol'],
+                'date': executions['datetime'],
+                'quantity': executions['quantity'],
+                'price': executions['price'],
+            })
             logger.info(f"Loaded {len(df)} trades from CSV")
             return df
 
@@ -143,6 +232,33 @@ class PortfolioForecastingAgent:
             logger.error(f"Failed to load trading data: {e}")
             raise
 
+    def load_trade_returns(self, csv_path: str, lot_method: str = 'fifo') -> np.ndarray:
+        """
+        Realized per-trade returns for the bootstrap Monte Carlo methods
+
+        Round trips are matched from the statement's stock executions the
+        same way TradingAnalysisAgent builds them.
+
+        Args:
+            csv_path: Path to Interactive Brokers CSV statement
+            lot_method: Lot matching method (fifo, lifo, hifo)
+
+        Returns:
+            Array of trade returns as fractions (0.02 = +2%), in exit order
+        """
+        import numpy as np
+
+        from portfolio_core.ib_statement import parse_statement
+        from portfolio_core.lots import match_executions
+
+        executions = parse_statement(csv_path).executions('Stocks')
+        table = match_executions(executions, method=lot_method).table()
+        order = np.argsort(table.exit_time, kind='stable')
+        returns = table.return_pct[order] / 100
+
+        logger.info(f"Loaded {len(returns)} realized trade returns from {csv_path}")
+        return returns
+
     def calculate_metrics(self, trades_df: Optional[pd.DataFrame] = None) -> Dict:
         """
         Calculate trading metrics from CSV or use config defaults
@@ -162,12 +278,12 @@ class PortfolioForecastingAgent:
             # Use config defaults
             logger.info("Using config defaults for metrics")
             metrics = {
-                'win_rate': self.config['trading']['win_rate']['actual'] / 100,
-                'avg_winner_pct': self.config['trading']['return_per_trade']['all_time_avg'] / 100,
-                'avg_loser_pct': self.config['trading']['loss_parameters']['avg_loser_pct'] / 100,
-                'trades_per_month': self.config['trading']['trade_frequency']['trades_per_month']['baseline'],
-                'initial_capital': self.config['account']['initial_capital'],
-                'monthly_deposits': self.config['account']['monthly_deposits'],
+                'win_rate': self.params.trading.win_rate,
+                'avg_winner_pct': self.params.trading.avg_return_pct,
+                'avg_loser_pct': self.params.trading.avg_loser_pct,
+                'trades_per_month': self.params.trading.trades_per_month_baseline,
+                'initial_capital': self.params.account.initial_capital,
+                'monthly_deposits': self.params.account.monthly_deposits,
             }
 
         return metrics
@@ -175,7 +291,8 @@ class PortfolioForecastingAgent:
     def run_projection(self,
                       years: int = 3,
                       scenario: str = 'baseline',
-                      extract_tax: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
+                      extract_tax: bool = True,
+                      start_date: Optional[str] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict]:
         """
         Run multi-year portfolio projection
 
@@ -183,49 +300,47 @@ class PortfolioForecastingAgent:
             years: Number of years to project (3 or 5)
             scenario: 'conservative', 'baseline', or 'aggressive'
             extract_tax: Whether to extract quarterly tax reserves
+            start_date: First projected month (default: the current month)
 
         Returns:
-            (monthly_df, quarterly_df, summary_dict)
+            (monthly, quarterly, summary_dict); monthly and quarterly map
+            column names to NumPy arrays (see export_results for tables)
         """
         logger.info(f"Running {years}-year {scenario} projection")
 
         # Get scenario parameters
-        if scenario == 'conservative':
-            trades_per_month = self.config['trading']['trade_frequency']['trades_per_month']['conservative']
-        elif scenario == 'aggressive':
-            trades_per_month = self.config['trading']['trade_frequency']['trades_per_month']['aggressive']
-        else:
-            trades_per_month = self.config['trading']['trade_frequency']['trades_per_month']['baseline']
+        trades_per_month = self.params.trading.trades_per_month(scenario)
 
         # Build params
         params = ForecastParams(
-            initial_capital=self.config['account']['initial_capital'],
-            monthly_deposits=self.config['account']['monthly_deposits'],
+            initial_capital=self.params.account.initial_capital,
+            monthly_deposits=self.params.account.monthly_deposits,
             trades_per_month=trades_per_month,
-            win_rate=self.config['trading']['win_rate']['actual'] / 100,
-            avg_winner_pct=self.config['trading']['return_per_trade']['all_time_avg'] / 100,
-            avg_loser_pct=self.config['trading']['loss_parameters']['avg_loser_pct'] / 100,
-            tax_rate=self.config['tax']['quarterly_extraction_pct'] / 100 if extract_tax else 0,
+            win_rate=self.params.trading.win_rate,
+            avg_winner_pct=self.params.trading.avg_return_pct,
+            avg_loser_pct=self.params.trading.avg_loser_pct,
+            tax_rate=self.params.tax.quarterly_extraction_rate if extract_tax else 0,
             forecast_years=years,
-            scenario_name=scenario
+            scenario_name=scenario,
+            start_date=start_date or datetime.now().strftime('%Y-%m-01'),
         )
 
         # Run projection
-        monthly_df, quarterly_df, summary = self._forecast_with_params(params)
+        monthly, quarterly, summary = self._forecast_with_params(params)
 
         # Store results
         self.results[f'{scenario}_{years}y'] = {
-            'monthly': monthly_df,
-            'quarterly': quarterly_df,
+            'monthly': monthly,
+            'quarterly': quarterly,
             'summary': summary,
             'params': asdict(params)
         }
 
         logger.info(f"Projection complete. Final balance: ${summary['final_balance']:,.2f}")
 
-        return monthly_df, quarterly_df, summary
+        return monthly, quarterly, summary
 
-    def _forecast_with_params(self, params: ForecastParams) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
+    def _forecast_with_params(self, params: ForecastParams) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict]:
         """
         Internal forecast calculation
 
@@ -233,119 +348,162 @@ class PortfolioForecastingAgent:
             params: ForecastParams object
 
         Returns:
-            (monthly_df, quarterly_df, summary)
+            (monthly, quarterly, summary) with columnar NumPy results
         """
-        # Calculate monthly compounding factor
-        # Formula: (1 + avg_winner_pct)^trades_per_month * win_rate +
-        #          (1 + avg_loser_pct)^trades_per_month * (1 - win_rate)
-        # Simplified to: (1 + return_per_trade)^trades_per_month
-        return_per_trade = params.avg_winner_pct
-        monthly_factor = (1 + return_per_trade) ** params.trades_per_month
+        import numpy as np
+        from portfolio_core.projection import project_monthly
+
+        # Monthly compounding factor; sweep() uses the same model by default
+        factor = monthly_factor('winner_only', params.win_rate, params.avg_winner_pct,
+                                params.avg_loser_pct, params.trades_per_month)
 
         total_months = params.forecast_years * 12
-        periods_data = []
-
-        balance = params.initial_capital
-        tax_reserve = 0.0
-        cumulative_gains = 0.0
-        cumulative_taxes = 0.0
-
-        for month in range(1, total_months + 1):
-            # Calculate gains this month
-            pre_growth = balance
-            balance_after_growth = balance * monthly_factor
-            gains_this_month = balance_after_growth - balance
-
-            # Extract tax if enabled
-            if params.tax_rate > 0:
-                tax_this_month = gains_this_month * params.tax_rate
-                cumulative_taxes += tax_this_month
-                tax_reserve += tax_this_month
-                balance = balance_after_growth - tax_this_month
-            else:
-                tax_this_month = 0
-                balance = balance_after_growth
-
-            # Add monthly deposit
-            balance += params.monthly_deposits
-
-            # Track cumulative
-            cumulative_gains += gains_this_month
-
-            periods_data.append({
-                'Month': month,
-                'Year': (month - 1) // 12 + 1,
-                'Quarter': f"Y{(month - 1) // 12 + 1}Q{((month - 1) % 12) // 3 + 1}",
-                'Starting_Balance': pre_growth,
-                'Monthly_Factor': monthly_factor,
-                'Balance_After_Growth': balance_after_growth,
-                'Gains_This_Month': gains_this_month,
-                'Tax_Extracted': tax_this_month,
-                'Deposit': params.monthly_deposits,
-                'Ending_Balance': balance,
-                'Cumulative_Gains': cumulative_gains,
-                'Cumulative_Taxes': cumulative_taxes,
-                'Tax_Reserve': tax_reserve,
-            })
+        projected = project_monthly(params.initial_capital, params.monthly_deposits,
+                                    factor, params.tax_rate, total_months)
+
+        month = np.arange(1, total_months + 1)
+        first_month = np.datetime64(params.start_date or datetime.now().strftime('%Y-%m'), 'M')
+        year = (month - 1) // 12 + 1
+        quarter = ((month - 1) % 12) // 3 + 1
+        quarter_labels = np.array([f"Y{y}Q{q}" for y, q in zip(year[2::3], quarter[2::3])])
+
+        monthly = {
+            'Month': month,
+            'Date': (first_month + month - 1).astype('datetime64[D]'),
+            'Year': year,
+            'Quarter': np.repeat(quarter_labels, 3),
+            'Starting_Balance': projected['starting_balance'],
+            'Monthly_Factor': np.full(total_months, factor),
+            'Balance_After_Growth': projected['balance_after_growth'],
+            'Gains_This_Month': projected['gains'],
+            'Tax_Extracted': projected['taxes'],
+            'Deposit': np.full(total_months, float(params.monthly_deposits)),
+            'Ending_Balance': projected['ending_balance'],
+            'Cumulative_Gains': projected['cumulative_gains'],
+            'Cumulative_Taxes': projected['cumulative_taxes'],
+            'Tax_Reserve': projected['cumulative_taxes'],
+        }
 
-        # Create DataFrames
-        monthly_df = pd.DataFrame(periods_data)
-
-        # Quarterly summary
-        quarterly_data = []
-        for year in range(1, params.forecast_years + 1):
-            for quarter in range(1, 5):
-                month_end = year * 12 if quarter == 4 else (year - 1) * 12 + quarter * 3
-                if month_end > total_months:
-                    continue
-
-                row = periods_data[month_end - 1]
-                month_start = (year - 1) * 12 + (quarter - 1) * 3 + 1
-
-                if month_start > 1:
-                    start_row = periods_data[month_start - 2]
-                    q_gains = row['Cumulative_Gains'] - start_row['Cumulative_Gains']
-                    q_taxes = row['Cumulative_Taxes'] - start_row['Cumulative_Taxes']
-                    start_balance = start_row['Ending_Balance']
-                else:
-                    q_gains = row['Cumulative_Gains']
-                    q_taxes = row['Cumulative_Taxes']
-                    start_balance = params.initial_capital
-
-                quarterly_data.append({
-                    'Quarter': f'Y{year}Q{quarter}',
-                    'Starting_Balance': start_balance,
-                    'Deposits': params.monthly_deposits * 3,
-                    'Gains': q_gains,
-                    'Tax_Reserved': q_taxes,
-                    'Net_Gains': q_gains - q_taxes,
-                    'Ending_Balance': row['Ending_Balance'],
-                    'Tax_Reserve_Account': row['Tax_Reserve'],
-                })
-
-        quarterly_df = pd.DataFrame(quarterly_data)
+        # Quarterly summary from 3-month blocks
+        quarterly_gains = projected['gains'].reshape(-1, 3).sum(axis=1)
+        quarterly_taxes = projected['taxes'].reshape(-1, 3).sum(axis=1)
+
+        quarterly = {
+            'Quarter': quarter_labels,
+            'Starting_Balance': projected['starting_balance'][::3],
+            'Deposits': np.full(len(quarter_labels), params.monthly_deposits * 3.0),
+            'Gains': quarterly_gains,
+            'Tax_Reserved': quarterly_taxes,
+            'Net_Gains': quarterly_gains - quarterly_taxes,
+            'Ending_Balance': projected['ending_balance'][2::3],
+            'Tax_Reserve_Account': projected['cumulative_taxes'][2::3],
+        }
 
         # Summary
-        final_row = periods_data[-1]
+        final_balance = float(projected['ending_balance'][-1])
+        total_gains = float(projected['cumulative_gains'][-1])
+        total_taxes = float(projected['cumulative_taxes'][-1])
         summary = {
             'scenario': params.scenario_name,
             'years': params.forecast_years,
-            'final_balance': final_row['Ending_Balance'],
-            'total_gains': final_row['Cumulative_Gains'],
-            'total_taxes_reserved': final_row['Cumulative_Taxes'],
-            'tax_reserve_account': final_row['Tax_Reserve'],
-            'liquid_net_worth': final_row['Ending_Balance'] + final_row['Tax_Reserve'],
+            'final_balance': final_balance,
+            'total_gains': total_gains,
+            'total_taxes_reserved': total_taxes,
+            'tax_reserve_account': total_taxes,
+            'liquid_net_worth': final_balance + total_taxes,
             'total_deposits': params.monthly_deposits * total_months,
             'capital_invested': params.initial_capital + (params.monthly_deposits * total_months),
-            'roi_pct': ((final_row['Ending_Balance'] - params.initial_capital) / params.initial_capital) * 100,
+            'roi_pct': ((final_balance - params.initial_capital) / params.initial_capital) * 100,
         }
 
-        return monthly_df, quarterly_df, summary
+        return monthly, quarterly, summary
+
+    def sweep(self,
+              years: int = 3,
+              win_rate: Optional[Any] = None,
+              avg_winner: Optional[Any] = None,
+              trades_per_month: Optional[Any] = None,
+              monthly_deposits: Optional[Any] = None,
+              tax_rate: Optional[Any] = None,
+              model: str = 'winner_only') -> pd.DataFrame:
+        """
+        Evaluate a cartesian grid of projection parameters in one batch
+
+        Each argument accepts a scalar or a sequence; None uses the baseline
+        value from config. Monthly factors are computed once per
+        (win_rate, avg_winner, trades_per_month) cell and broadcast across
+        deposits and tax rates. The default model matches run_projection(),
+        so a one-cell sweep reproduces the CLI forecast; model='expected'
+        instead treats each trade as a win at avg_winner or a loss at the
+        config's avg_loser_pct (win_rate only matters for this model).
+
+        Args:
+            years: Projection horizon in years
+            win_rate: Win probability (0-1)
+            avg_winner: Return of a winning trade (0.0358 = 3.58%)
+            trades_per_month: Trades per month
+            monthly_deposits: Deposit added each month
+            tax_rate: Share of gains reserved for tax (0-1)
+            model: One of PROJECTION_MODELS
+
+        Returns:
+            Tidy DataFrame with one row per grid cell
+        """
+        import numpy as np
+        import pandas as pd
+        from portfolio_core.projection import project_final
+
+        if model not in PROJECTION_MODELS:
+            raise ValueError(f"Unknown projection model: {model} (expected one of {PROJECTION_MODELS})")
+
+        trading = self.params.trading
+        account = self.params.account
+
+        axes = {
+            'win_rate': trading.win_rate if win_rate is None else win_rate,
+            'avg_winner': trading.avg_return_pct if avg_winner is None else avg_winner,
+            'trades_per_month': trading.trades_per_month_baseline if trades_per_month is None else trades_per_month,
+            'monthly_deposits': account.monthly_deposits if monthly_deposits is None else monthly_deposits,
+            'tax_rate': self.params.tax.quarterly_extraction_rate if tax_rate is None else tax_rate,
+        }
+        axes = {name: np.atleast_1d(np.asarray(values, dtype=float)) for name, values in axes.items()}
+        shape = tuple(len(values) for values in axes.values())
+        logger.info(f"Running {years}-year sweep over {int(np.prod(shape)):,} cells")
+
+        # Open grids: each axis varies along its own dimension
+        grid = dict(zip(axes, np.ix_(*axes.values())))
+        factor = monthly_factor(model, grid['win_rate'], grid['avg_winner'],
+                                trading.avg_loser_pct, grid['trades_per_month'])
+
+        months = years * 12
+        initial_capital = account.initial_capital
+        projected = project_final(initial_capital, grid['monthly_deposits'],
+                                  factor, grid['tax_rate'], months)
+
+        columns = {name: np.broadcast_to(values, shape).ravel() for name, values in grid.items()}
+        columns['monthly_factor'] = np.broadcast_to(factor, shape).ravel()
+        for name, values in projected.items():
+            columns[name] = np.broadcast_to(values, shape).ravel()
+
+        df = pd.DataFrame(columns)
+        df['liquid_net_worth'] = df['final_balance'] + df['total_taxes_reserved']
+        df['capital_invested'] = initial_capital + df['monthly_deposits'] * months
+        df['roi_pct'] = (df['final_balance'] - initial_capital) / initial_capital * 100
+        df.insert(0, 'years', years)
+
+        return df
 
     def run_monte_carlo(self,
                        months: int = 60,
                        paths: int = 1000,
-                       scenario: str = 'baseline') -> Dict:
+                       scenario: str = 'baseline',
+                       method: str = 'vectorized',
+                       seed: Optional[int] = None,
+                       chunk_size: Optional[int] = None,
+                       keep_paths: bool = False,
+                       workers: int = 1,
+                       trade_returns: Optional[np.ndarray] = None,
+                       block_length: float = 5.0) -> Dict:
         """
         Run Monte Carlo simulation
 
@@ -353,130 +511,126 @@ class PortfolioForecastingAgent:
             months: Simulation duration in months
             paths: Number of simulation paths
             scenario: Scenario name for params
+            method: 'vectorized' engine, 'reference' per-trade loop, or
+                'bootstrap' / 'stationary' resampling of trade_returns
+            seed: Optional seed for reproducible runs
+            chunk_size: Stream paths through online aggregators this many at
+                a time, keeping memory bounded for very large runs
+            keep_paths: Include every simulated path in the results
+            workers: Shard path chunks across this many processes; results
+                for a given seed do not depend on the worker count
+            trade_returns: Realized per-trade returns (fractions) to resample,
+                e.g. from load_trade_returns(); each is applied to the whole
+                balance, like avg_winner_pct/avg_loser_pct
+            block_length: Bootstrap block length in trades (mean length for
+                'stationary'); longer blocks keep more of the streakiness
 
         Returns:
             Dict with simulation results
         """
+        from monte_carlo import MonteCarloParams, run_simulation
+
         logger.info(f"Running Monte Carlo: {paths} paths × {months} months")
 
         # Get parameters
         params = MonteCarloParams(
             paths=paths,
             months=months,
-            trades_per_month=self.config['trading']['trade_frequency']['trades_per_month']['baseline'],
-            win_probability=self.config['trading']['win_rate']['actual'] / 100,
-            avg_winner_pct=self.config['trading']['return_per_trade']['all_time_avg'] / 100,
-            avg_loser_pct=self.config['trading']['loss_parameters']['avg_loser_pct'] / 100,
-            monthly_deposits=self.config['account']['monthly_deposits'],
-            initial_capital=self.config['account']['initial_capital'],
+            trades_per_month=self.params.trading.trades_per_month_baseline,
+            win_probability=self.params.trading.win_rate,
+            avg_winner_pct=self.params.trading.avg_return_pct,
+            avg_loser_pct=self.params.trading.avg_loser_pct,
+            monthly_deposits=self.params.account.monthly_deposits,
+            initial_capital=self.params.account.initial_capital,
+            trade_returns=trade_returns,
+            block_length=block_length,
         )
 
-        # Run simulation
-        final_balances = []
-        all_paths = np.zeros((paths, months))
-
-        for path_idx in range(paths):
-            balance = params.initial_capital
-            path_balances = []
-
-            for month in range(months):
-                # Simulate trades for this month
-                for _ in range(int(params.trades_per_month)):
-                    if np.random.random() < params.win_probability:
-                        # Win
-                        balance *= (1 + params.avg_winner_pct)
-                    else:
-                        # Loss
-                        balance *= (1 + params.avg_loser_pct)
-
-                # Add deposit
-                balance += params.monthly_deposits
-                path_balances.append(balance)
-
-            all_paths[path_idx] = path_balances
-            final_balances.append(balance)
-
-        # Calculate statistics
-        final_balances = np.array(final_balances)
-
-        results = {
-            'paths': paths,
-            'months': months,
-            'final_balance': {
-                'mean': float(np.mean(final_balances)),
-                'median': float(np.median(final_balances)),
-                'std': float(np.std(final_balances)),
-                'min': float(np.min(final_balances)),
-                'max': float(np.max(final_balances)),
-                'percentile_5': float(np.percentile(final_balances, 5)),
-                'percentile_25': float(np.percentile(final_balances, 25)),
-                'percentile_75': float(np.percentile(final_balances, 75)),
-                'percentile_95': float(np.percentile(final_balances, 95)),
-            },
-            'milestones': {
-                '1M': float(np.sum(final_balances >= 1_000_000) / paths * 100),
-                '10M': float(np.sum(final_balances >= 10_000_000) / paths * 100),
-                '100M': float(np.sum(final_balances >= 100_000_000) / paths * 100),
-                '500M': float(np.sum(final_balances >= 500_000_000) / paths * 100),
-                '1B': float(np.sum(final_balances >= 1_000_000_000) / paths * 100),
-            },
-            'risk_metrics': {
-                'risk_of_ruin': float(np.sum(final_balances < params.initial_capital) / paths * 100),
-                'prob_profit': float(np.sum(final_balances > params.initial_capital) / paths * 100),
-            },
-            'all_paths': all_paths.tolist(),
+        results = run_simulation(params, method=method, seed=seed,
+                                 chunk_size=chunk_size, keep_paths=keep_paths,
+                                 workers=workers)
+
+        self.monte_carlo_results[f'{scenario}_{months}m'] = {
+            'scenario': scenario,
+            'results': results,
         }
 
         logger.info(f"Monte Carlo complete. Median final balance: ${results['final_balance']['median']:,.2f}")
 
         return results
 
-    def analyze_risk(self, projection_results: Dict) -> Dict:
+    def analyze_risk(self, projection_results: Dict, monte_carlo_results: Optional[Dict] = None) -> Dict:
         """
         Analyze risk metrics from projection
 
+        The deterministic projection never draws down, so when Monte Carlo
+        results are given the drawdown distribution across their paths is
+        reported as well.
+
         Args:
             projection_results: Results from run_projection()
+            monte_carlo_results: Optional results from run_monte_carlo()
 
         Returns:
             Dict with risk metrics
         """
+        import numpy as np
+        from portfolio_core.risk import max_drawdown, period_returns, risk_metrics
+
         logger.info("Analyzing risk metrics")
 
-        monthly_df = projection_results['monthly']
-
-        # Calculate month-over-month changes
-        monthly_df['Monthly_Return_Pct'] = (
-            (monthly_df['Ending_Balance'] / monthly_df['Starting_Balance']) - 1
-        ) * 100
-
-        # Drawdown analysis
-        monthly_df['Peak'] = monthly_df['Ending_Balance'].cummax()
-        monthly_df['Drawdown_Pct'] = (
-            (monthly_df['Ending_Balance'] - monthly_df['Peak']) / monthly_df['Peak']
-        ) * 100
-
-        risk_metrics = {
-            'max_drawdown_pct': float(monthly_df['Drawdown_Pct'].min()),
-            'avg_monthly_return_pct': float(monthly_df['Monthly_Return_Pct'].mean()),
-            'monthly_volatility_pct': float(monthly_df['Monthly_Return_Pct'].std()),
-            'sharpe_ratio_approx': float(
-                monthly_df['Monthly_Return_Pct'].mean() /
-                monthly_df['Monthly_Return_Pct'].std()
-                if monthly_df['Monthly_Return_Pct'].std() > 0 else 0
-            ),
-            'best_month_pct': float(monthly_df['Monthly_Return_Pct'].max()),
-            'worst_month_pct': float(monthly_df['Monthly_Return_Pct'].min()),
+        monthly = projection_results['monthly']
+        initial_capital = monthly['Starting_Balance'][0]
+        equity = np.concatenate([[initial_capital], monthly['Ending_Balance']])
+        cash_flows = np.concatenate([[0.0], monthly['Deposit']])
+
+        # Deposit-adjusted (time-weighted) monthly returns
+        curve = risk_metrics(equity, cash_flows=cash_flows, periods_per_year=12)
+        returns_pct = period_returns(equity, cash_flows) * 100
+
+        volatility = float(returns_pct.std(ddof=1)) if len(returns_pct) > 1 else 0.0
+        if volatility < 1e-9:
+            # Constant deterministic returns; anything left is rounding noise
+            volatility = 0.0
+
+        risk_metrics_out = {
+            'max_drawdown_pct': curve['max_drawdown_pct'],
+            'avg_monthly_return_pct': float(returns_pct.mean()),
+            'monthly_volatility_pct': volatility,
+            'sharpe_ratio_approx': float(returns_pct.mean() / volatility) if volatility > 0 else 0,
+            'best_month_pct': float(returns_pct.max()),
+            'worst_month_pct': float(returns_pct.min()),
+            'cagr_pct': curve['cagr_pct'],
         }
 
-        logger.info(f"Risk analysis complete. Max drawdown: {risk_metrics['max_drawdown_pct']:.2f}%")
-
-        return risk_metrics
+        if monte_carlo_results:
+            paths = np.asarray(monte_carlo_results.get('all_paths') or monte_carlo_results.get('sample_paths') or [])
+            if paths.size:
+                deposits = self.params.account.monthly_deposits
+                start = np.full((paths.shape[0], 1), initial_capital)
+                balances = np.concatenate([start, paths], axis=1)
+                flows = np.concatenate([[0.0], np.full(paths.shape[1], deposits)])
+                path_drawdowns = max_drawdown(period_returns(balances, flows)) * 100
+                risk_metrics_out['monte_carlo_drawdown'] = {
+                    'paths': int(paths.shape[0]),
+                    'mean_max_drawdown_pct': float(path_drawdowns.mean()),
+                    'median_max_drawdown_pct': float(np.median(path_drawdowns)),
+                    'percentile_5_max_drawdown_pct': float(np.percentile(path_drawdowns, 5)),
+                    'worst_max_drawdown_pct': float(path_drawdowns.min()),
+                }
+
+        logger.info(f"Risk analysis complete. Max drawdown: {risk_metrics_out['max_drawdown_pct']:.2f}%")
+
+        return risk_metrics_out
 
     def forecast_taxes(self, projection_results: Dict, state: str = 'FL') -> Dict:
         """
         Forecast tax obligations
 
+        Projected gains are short-term trading income taxed at flat federal
+        and state rates. Each month's gains are dated by the projection's
+        calendar months to lay out the IRS estimated-payment installments.
+
         Args:
             projection_results: Results from run_projection()
             state: State code ('NY', 'FL', 'TX')
@@ -484,38 +638,52 @@ class PortfolioForecastingAgent:
         Returns:
             Dict with tax forecasts
         """
+        import pandas as pd
+
+        from portfolio_core.tax import estimated_payments
+
         logger.info(f"Forecasting taxes for state: {state}")
 
-        quarterly_df = projection_results['quarterly']
+        quarterly = projection_results['quarterly']
 
         # Federal tax
         federal_rate = 0.37  # Top bracket
 
-        # State tax
-        if state == 'NY':
-            state_rate = self.config['tax']['state_ny']['combined_rate'] / 100
-        else:
-            state_rate = 0.0  # FL/TX
+        # State tax (NY from config, FL/TX none)
+        state_rate = self.params.tax.state_rate(state)
 
         combined_rate = federal_rate + state_rate
 
         # Calculate quarterly payments
-        quarterly_df['Federal_Tax'] = quarterly_df['Gains'] * federal_rate
-        quarterly_df['State_Tax'] = quarterly_df['Gains'] * state_rate
-        quarterly_df['Total_Tax_Due'] = quarterly_df['Gains'] * combined_rate
+        quarterly['Federal_Tax'] = quarterly['Gains'] * federal_rate
+        quarterly['State_Tax'] = quarterly['Gains'] * state_rate
+        quarterly['Total_Tax_Due'] = quarterly['Gains'] * combined_rate
 
+        total_gains = float(quarterly['Gains'].sum())
+        total_tax = float(quarterly['Total_Tax_Due'].sum())
         tax_forecast = {
             'state': state,
             'federal_rate': federal_rate,
             'state_rate': state_rate,
             'combined_rate': combined_rate,
-            'quarterly_payments': quarterly_df[['Quarter', 'Total_Tax_Due']].to_dict('records'),
-            'total_tax_liability': float(quarterly_df['Total_Tax_Due'].sum()),
-            'total_gains': float(quarterly_df['Gains'].sum()),
-            'effective_rate': float(quarterly_df['Total_Tax_Due'].sum() / quarterly_df['Gains'].sum())
-            if quarterly_df['Gains'].sum() > 0 else 0,
+            'quarterly_payments': [{'Quarter': str(label), 'Total_Tax_Due': float(due)}
+                                   for label, due in zip(quarterly['Quarter'], quarterly['Total_Tax_Due'])],
+            'total_tax_liability': total_tax,
+            'total_gains': total_gains,
+            'effective_rate': total_tax / total_gains if total_gains > 0 else 0,
         }
 
+        monthly = projection_results.get('monthly')
+        if monthly is not None and len(monthly['Month']):
+            gains = pd.DataFrame({
+                'exit_time': pd.to_datetime(monthly['Date']),
+                'recognized_pnl': monthly['Gains_This_Month'],
+                'term': 'short',
+            })
+            schedule = estimated_payments(gains, federal_rate=federal_rate, state_rate=state_rate, niit_rate=0.0)
+            schedule = schedule[['tax_year', 'installment', 'due_date', 'payment']].astype({'due_date': str})
+            tax_forecast['estimated_payments'] = schedule.to_dict('records')
+
         logger.info(f"Tax forecast complete. Total liability: ${tax_forecast['total_tax_liability']:,.2f}")
 
         return tax_forecast
@@ -580,38 +748,128 @@ class PortfolioForecastingAgent:
 \end{document}
 """
 
-    def export_results(self, output_dir: Optional[str] = None) -> List[str]:
+    def export_results(self,
+                       output_dir: Optional[str] = None,
+                       export_format: str = 'csv') -> List[str]:
         """
-        Export all results to CSV files
+        Export all results
 
         Args:
             output_dir: Output directory
+            export_format: 'csv' (one file per scenario table, the default),
+                'parquet' or 'feather' (one partitioned dataset, needs pyarrow)
 
         Returns:
-            List of exported file paths
+            List of exported file paths (dataset directories for parquet/feather)
         """
-        logger.info("Exporting results to CSV")
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format} (expected one of {EXPORT_FORMATS})")
+
+        logger.info(f"Exporting results to {export_format}")
 
         output_dir = Path(output_dir or "/home/aaron/projects/portfolio")
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        if export_format != 'csv':
+            exported_files = self._export_dataset(output_dir, export_format)
+            logger.info(f"Exported {len(exported_files)} tables")
+            return exported_files
+
+        import pandas as pd
+
         exported_files = []
 
         for key, result in self.results.items():
             # Export monthly data
             monthly_path = output_dir / f"forecast_{key}_monthly.csv"
-            result['monthly'].to_csv(monthly_path, index=False)
+            pd.DataFrame(result['monthly']).to_csv(monthly_path, index=False)
             exported_files.append(str(monthly_path))
 
             # Export quarterly data
             quarterly_path = output_dir / f"forecast_{key}_quarterly.csv"
-            result['quarterly'].to_csv(quarterly_path, index=False)
+            pd.DataFrame(result['quarterly']).to_csv(quarterly_path, index=False)
             exported_files.append(str(quarterly_path))
 
         logger.info(f"Exported {len(exported_files)} files")
 
         return exported_files
 
+    def _export_dataset(self, output_dir: Path, export_format: str) -> List[str]:
+        """
+        Write results as one columnar dataset with hive-style partitions
+
+        Layout under output_dir/forecast_dataset/:
+            monthly/scenario=<name>/years=<n>/part-0.<ext>
+            quarterly/scenario=<name>/years=<n>/part-0.<ext>
+            monte_carlo/scenario=<name>/months=<n>/part-0.<ext>  (per-month aggregates)
+            monte_carlo_summary/part-0.<ext>                      (one row per run)
+
+        Feather (Arrow IPC) files can be memory-mapped by readers.
+        """
+        import pandas as pd
+        try:
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+        except ImportError:
+            raise ImportError(f"{export_format} export requires pyarrow. Install with: pip install pyarrow")
+
+        dataset_dir = output_dir / "forecast_dataset"
+        file_format = 'ipc' if export_format == 'feather' else 'parquet'
+        extension = 'feather' if export_format == 'feather' else 'parquet'
+
+        tables = {'monthly': [], 'quarterly': [], 'monte_carlo': [], 'monte_carlo_summary': []}
+
+        for result in self.results.values():
+            for name in ('monthly', 'quarterly'):
+                df = pd.DataFrame(result[name])
+                df['scenario'] = result['params']['scenario_name']
+                df['years'] = result['params']['forecast_years']
+                tables[name].append(df)
+
+        for run in self.monte_carlo_results.values():
+            results = run['results']
+            monthly = {k: v for k, v in results['monthly'].items() if k != 'milestones'}
+            df = pd.DataFrame(monthly)
+            for name, values in results['monthly']['milestones'].items():
+                df[f'milestone_{name}_pct'] = values
+            df.insert(0, 'Month', range(1, len(df) + 1))
+            df['scenario'] = run['scenario']
+            df['months'] = results['months']
+            tables['monte_carlo'].append(df)
+
+            summary = {'scenario': run['scenario'], 'months': results['months'],
+                       'paths': results['paths'], 'method': results['method']}
+            summary.update({f'final_{k}': v for k, v in results['final_balance'].items()})
+            summary.update({f'milestone_{k}_pct': v for k, v in results['milestones'].items()})
+            summary.update(results['risk_metrics'])
+            tables['monte_carlo_summary'].append(pd.DataFrame([summary]))
+
+        partitioning = {
+            'monthly': ['scenario', 'years'],
+            'quarterly': ['scenario', 'years'],
+            'monte_carlo': ['scenario', 'months'],
+            'monte_carlo_summary': None,
+        }
+
+        exported = []
+        for name, frames in tables.items():
+            if not frames:
+                continue
+            table = pa.Table.from_pandas(pd.concat(frames, ignore_index=True), preserve_index=False)
+            table_dir = dataset_dir / name
+            ds.write_dataset(
+                table,
+                table_dir,
+                format=file_format,
+                partitioning=partitioning[name],
+                partitioning_flavor='hive' if partitioning[name] else None,
+                basename_template=f'part-{{i}}.{extension}',
+                existing_data_behavior='delete_matching',
+            )
+            exported.append(str(table_dir))
+
+        return exported
+
     def sync_to_gdrive(self, files: List[str]) -> bool:
         """
         Sync results to Google Drive (placeholder)
@@ -638,28 +896,81 @@ def main():
     parser.add_argument('--years', type=int, default=3, help='Forecast years')
     parser.add_argument('--scenario', default='baseline', choices=['conservative', 'baseline', 'aggressive'])
     parser.add_argument('--monte-carlo', action='store_true', help='Run Monte Carlo simulation')
+    parser.add_argument('--mc-method', default='vectorized',
+                        choices=['vectorized', 'reference', 'bootstrap', 'stationary'],
+                        help='Monte Carlo engine; bootstrap methods resample --trades-csv returns')
+    parser.add_argument('--trades-csv', help='IB statement whose realized trade returns are bootstrapped')
+    parser.add_argument('--block-length', type=float, default=5.0,
+                        help='Bootstrap block length in trades (mean length for stationary)')
     parser.add_argument('--output', default='markdown', choices=['markdown', 'latex'])
+    parser.add_argument('--sweep', action='store_true', help='Evaluate a parameter grid and export CSV')
+    parser.add_argument('--win-rates', type=float, nargs='+', help='Sweep: win rates (0-1)')
+    parser.add_argument('--avg-winners', type=float, nargs='+', help='Sweep: winning trade returns (0-1)')
+    parser.add_argument('--trade-rates', type=float, nargs='+', help='Sweep: trades per month')
+    parser.add_argument('--deposits', type=float, nargs='+', help='Sweep: monthly deposits')
+    parser.add_argument('--tax-rates', type=float, nargs='+', help='Sweep: tax reserve rates (0-1)')
+    parser.add_argument('--sweep-model', default='winner_only', choices=PROJECTION_MODELS,
+                        help='Sweep: monthly growth model (winner_only matches the projection)')
+    parser.add_argument('--output-dir', help='Output directory for reports and exports')
+    parser.add_argument('--export-format', choices=['csv', 'parquet', 'feather'],
+                        help='Also export results (parquet/feather write one partitioned dataset)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import time per module on stderr')
 
     args = parser.parse_args()
 
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     # Initialize agent
     agent = PortfolioForecastingAgent(config_path=args.config)
 
+    if args.sweep:
+        sweep_df = agent.sweep(
+            years=args.years,
+            win_rate=args.win_rates,
+            avg_winner=args.avg_winners,
+            trades_per_month=args.trade_rates,
+            monthly_deposits=args.deposits,
+            tax_rate=args.tax_rates,
+            model=args.sweep_model,
+        )
+        output_dir = Path(args.output_dir or "/home/aaron/projects/portfolio")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        sweep_path = output_dir / f"forecast_sweep_{args.years}y.csv"
+        sweep_df.to_csv(sweep_path, index=False)
+
+        print(f"\n✓ Sweep complete")
+        print(f"  Cells: {len(sweep_df):,}")
+        print(f"  Output: {sweep_path}")
+        return
+
     # Run projection
-    monthly_df, quarterly_df, summary = agent.run_projection(
+    monthly, quarterly, summary = agent.run_projection(
         years=args.years,
         scenario=args.scenario
     )
 
     # Run Monte Carlo if requested
     if args.monte_carlo:
-        mc_results = agent.run_monte_carlo(months=args.years * 12)
+        trade_returns = agent.load_trade_returns(args.trades_csv) if args.trades_csv else None
+        if args.mc_method in ('bootstrap', 'stationary') and trade_returns is None:
+            parser.error(f"--mc-method {args.mc_method} requires --trades-csv")
+        mc_results = agent.run_monte_carlo(months=args.years * 12, method=args.mc_method,
+                                           trade_returns=trade_returns, block_length=args.block_length)
         print(f"\nMonte Carlo Results:")
         print(f"  Median final balance: ${mc_results['final_balance']['median']:,.2f}")
         print(f"  95th percentile: ${mc_results['final_balance']['percentile_95']:,.2f}")
 
     # Generate report
-    report_path = agent.generate_report(output_format=args.output)
+    report_path = agent.generate_report(output_format=args.output, output_dir=args.output_dir)
+
+    if args.export_format:
+        exported = agent.export_results(output_dir=args.output_dir, export_format=args.export_format)
+        print(f"  Exported: {len(exported)} {args.export_format} outputs")
 
     print(f"\n✓ Forecast complete")
     print(f"  Final balance: ${summary['final_balance']:,.2f}")
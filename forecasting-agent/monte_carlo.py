@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Engine
+Vectorized path simulation for the Portfolio Forecasting Agent
+
+Part of astoreyai/claude-skills forecasting-agent skill
+
+Each month a path executes a fixed number of trades, each a Bernoulli
+win/loss. Only the number of wins matters for the monthly growth factor,
+so the vectorized engine draws one binomial win count per (path, month)
+and compounds with cumulative sums in log space. Deposits are folded in
+with the closed form of B[t] = B[t-1] * F[t] + D:
+
+    B[t] = G[t] * (B0 + D * sum(1 / G[s] for s <= t)),  G[t] = prod(F[:t+1])
+
+The original per-trade loop is kept as the 'reference' method for parity
+checks against the vectorized engine.
+
+The 'bootstrap' and 'stationary' methods replace the win/loss model with
+the empirical per-trade return distribution (params.trade_returns): each
+path resamples realized returns in blocks - fixed-length circular blocks,
+or geometric-length blocks for the stationary bootstrap of Politis and
+Romano - so streaks and fat tails in the trade history carry over. They
+share the log-space compounding, deposit folding, streaming and sharding
+below, and produce the same results schema.
+
+With chunk_size set, paths are simulated in fixed-size chunks and folded
+into per-month aggregators (running mean/variance, a log-bucket quantile
+sketch and milestone hit counts), so peak memory is O(chunk x months)
+regardless of the number of paths.
+
+Paths are always drawn in fixed-size chunks (chunk_size, or
+DEFAULT_CHUNK_SIZE in memory), each from its own
+numpy.random.SeedSequence.spawn stream, and runs can be sharded across a
+process pool with workers=N. Chunks are combined in chunk order -
+concatenated in memory, merged as PathAggregator partials when streaming -
+so a given seed produces bit-identical results for any worker count.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from math import comb
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Lower bound for cumulative log growth; exp(-700) is well below any
+# meaningful balance and keeps 1 / G finite.
+LOG_GROWTH_FLOOR = -700.0
+
+MILESTONES = {
+    '1M': 1_000_000,
+    '10M': 10_000_000,
+    '100M': 100_000_000,
+    '500M': 500_000_000,
+    '1B': 1_000_000_000,
+}
+
+METHODS = ('vectorized', 'reference', 'bootstrap', 'stationary')
+
+# Methods that resample params.trade_returns
+BOOTSTRAP_METHODS = ('bootstrap', 'stationary')
+
+# Upper bound on resampled trades held in memory at once per bootstrap block
+BOOTSTRAP_BLOCK_ELEMENTS = 4_000_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Number of evenly spaced paths returned as 'sample_paths'
+DEFAULT_SAMPLE_PATHS = 200
+
+# Paths per random stream when chunk_size is None (in-memory runs)
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+@dataclass
+class MonteCarloParams:
+    """Monte Carlo simulation parameters"""
+    paths: int
+    months: int
+    trades_per_month: float
+    win_probability: float
+    avg_winner_pct: float
+    avg_loser_pct: float
+    monthly_deposits: float
+    initial_capital: float
+    # Realized per-trade returns (fractions) for the bootstrap methods
+    trade_returns: Optional[np.ndarray] = None
+    # Block length (mean block length for 'stationary') in trades
+    block_length: float = 1.0
+
+
+def _win_count_cdf(trades: int, win_probability: float) -> np.ndarray:
+    """CDF of the monthly win count, used for inverse-transform sampling"""
+    k = np.arange(trades + 1)
+    pmf = np.array([comb(trades, int(i)) for i in k], dtype=float)
+    pmf *= win_probability ** k * (1 - win_probability) ** (trades - k)
+    cdf = np.cumsum(pmf)
+    cdf[-1] = 1.0
+    return cdf
+
+
+def _log_factor_table(params: MonteCarloParams) -> np.ndarray:
+    """Log monthly growth factor indexed by number of winning trades"""
+    trades = int(params.trades_per_month)
+    wins = np.arange(trades + 1)
+    with np.errstate(divide='ignore'):
+        return (wins * np.log1p(params.avg_winner_pct) +
+                (trades - wins) * np.log1p(params.avg_loser_pct))
+
+
+def simulate_paths(params: MonteCarloParams, rng: np.random.Generator) -> np.ndarray:
+    """
+    Simulate month-end balances for all paths at once
+
+    Args:
+        params: MonteCarloParams object
+        rng: NumPy random generator
+
+    Returns:
+        (paths, months) array of balances after each month's deposit
+    """
+    trades = int(params.trades_per_month)
+    cdf = _win_count_cdf(trades, params.win_probability)
+    log_factors = _log_factor_table(params)
+
+    # Inverse-transform sampling of win counts: one uniform per (path, month)
+    wins = np.searchsorted(cdf, rng.random((params.paths, params.months)), side='right')
+    np.minimum(wins, trades, out=wins)
+
+    return _fold_balances(params, log_factors[wins])
+
+
+def _fold_balances(params: MonteCarloParams, monthly_log_factors: np.ndarray) -> np.ndarray:
+    """Compound (paths, months) log growth factors and fold in deposits"""
+    log_growth = np.cumsum(monthly_log_factors, axis=1)
+    np.maximum(log_growth, LOG_GROWTH_FLOOR, out=log_growth)
+
+    balances = np.exp(log_growth)
+    if params.monthly_deposits:
+        deposit_value = np.cumsum(np.exp(-log_growth), axis=1)
+        deposit_value *= params.monthly_deposits
+        deposit_value += params.initial_capital
+        balances *= deposit_value
+    else:
+        balances *= params.initial_capital
+
+    return balances
+
+
+def _bootstrap_indices(count: int, paths: int, length: int, block_length: float,
+                       stationary: bool, rng: np.random.Generator) -> np.ndarray:
+    """
+    (paths, length) indices into a sample of `count` returns
+
+    Circular blocks: fixed-length runs starting at uniform offsets. Stationary:
+    every position starts a new block with probability 1 / block_length,
+    otherwise continues the current one, giving geometric block lengths.
+    """
+    positions = np.arange(length)
+    if not stationary:
+        block = max(1, int(round(block_length)))
+        starts = rng.integers(0, count, size=(paths, -(-length // block)))
+        return (np.repeat(starts, block, axis=1)[:, :length] + positions % block) % count
+
+    new_block = rng.random((paths, length), dtype=np.float32) < 1 / max(block_length, 1.0)
+    new_block[:, 0] = True
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+    # One uniform start per block, looked up through the running block count
+    starts = rng.integers(0, count, size=int(new_block.sum()))
+    block_id = np.cumsum(new_block, axis=None).reshape(paths, length) - 1
+    return (starts[block_id] + positions - block_start) % count
+
+
+def simulate_paths_bootstrap(params: MonteCarloParams, rng: np.random.Generator,
+                             stationary: bool = False) -> np.ndarray:
+    """
+    Simulate month-end balances by resampling realized trade returns
+
+    Args:
+        params: MonteCarloParams with trade_returns set
+        rng: NumPy random generator
+        stationary: Use the stationary (geometric block length) bootstrap
+
+    Returns:
+        (paths, months) array of balances after each month's deposit
+    """
+    returns = np.asarray(params.trade_returns, dtype=float)
+    if returns.size == 0:
+        raise ValueError("Bootstrap Monte Carlo needs trade_returns")
+
+    with np.errstate(divide='ignore'):
+        log_returns = np.log1p(np.maximum(returns, -1.0))
+
+    trades = int(params.trades_per_month)
+    length = params.months * trades
+    monthly_log_factors = np.empty((params.paths, params.months))
+
+    # Resample in path blocks so memory stays bounded for long horizons
+    block_paths = max(1, BOOTSTRAP_BLOCK_ELEMENTS // max(length, 1))
+    for first in range(0, params.paths, block_paths):
+        paths = min(block_paths, params.paths - first)
+        indices = _bootstrap_indices(len(returns), paths, length, params.block_length, stationary, rng)
+        monthly_log_factors[first:first + paths] = (
+            log_returns[indices].reshape(paths, params.months, trades).sum(axis=2)
+        )
+
+    return _fold_balances(params, monthly_log_factors)
+
+
+def _simulator(method: str):
+    """Path simulator for a method name"""
+    if method == 'reference':
+        return simulate_paths_reference
+    if method == 'bootstrap':
+        return simulate_paths_bootstrap
+    if method == 'stationary':
+        return lambda params, rng: simulate_paths_bootstrap(params, rng, stationary=True)
+    return simulate_paths
+
+
+def simulate_paths_reference(params: MonteCarloParams, rng: np.random.Generator) -> np.ndarray:
+    """
+    Simulate paths trade by trade (slow reference implementation)
+
+    Args:
+        params: MonteCarloParams object
+        rng: NumPy random generator
+
+    Returns:
+        (paths, months) array of balances after each month's deposit
+    """
+    all_paths = np.zeros((params.paths, params.months))
+
+    for path_idx in range(params.paths):
+        balance = params.initial_capital
+
+        for month in range(params.months):
+            # Simulate trades for this month
+            for _ in range(int(params.trades_per_month)):
+                if rng.random() < params.win_probability:
+                    # Win
+                    balance *= (1 + params.avg_winner_pct)
+                else:
+                    # Loss
+                    balance *= (1 + params.avg_loser_pct)
+
+            # Add deposit
+            balance += params.monthly_deposits
+            all_paths[path_idx, month] = balance
+
+    return all_paths
+
+
+def summarize_final_balances(final_balances: np.ndarray, params: MonteCarloParams) -> Dict:
+    """
+    Build the statistics block of the Monte Carlo results dict
+
+    Args:
+        final_balances: 1-D array of ending balances, one per path
+        params: MonteCarloParams object
+
+    Returns:
+        Dict with final_balance, milestones and risk_metrics sections
+    """
+    paths = len(final_balances)
+    p5, p25, median, p75, p95 = np.percentile(final_balances, [5, 25, 50, 75, 95])
+
+    return {
+        'final_balance': {
+            'mean': float(np.mean(final_balances)),
+            'median': float(median),
+            'std': float(np.std(final_balances)),
+            'min': float(np.min(final_balances)),
+            'max': float(np.max(final_balances)),
+            'percentile_5': float(p5),
+            'percentile_25': float(p25),
+            'percentile_75': float(p75),
+            'percentile_95': float(p95),
+        },
+        'milestones': {
+            name: float(np.sum(final_balances >= threshold) / paths * 100)
+            for name, threshold in MILESTONES.items()
+        },
+        'risk_metrics': {
+            'risk_of_ruin': float(np.sum(final_balances < params.initial_capital) / paths * 100),
+            'prob_profit': float(np.sum(final_balances > params.initial_capital) / paths * 100),
+        },
+    }
+
+
+class QuantileSketch:
+    """
+    Mergeable log-bucket quantile sketch, one row per month
+
+    Values are counted in buckets with boundaries gamma ** k, so any
+    quantile is returned within relative_accuracy of the true sample
+    quantile. Bucket counts are integers, which makes merging exact and
+    independent of the order chunks arrive in. Values at or below
+    min_value are counted in a zero bucket.
+    """
+
+    def __init__(self, rows: int, relative_accuracy: float = 0.005, min_value: float = 0.01):
+        self.rows = rows
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.min_value = min_value
+        self.offset = 0
+        self.counts = np.zeros((rows, 0), dtype=np.int64)
+        self.zero_counts = np.zeros(rows, dtype=np.int64)
+
+    def _grow(self, key_min: int, key_max: int) -> None:
+        """Extend the dense bucket store to cover [key_min, key_max]"""
+        width = self.counts.shape[1]
+        if width and key_min >= self.offset and key_max < self.offset + width:
+            return
+        new_offset = min(key_min, self.offset) if width else key_min
+        new_end = max(key_max + 1, self.offset + width) if width else key_max + 1
+        counts = np.zeros((self.rows, new_end - new_offset), dtype=np.int64)
+        counts[:, self.offset - new_offset:self.offset - new_offset + width] = self.counts
+        self.counts = counts
+        self.offset = new_offset
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a chunk of observations
+
+        Args:
+            values: (n, rows) array; column j feeds row j of the sketch
+        """
+        positive = values > self.min_value
+        self.zero_counts += values.shape[0] - positive.sum(axis=0)
+        if not positive.any():
+            return
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            keys = np.ceil(np.log(values) / self.log_gamma)
+        row_idx = np.broadcast_to(np.arange(self.rows), values.shape)
+        if not positive.all():
+            keys, row_idx = keys[positive], row_idx[positive]
+        keys = keys.astype(np.int64).ravel()
+        self._grow(int(keys.min()), int(keys.max()))
+
+        width = self.counts.shape[1]
+        flat = row_idx.ravel() * width + (keys - self.offset)
+        self.counts += np.bincount(flat, minlength=self.rows * width).reshape(self.rows, width)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Fold another sketch with the same rows and accuracy into this one"""
+        self.zero_counts += other.zero_counts
+        width = other.counts.shape[1]
+        if not width:
+            return
+        self._grow(other.offset, other.offset + width - 1)
+        start = other.offset - self.offset
+        self.counts[:, start:start + width] += other.counts
+
+    def quantiles(self, q: float) -> np.ndarray:
+        """Estimated q-quantile (0 <= q <= 1) for every row"""
+        total = self.zero_counts + self.counts.sum(axis=1)
+        rank = np.floor(q * (total - 1))
+        # Index of the first bucket whose cumulative count exceeds the rank
+        below = rank - self.zero_counts
+        bucket = (np.cumsum(self.counts, axis=1) <= below[:, None]).sum(axis=1)
+        bucket = np.minimum(bucket, max(self.counts.shape[1] - 1, 0))
+        values = 2 * self.gamma ** (bucket + self.offset) / (self.gamma + 1)
+        return np.where(below < 0, 0.0, values)
+
+
+class PathAggregator:
+    """
+    Online per-month statistics over streamed chunks of simulated paths
+
+    Keeps running mean/variance (Chan's parallel update), min/max, a
+    QuantileSketch and milestone hit counts per month, plus an evenly
+    spaced sample of whole paths.
+    """
+
+    def __init__(self, params: MonteCarloParams, sample_paths: int = DEFAULT_SAMPLE_PATHS):
+        months = params.months
+        self.initial_capital = params.initial_capital
+        self.count = 0
+        self.mean = np.zeros(months)
+        self.m2 = np.zeros(months)
+        self.min = np.full(months, np.inf)
+        self.max = np.full(months, -np.inf)
+        self.sketch = QuantileSketch(months)
+        self.milestone_hits = {name: np.zeros(months, dtype=np.int64) for name in MILESTONES}
+        self.ruin_count = 0
+        self.profit_count = 0
+
+        self.sample_paths = min(sample_paths, params.paths)
+        self.sample_stride = max(1, params.paths // max(self.sample_paths, 1))
+        self.samples: List[np.ndarray] = []
+
+    def update(self, balances: np.ndarray, first_path: int = 0) -> None:
+        """
+        Fold a chunk of simulated paths into the aggregates
+
+        Args:
+            balances: (chunk, months) array of month-end balances
+            first_path: Global index of the chunk's first path
+        """
+        n = balances.shape[0]
+        if n == 0:
+            return
+
+        chunk_mean = balances.mean(axis=0)
+        self._combine_moments(n, chunk_mean, ((balances - chunk_mean) ** 2).sum(axis=0))
+
+        np.minimum(self.min, balances.min(axis=0), out=self.min)
+        np.maximum(self.max, balances.max(axis=0), out=self.max)
+        self.sketch.update(balances)
+
+        for name, threshold in MILESTONES.items():
+            self.milestone_hits[name] += (balances >= threshold).sum(axis=0)
+
+        final = balances[:, -1]
+        self.ruin_count += int(np.sum(final < self.initial_capital))
+        self.profit_count += int(np.sum(final > self.initial_capital))
+
+        if self.sample_paths:
+            limit = self.sample_stride * self.sample_paths
+            first = -(-first_path // self.sample_stride) * self.sample_stride
+            picks = np.arange(first, min(first_path + n, limit), self.sample_stride)
+            if len(picks):
+                self.samples.append(balances[picks - first_path])
+
+    def _combine_moments(self, n: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        """Chan's parallel update of running count, mean and M2"""
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * (n / total)
+        self.m2 += m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+
+    def merge(self, other: 'PathAggregator') -> None:
+        """
+        Fold another aggregator (a later block of paths) into this one
+
+        Merging a single-chunk aggregator performs exactly the same
+        arithmetic as update() on that chunk.
+        """
+        if other.count == 0:
+            return
+
+        self._combine_moments(other.count, other.mean, other.m2)
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        self.sketch.merge(other.sketch)
+
+        for name, hits in other.milestone_hits.items():
+            self.milestone_hits[name] += hits
+
+        self.ruin_count += other.ruin_count
+        self.profit_count += other.profit_count
+        self.samples.extend(other.samples)
+
+    def std(self) -> np.ndarray:
+        """Population standard deviation per month"""
+        return np.sqrt(self.m2 / max(self.count, 1))
+
+    def summary(self) -> Dict:
+        """Final-balance statistics, matching summarize_final_balances()"""
+        percentiles = {p: float(self.sketch.quantiles(p / 100)[-1]) for p in PERCENTILES}
+        return {
+            'final_balance': {
+                'mean': float(self.mean[-1]),
+                'median': percentiles[50],
+                'std': float(self.std()[-1]),
+                'min': float(self.min[-1]),
+                'max': float(self.max[-1]),
+                'percentile_5': percentiles[5],
+                'percentile_25': percentiles[25],
+                'percentile_75': percentiles[75],
+                'percentile_95': percentiles[95],
+            },
+            'milestones': {
+                name: float(hits[-1] / self.count * 100)
+                for name, hits in self.milestone_hits.items()
+            },
+            'risk_metrics': {
+                'risk_of_ruin': float(self.ruin_count / self.count * 100),
+                'prob_profit': float(self.profit_count / self.count * 100),
+            },
+        }
+
+    def monthly(self) -> Dict:
+        """Per-month statistics as JSON-friendly lists"""
+        monthly = {
+            'mean': self.mean.tolist(),
+            'std': self.std().tolist(),
+            'min': self.min.tolist(),
+            'max': self.max.tolist(),
+        }
+        for p in PERCENTILES:
+            monthly[f'percentile_{p}'] = self.sketch.quantiles(p / 100).tolist()
+        monthly['milestones'] = {
+            name: (hits / self.count * 100).tolist()
+            for name, hits in self.milestone_hits.items()
+        }
+        return monthly
+
+    def sampled_paths(self) -> np.ndarray:
+        """Evenly spaced sample of whole paths, in path order"""
+        if not self.samples:
+            return np.zeros((0, len(self.mean)))
+        return np.concatenate(self.samples)
+
+
+def _simulate_chunk(task: Tuple) -> np.ndarray:
+    """
+    Simulate one chunk of paths from its own stream (process pool worker)
+
+    Args:
+        task: (params, method, seed_sequence, first_path, chunk_paths, sample_paths)
+
+    Returns:
+        (chunk_paths, months) array of month-end balances
+    """
+    params, method, seed_sequence, _, chunk_paths, _ = task
+    simulate = _simulator(method)
+    return simulate(replace(params, paths=chunk_paths), np.random.default_rng(seed_sequence))
+
+
+def _run_chunk(task: Tuple) -> PathAggregator:
+    """
+    Simulate one chunk of paths and aggregate it (process pool worker)
+
+    Args:
+        task: (params, method, seed_sequence, first_path, chunk_paths, sample_paths)
+
+    Returns:
+        PathAggregator holding only this chunk
+    """
+    params, _, _, first_path, _, sample_paths = task
+    aggregator = PathAggregator(params, sample_paths=sample_paths)
+    aggregator.update(_simulate_chunk(task), first_path)
+    return aggregator
+
+
+def _map_chunks(function, tasks: List[Tuple], workers: int) -> List:
+    """Apply function to every chunk task, in chunk order whatever the worker count"""
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            return list(pool.map(function, tasks))
+    return [function(task) for task in tasks]
+
+
+def run_simulation(params: MonteCarloParams,
+                   method: str = 'vectorized',
+                   seed: Optional[int] = None,
+                   chunk_size: Optional[int] = None,
+                   keep_paths: bool = False,
+                   sample_paths: int = DEFAULT_SAMPLE_PATHS,
+                   workers: int = 1) -> Dict:
+    """
+    Run a Monte Carlo simulation and summarize it
+
+    Args:
+        params: MonteCarloParams object
+        method: 'vectorized' (default), 'reference' per-trade loop, or
+            'bootstrap' / 'stationary' resampling of params.trade_returns
+        seed: Optional seed for reproducible runs
+        chunk_size: Simulate this many paths at a time and stream them into
+            online aggregators; None keeps all paths in memory (drawn in
+            DEFAULT_CHUNK_SIZE chunks)
+        keep_paths: Include every simulated path as 'all_paths' (in-memory
+            mode only)
+        sample_paths: Number of evenly spaced paths returned as 'sample_paths'
+        workers: Number of processes to shard chunks across; results for a
+            given seed do not depend on it
+
+    Returns:
+        Dict with simulation results
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method} (expected one of {METHODS})")
+    if method in BOOTSTRAP_METHODS and (params.trade_returns is None or len(params.trade_returns) == 0):
+        raise ValueError(f"method='{method}' requires params.trade_returns")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if keep_paths and chunk_size is not None:
+        raise ValueError("keep_paths is not available in streaming mode (chunk_size set)")
+
+    seed_sequence = np.random.SeedSequence(seed)
+    aggregator = PathAggregator(params, sample_paths=sample_paths)
+
+    results = {
+        'paths': params.paths,
+        'months': params.months,
+        'method': method,
+        'chunk_size': chunk_size,
+        'workers': workers,
+        # Entropy of the root SeedSequence; pass it back as seed to reproduce
+        'seed': seed_sequence.entropy,
+    }
+
+    # Chunk boundaries and streams depend only on the seed and chunk size
+    chunk_paths = chunk_size or DEFAULT_CHUNK_SIZE
+    first_paths = range(0, params.paths, chunk_paths)
+    tasks = [
+        (params, method, child, first_path,
+         min(chunk_paths, params.paths - first_path), sample_paths)
+        for first_path, child in zip(first_paths, seed_sequence.spawn(len(first_paths)))
+    ]
+
+    if chunk_size is None:
+        all_paths = np.concatenate(_map_chunks(_simulate_chunk, tasks, workers))
+        aggregator.update(all_paths)
+        # Exact final-balance statistics when the whole matrix is in memory
+        results.update(summarize_final_balances(all_paths[:, -1], params))
+    else:
+        for partial in _map_chunks(_run_chunk, tasks, workers):
+            aggregator.merge(partial)
+        results.update(aggregator.summary())
+
+    results['monthly'] = aggregator.monthly()
+    results['sample_paths'] = aggregator.sampled_paths().tolist()
+    if keep_paths:
+        results['all_paths'] = all_paths.tolist()
+
+    return results
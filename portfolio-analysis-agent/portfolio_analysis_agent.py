@@ -14,17 +14,33 @@ Day Check Integration:
 - Daily note creation with correct date context
 """
 
-import csv
 import json
 import logging
 import sys
+import time
+from dataclasses import asdict, fields
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 
 import numpy as np
 import pandas as pd
-import yaml
+
+# Shared portfolio_core package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.config import DEFAULT_CONFIG_PATH, PortfolioConfig, load_portfolio_config
+from portfolio_core import (config, edge, ib_statement, lots, projection, risk, rolling, tax,
+                            trade_store, trade_table)
+from portfolio_core.edge import DEFAULT_TIME_WINDOWS, slice_edges, slices_for
+from portfolio_core.ib_statement import parse_statement
+from portfolio_core.lots import Lot, match_executions
+from portfolio_core.projection import project_yearly
+from portfolio_core.result_cache import DEFAULT_CACHE_DIR, ResultCache, cache_key, file_sha256, source_version
+from portfolio_core.risk import curve_risk_metrics, equity_curve
+from portfolio_core.rolling import RollingMetrics
+from portfolio_core.stage_graph import run_stages
+from portfolio_core.tax import estimated_payments, tax_lots, tax_summary
+from portfolio_core.trade_store import TradeStore
 
 # Day check integration
 try:
@@ -49,6 +65,39 @@ if DAY_CHECK_AVAILABLE:
 else:
     logger.warning("Day check not available - using system datetime")
 
+# Agent attributes each run_complete_analysis stage produces (and caches)
+STAGE_OUTPUTS = {
+    'trades': ('executions_df', 'deposits_df', 'trades_df', 'open_lots_df', 'account_info'),
+    'metrics': ('metrics',),
+    'edge': ('edge_analysis',),
+    'projections': ('projections',),
+    'risk': ('risk_metrics',),
+    'taxes': ('tax_analysis',),
+}
+
+# Stages each stage reads; edge, projections and risk run concurrently
+STAGE_DEPENDENCIES = {
+    'trades': (),
+    'metrics': ('trades',),
+    'edge': ('metrics',),
+    'projections': ('metrics',),
+    'risk': ('metrics',),
+    'taxes': ('projections',),
+}
+
+# Source files whose changes invalidate cached stage outputs
+CODE_FILES = (__file__, config.__file__, edge.__file__, ib_statement.__file__, lots.__file__,
+              projection.__file__, risk.__file__, rolling.__file__, tax.__file__,
+              trade_store.__file__, trade_table.__file__)
+
+
+def _format_dollars(value: Any) -> str:
+    """Dollar amount of a scalar result, or the range of a vector result over its parameter sets"""
+    values = np.ravel(np.asarray(value, dtype=float))
+    if values.size == 1:
+        return f"${values[0]:,.2f}"
+    return f"${values.min():,.2f} to ${values.max():,.2f} across {values.size} parameter sets"
+
 
 class PortfolioAnalysisAgent:
     """
@@ -62,43 +111,59 @@ class PortfolioAnalysisAgent:
     - Edge identification
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
         """
         Initialize portfolio analysis agent
 
         Args:
             config_path: Path to PORTFOLIO_PARAMETERS_COMPLETE.yaml
+            cache_dir: Directory for cached run_complete_analysis stage
+                outputs; None disables the cache
         """
-        self.config_path = config_path or "/home/aaron/projects/portfolio/PORTFOLIO_PARAMETERS_COMPLETE.yaml"
-        self.config = self._load_config()
+        self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self.params = self._load_config()
+        self.config = self.params.raw
+        self.cache = ResultCache(cache_dir) if cache_dir is not None else None
 
         # Analysis components
+        self.account_info = {}
+        self.executions_df = None
+        self.deposits_df = None
         self.trades_df = None
+        self.open_lots_df = None
         self.metrics = {}
         self.projections = {}
         self.tax_analysis = {}
         self.edge_analysis = {}
         self.risk_metrics = {}
+        self.stage_status = {}
 
         logger.info(f"Initialized PortfolioAnalysisAgent")
 
-    def _load_config(self) -> Dict:
-        """Load configuration from YAML"""
+    def _load_config(self) -> PortfolioConfig:
+        """Load configuration from YAML (cached on file mtime and hash)"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = load_portfolio_config(self.config_path)
             logger.info("Configuration loaded successfully")
             return config
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
             raise
 
-    def load_trading_csv(self, csv_path: str) -> bool:
+    def load_trading_csv(self,
+                         csv_path: str,
+                         store_path: Optional[str] = None,
+                         start: Optional[str] = None,
+                         end: Optional[str] = None) -> bool:
         """
         Load trading data from IB CSV
 
         Args:
             csv_path: Path to Interactive Brokers statement CSV
+            store_path: Trade store to ingest the statement into; trades are
+                then read back from the store, including earlier statements
+            start: Inclusive start date for store queries
+            end: Exclusive end date for store queries
 
         Returns:
             True if successful
@@ -106,52 +171,41 @@ class PortfolioAnalysisAgent:
         logger.info(f"Loading trading CSV: {csv_path}")
 
         try:
-            # Parse IB CSV statement
-            trades = []
-            account_info = {}
-
-            with open(csv_path, 'r') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) < 3:
-                        continue
-
-                    # Account information
-                    if row[0] == 'Account Information' and row[1] == 'Data':
-                        account_info[row[2]] = row[3] if len(row) > 3 else ''
-
-                    # Trades
-                    if row[0] == 'Trades' and row[1] == 'Data':
-                        if row[2] == 'Order' and row[3] == 'Stocks':
-                            trade_data = self._parse_trade_row(row)
-                            if trade_data:
-                                trades.append(trade_data)
-
-            self.trades_df = pd.DataFrame(trades)
-            self.account_info = account_info
-
-            logger.info(f"Loaded {len(self.trades_df)} trades from CSV")
+            statement = parse_statement(csv_path)
+            if store_path is not None:
+                with TradeStore(store_path) as store:
+                    added = store.ingest(statement)
+                    trades = store.executions(start, end, asset_category='Stocks')
+                    self.deposits_df = store.deposits(start, end)
+                logger.info(f"Trade store {store_path}: {added['executions_added']} new executions")
+            else:
+                trades = statement.executions(asset_category='Stocks')
+                self.deposits_df = statement.deposits
+
+            self.executions_df = pd.DataFrame({
+                'symbol': trades['symbol'],
+                'date': trades['datetime'],
+                'quantity': trades['quantity'],
+                'price': trades['price'],
+                'commission': trades['commission'],
+            })
+            self.account_info = statement.account_info
+
+            # Round trips (FIFO) drive metrics, edge, risk and tax analysis
+            matcher = match_executions(trades)
+            self.trades_df = matcher.table().to_frame()
+            self.trades_df['pnl'] = self.trades_df['realized_pnl']
+            self.open_lots_df = pd.DataFrame([asdict(lot) for lot in matcher.open_lots()],
+                                             columns=[f.name for f in fields(Lot)])
+
+            logger.info(f"Loaded {len(self.executions_df)} executions, "
+                        f"{len(self.trades_df)} round-trip trades from CSV")
             return True
 
         except Exception as e:
             logger.error(f"Failed to load CSV: {e}")
             return False
 
-    def _parse_trade_row(self, row: List) -> Optional[Dict]:
-        """Parse individual trade row from IB CSV"""
-        try:
-            # IB CSV format (simplified)
-            # Actual parsing would depend on exact CSV structure
-            return {
-                'symbol': row[5] if len(row) > 5 else '',
-                'date': row[6] if len(row) > 6 else '',
-                'quantity': float(row[7]) if len(row) > 7 else 0,
-                'price': float(row[8]) if len(row) > 8 else 0,
-                'commission': float(row[9]) if len(row) > 9 else 0,
-            }
-        except (ValueError, IndexError):
-            return None
-
     def calculate_metrics(self) -> Dict:
         """
         Calculate comprehensive trading metrics
@@ -166,22 +220,14 @@ class PortfolioAnalysisAgent:
             logger.info("No trades loaded, using config defaults")
             self.metrics = {
                 'total_trades': 0,
-                'win_rate': self.config['trading']['win_rate']['actual'] / 100,
-                'avg_return_pct': self.config['trading']['return_per_trade']['all_time_avg'] / 100,
-                'trades_per_month': self.config['trading']['trade_frequency']['trades_per_month']['baseline'],
-                'initial_capital': self.config['account']['initial_capital'],
+                'win_rate': self.params.trading.win_rate,
+                'avg_return_pct': self.params.trading.avg_return_pct,
+                'trades_per_month': self.params.trading.trades_per_month_baseline,
+                'initial_capital': self.params.account.initial_capital,
             }
         else:
-            # Calculate from actual trades
-            self.trades_df['pnl'] = (
-                self.trades_df['quantity'] *
-                (self.trades_df['exit_price'] - self.trades_df['entry_price']) -
-                self.trades_df['commission']
-            )
-            self.trades_df['return_pct'] = (
-                self.trades_df['pnl'] /
-                (self.trades_df['quantity'] * self.trades_df['entry_price'])
-            ) * 100
+            # Calculate from actual trades (round trips carry net P&L for longs and shorts)
+            self.trades_df['pnl'] = self.trades_df['realized_pnl']
 
             winning_trades = self.trades_df[self.trades_df['pnl'] > 0]
             losing_trades = self.trades_df[self.trades_df['pnl'] < 0]
@@ -199,15 +245,27 @@ class PortfolioAnalysisAgent:
                 'gross_losses': losing_trades['pnl'].sum() if len(losing_trades) > 0 else 0,
             }
 
+            # Rolling 20/50/100-trade and 30/90-day windows, fed in exit order
+            ordered = self.trades_df.sort_values('exit_time', kind='stable')
+            rolling = RollingMetrics()
+            rolling.update_many(ordered['exit_time'].dt.to_pydatetime(),
+                                ordered['pnl'].tolist(), ordered['return_pct'].tolist())
+            self.metrics['rolling'] = rolling.snapshot()
+
         logger.info(f"Metrics calculated: {self.metrics['total_trades']} trades, "
                    f"{self.metrics['win_rate']*100:.1f}% win rate")
 
         return self.metrics
 
-    def identify_edge(self) -> Dict:
+    def identify_edge(self, time_windows: Optional[Dict] = None) -> Dict:
         """
         Identify trading edge from historical data
 
+        Args:
+            time_windows: name -> (start, end) entry time-of-day windows, hours
+                or 'HH:MM' strings; defaults to edge.time_windows in the config,
+                then DEFAULT_TIME_WINDOWS
+
         Returns:
             Dict with edge analysis
         """
@@ -221,34 +279,23 @@ class PortfolioAnalysisAgent:
             }
             return self.edge_analysis
 
-        # Analyze by time of day
-        self.trades_df['entry_hour'] = pd.to_datetime(
-            self.trades_df['entry_time']
-        ).dt.hour if 'entry_time' in self.trades_df.columns else 0
-
-        # Group by time windows
-        time_windows = {
-            'premarket_0400_0500': (4, 5),
-            'market_open_0930_1000': (9, 10),
-            'late_morning_1100_1200': (11, 12),
-            'afternoon_1500_1600': (15, 16),
-        }
+        if time_windows is None:
+            time_windows = (self.config.get('edge') or {}).get('time_windows') or DEFAULT_TIME_WINDOWS
 
-        time_analysis = {}
-        for window_name, (start_hour, end_hour) in time_windows.items():
-            window_trades = self.trades_df[
-                (self.trades_df['entry_hour'] >= start_hour) &
-                (self.trades_df['entry_hour'] < end_hour)
-            ]
-
-            if len(window_trades) > 0:
-                winning = window_trades[window_trades['pnl'] > 0]
-                time_analysis[window_name] = {
-                    'trades': len(window_trades),
-                    'win_rate': len(winning) / len(window_trades) * 100,
-                    'avg_pnl': window_trades['pnl'].mean(),
-                    'total_pnl': window_trades['pnl'].sum(),
-                }
+        # All slices (time windows, symbol, hour, weekday, holding time, side) in one pass
+        slices = slice_edges(self.trades_df, time_windows=time_windows)
+
+        windows = slices_for(slices, 'time_window')
+        time_analysis = {
+            window_name: {
+                'trades': windows[window_name]['trades'],
+                'win_rate': windows[window_name]['win_rate'] * 100,
+                'avg_pnl': windows[window_name]['expectancy'],
+                'total_pnl': windows[window_name]['total_pnl'],
+                'profit_factor': windows[window_name]['profit_factor'],
+            }
+            for window_name in time_windows if window_name in windows
+        }
 
         # Identify best time window
         best_window = max(time_analysis.items(),
@@ -259,73 +306,80 @@ class PortfolioAnalysisAgent:
             'time_windows': time_analysis,
             'best_window': best_window[0] if best_window else None,
             'best_window_stats': best_window[1] if best_window else {},
+            'slices': slices.to_dict('records'),
         }
 
         logger.info(f"Edge identified: {self.edge_analysis['edge_identified']}")
 
         return self.edge_analysis
 
-    def run_projections(self, years: int = 3) -> Dict:
+    def run_projections(self,
+                        years: int = 3,
+                        initial_capital: Optional[Any] = None,
+                        monthly_deposits: Optional[Any] = None,
+                        tax_rate: Optional[Any] = None,
+                        return_per_trade: Optional[Any] = None,
+                        trades_per_month: Optional[Any] = None) -> Dict:
         """
         Run forward projections
 
+        Uses the same closed-form kernel as the forecasting agent
+        (portfolio_core.projection). Every parameter accepts a scalar or an
+        array; arrays broadcast, so one call projects many accounts or
+        parameter sets, and the result values are then nested lists in
+        broadcast order.
+
         Args:
             years: Number of years to project
+            initial_capital: Starting balance (default: metrics, then 2000)
+            monthly_deposits: Deposit added each month (default: 500)
+            tax_rate: Share of gains reserved for tax (default: 0.37)
+            return_per_trade: Return per trade (default: metrics avg_return_pct)
+            trades_per_month: Trades per month (default: metrics, then 18.5)
 
         Returns:
             Dict with projection results
         """
         logger.info(f"Running {years}-year projections")
 
-        # Import forecasting agent functionality
-        # For now, use simplified calculation
         metrics = self.metrics if self.metrics else self.calculate_metrics()
 
-        # Calculate monthly return factor
-        return_per_trade = metrics['avg_return_pct']
-        trades_per_month = metrics.get('trades_per_month', 18.5)
-        monthly_factor = (1 + return_per_trade) ** trades_per_month
-
-        initial_capital = metrics.get('initial_capital', 2000)
-        monthly_deposits = 500
-        tax_rate = 0.37
-
-        # Project year by year
-        balance = initial_capital
-        projections = []
-
-        for year in range(1, years + 1):
-            year_start = balance
-            yearly_gains = 0
-
-            for month in range(12):
-                pre_growth = balance
-                balance *= monthly_factor
-                gains = balance - pre_growth
-
-                # Tax extraction
-                tax = gains * tax_rate
-                balance -= tax
-                yearly_gains += gains
-
-                # Deposit
-                balance += monthly_deposits
-
-            projections.append({
-                'year': year,
-                'starting_balance': year_start,
-                'ending_balance': balance,
-                'gains': yearly_gains,
-                'deposits': monthly_deposits * 12,
-            })
+        if initial_capital is None:
+            initial_capital = metrics.get('initial_capital', 2000)
+        if monthly_deposits is None:
+            monthly_deposits = 500
+        if tax_rate is None:
+            tax_rate = 0.37
+        if return_per_trade is None:
+            return_per_trade = metrics['avg_return_pct']
+        if trades_per_month is None:
+            trades_per_month = metrics.get('trades_per_month', 18.5)
+
+        monthly_factor = (1 + np.asarray(return_per_trade, dtype=float)) ** np.asarray(trades_per_month, dtype=float)
+        yearly = project_yearly(initial_capital, monthly_deposits, monthly_factor, tax_rate, years)
+
+        projections = [
+            {
+                'year': year + 1,
+                'starting_balance': yearly['starting_balance'][..., year].tolist(),
+                'ending_balance': yearly['ending_balance'][..., year].tolist(),
+                'gains': yearly['gains'][..., year].tolist(),
+                'deposits': yearly['deposits'][..., year].tolist(),
+            }
+            for year in range(years)
+        ]
+        final_balance = yearly['ending_balance'][..., -1]
 
         self.projections = {
             'years': years,
             'projections': projections,
-            'final_balance': balance,
+            'final_balance': final_balance.tolist(),
         }
 
-        logger.info(f"Projections complete. Final balance: ${balance:,.2f}")
+        if final_balance.ndim == 0:
+            logger.info(f"Projections complete. Final balance: ${float(final_balance):,.2f}")
+        else:
+            logger.info(f"Projections complete for {final_balance.size} parameter sets")
 
         return self.projections
 
@@ -348,20 +402,20 @@ class PortfolioAnalysisAgent:
                 'stop_loss_pct': 5.0,
             }
         else:
-            # Calculate from actual trades
-            returns = self.trades_df['return_pct']
-            cumulative = (1 + returns / 100).cumprod()
-            running_max = cumulative.cummax()
-            drawdown = (cumulative - running_max) / running_max * 100
+            # Realized equity curve: initial capital, closed-trade P&L and cash flows
+            initial_equity = self.params.account.initial_capital or 0.0
+            curve = equity_curve(self.trades_df, self.deposits_df, initial_equity=initial_equity)
+            self.risk_metrics = curve_risk_metrics(curve, initial_equity)
 
-            self.risk_metrics = {
-                'max_drawdown_pct': float(drawdown.min()),
+            # Per-trade return distribution
+            returns = self.trades_df['return_pct']
+            self.risk_metrics.update({
                 'avg_return_pct': float(returns.mean()),
                 'return_volatility_pct': float(returns.std()),
-                'sharpe_ratio': float(returns.mean() / returns.std()) if returns.std() > 0 else 0,
+                'trade_sharpe_ratio': float(returns.mean() / returns.std()) if returns.std() > 0 else 0,
                 'best_trade_pct': float(returns.max()),
                 'worst_trade_pct': float(returns.min()),
-            }
+            })
 
         logger.info(f"Risk analysis complete. Max drawdown: {self.risk_metrics['max_drawdown_pct']:.2f}%")
 
@@ -371,6 +425,12 @@ class PortfolioAnalysisAgent:
         """
         Calculate tax obligations
 
+        Projected gains are taxed at flat federal and state rates. When
+        trades are loaded, the realized round trips also go through the tax
+        lot engine (portfolio_core.tax): short- vs long-term classification,
+        wash-sale adjustments against later and open lots, per-year netting
+        and the quarterly estimated-payment schedule.
+
         Args:
             state: State code ('NY', 'FL', 'TX')
 
@@ -381,33 +441,44 @@ class PortfolioAnalysisAgent:
 
         # Get total gains from projections or metrics
         if self.projections and 'projections' in self.projections:
-            total_gains = sum(p['gains'] for p in self.projections['projections'])
+            # Sum over years; vector projections keep one total per parameter set
+            total_gains = np.sum([p['gains'] for p in self.projections['projections']], axis=0)
         else:
-            total_gains = self.metrics.get('total_pnl', 0)
+            total_gains = np.asarray(self.metrics.get('total_pnl', 0), dtype=float)
 
         # Federal tax
         federal_rate = 0.37
 
-        # State tax
-        if state == 'NY':
-            state_rate = self.config['tax']['state_ny']['combined_rate'] / 100
-        else:
-            state_rate = 0.0
+        # State tax (NY from config, FL/TX none)
+        state_rate = self.params.tax.state_rate(state)
 
         combined_rate = federal_rate + state_rate
 
         self.tax_analysis = {
             'state': state,
-            'total_gains': total_gains,
-            'federal_tax': total_gains * federal_rate,
-            'state_tax': total_gains * state_rate,
-            'total_tax': total_gains * combined_rate,
+            'total_gains': total_gains.tolist(),
+            'federal_tax': (total_gains * federal_rate).tolist(),
+            'state_tax': (total_gains * state_rate).tolist(),
+            'total_tax': (total_gains * combined_rate).tolist(),
             'federal_rate_pct': federal_rate * 100,
             'state_rate_pct': state_rate * 100,
             'combined_rate_pct': combined_rate * 100,
         }
 
-        logger.info(f"Tax calculated: ${self.tax_analysis['total_tax']:,.2f}")
+        if self.trades_df is not None and len(self.trades_df) > 0:
+            lots = tax_lots(self.trades_df, self.open_lots_df)
+            rates = {'federal_rate': federal_rate, 'state_rate': state_rate}
+            schedule = estimated_payments(lots, **rates)
+            self.tax_analysis['realized'] = {
+                'short_term_pnl': float(lots.loc[lots['term'] == 'short', 'recognized_pnl'].sum()),
+                'long_term_pnl': float(lots.loc[lots['term'] == 'long', 'recognized_pnl'].sum()),
+                'wash_sale_disallowed': float(lots['wash_sale_disallowed'].sum()),
+                'deferred_to_open_lots': lots.attrs['deferred_loss'],
+                'years': tax_summary(lots, **rates).to_dict('records'),
+                'estimated_payments': schedule.astype({'period_end': str, 'due_date': str}).to_dict('records'),
+            }
+
+        logger.info(f"Tax calculated: ${float(np.sum(self.tax_analysis['total_tax'])):,.2f}")
 
         return self.tax_analysis
 
@@ -488,7 +559,7 @@ class PortfolioAnalysisAgent:
         if self.projections and 'projections' in self.projections:
             lines.append("\n## Forward Projections\n")
             for proj in self.projections['projections']:
-                lines.append(f"- Year {proj['year']}: ${proj['ending_balance']:,.2f}")
+                lines.append(f"- Year {proj['year']}: {_format_dollars(proj['ending_balance'])}")
 
         # Risk
         if self.risk_metrics:
@@ -498,7 +569,7 @@ class PortfolioAnalysisAgent:
         # Tax
         if self.tax_analysis:
             lines.append("\n## Tax Analysis\n")
-            lines.append(f"- Total Tax: ${self.tax_analysis.get('total_tax', 0):,.2f}")
+            lines.append(f"- Total Tax: {_format_dollars(self.tax_analysis.get('total_tax', 0))}")
 
         return '\n'.join(lines)
 
@@ -563,37 +634,73 @@ class PortfolioAnalysisAgent:
         logger.warning("Google Drive sync not yet implemented")
         return False
 
-    def run_complete_analysis(self, csv_path: str, years: int = 3, state: str = 'FL') -> Dict:
+    def run_complete_analysis(self,
+                              csv_path: str,
+                              years: int = 3,
+                              state: str = 'FL',
+                              store_path: Optional[str] = None,
+                              start: Optional[str] = None,
+                              end: Optional[str] = None,
+                              workers: int = 3) -> Dict:
         """
         Run complete portfolio analysis workflow
 
+        Stages run as a dependency graph (STAGE_DEPENDENCIES): edge,
+        projections and risk only read the metrics, so they run concurrently
+        on a thread pool.
+
+        Stage outputs (trades, metrics, edge, projections, risk, taxes) are
+        memoized in the agent's ResultCache, keyed on the statement contents,
+        config hash, years, state and code version; unchanged stages are
+        restored instead of recomputed.
+
         Args:
             csv_path: Path to IB CSV statement
             years: Years to project
             state: State for tax calculations
+            store_path: Optional trade store accumulating statements
+            start: Inclusive start date for store queries
+            end: Exclusive end date for store queries
+            workers: Threads for independent stages; 1 runs them serially
 
         Returns:
-            Complete analysis results
+            Complete analysis results; 'cache' maps each stage to 'hit',
+            'miss', 'failed' or 'uncached' (computed without the cache
+            because a stage it depends on failed), 'timings' to its
+            wall-clock seconds (plus 'total' for all stages)
         """
         logger.info(f"Starting complete portfolio analysis")
 
-        # Load data
-        self.load_trading_csv(csv_path)
-
-        # Calculate metrics
-        self.calculate_metrics()
-
-        # Identify edge
-        self.identify_edge()
-
-        # Run projections
-        self.run_projections(years=years)
-
-        # Analyze risk
-        self.analyze_risk()
+        # Each stage is keyed on its own inputs plus the keys of the stages
+        # it reads, so e.g. a new tax state only misses the taxes stage
+        code_version = source_version(*CODE_FILES)
+        config_hash = self.params.sha256
+        keys = {'trades': cache_key('trades', code_version,
+                                    self._statement_fingerprint(csv_path, store_path), start, end)}
+        for stage in ('metrics', 'edge', 'risk'):
+            keys[stage] = cache_key(stage, code_version, keys['trades'], config_hash)
+        keys['projections'] = cache_key('projections', code_version, keys['metrics'], config_hash, years)
+        keys['taxes'] = cache_key('taxes', code_version, keys['projections'], keys['metrics'],
+                                  config_hash, state)
+
+        computations = {
+            'trades': lambda: self.load_trading_csv(csv_path, store_path=store_path, start=start, end=end),
+            'metrics': self.calculate_metrics,
+            'edge': self.identify_edge,
+            'projections': lambda: self.run_projections(years=years),
+            'risk': self.analyze_risk,
+            'taxes': lambda: self.calculate_taxes(state=state),
+        }
 
-        # Calculate taxes
-        self.calculate_taxes(state=state)
+        self.stage_status = {}
+        started = time.perf_counter()
+        timings = run_stages({
+            name: (STAGE_DEPENDENCIES[name],
+                   lambda name=name: self._run_stage(name, keys[name], computations[name]))
+            for name in STAGE_DEPENDENCIES
+        }, workers=workers)
+        timings = {name: timings[name] for name in STAGE_DEPENDENCIES}
+        timings['total'] = time.perf_counter() - started
 
         # Generate dashboard
         dashboard = self.generate_dashboard()
@@ -610,8 +717,51 @@ class PortfolioAnalysisAgent:
             'dashboard': dashboard,
             'report_path': report_path,
             'exported_files': exported_files,
+            'cache': dict(self.stage_status),
+            'timings': timings,
         }
 
+    def _statement_fingerprint(self, csv_path: str, store_path: Optional[str]) -> List[str]:
+        """
+        Content hashes identifying the analyzed trades
+
+        With a trade store the statement is ingested first (a no-op when it
+        already was), and the trades are identified by every statement in
+        the store.
+        """
+        if store_path is None:
+            return [file_sha256(csv_path)]
+        with TradeStore(store_path) as store:
+            store.ingest(parse_statement(csv_path))
+            return [str(store.path.resolve())] + store.statement_hashes()
+
+    def _run_stage(self, name: str, key: str, compute) -> None:
+        """Restore a stage's outputs from the cache, or compute and cache them"""
+        if any(self.stage_status.get(dependency) in ('failed', 'uncached')
+               for dependency in STAGE_DEPENDENCIES[name]):
+            # Keys identify the inputs, not what was loaded from them: results
+            # built on a failed stage must neither be cached nor served from it
+            compute()
+            self.stage_status[name] = 'uncached'
+            return
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                for attr, value in cached.items():
+                    setattr(self, attr, value)
+                self.stage_status[name] = 'hit'
+                logger.info(f"Stage {name}: cached")
+                return
+
+        if compute() is False:
+            # Failed loads are not cached, so the next run retries them
+            self.stage_status[name] = 'failed'
+            return
+        self.stage_status[name] = 'miss'
+        if self.cache is not None:
+            self.cache.put(key, {attr: getattr(self, attr) for attr in STAGE_OUTPUTS[name]})
+
 
 def main():
     """CLI entry point"""
@@ -623,22 +773,33 @@ def main():
     parser.add_argument('--state', default='FL', help='State for tax (NY/FL/TX)')
     parser.add_argument('--config', help='Path to config YAML')
     parser.add_argument('--format', default='markdown', choices=['markdown', 'latex'])
+    parser.add_argument('--store', help='Trade store (SQLite) to ingest the statement into and analyze')
+    parser.add_argument('--since', help='Only analyze trades on or after this date (with --store)')
+    parser.add_argument('--until', help='Only analyze trades before this date (with --store)')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='Stage result cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every stage without caching')
+    parser.add_argument('--workers', type=int, default=3, help='Threads for independent analysis stages')
 
     args = parser.parse_args()
 
     # Initialize agent
-    agent = PortfolioAnalysisAgent(config_path=args.config)
+    agent = PortfolioAnalysisAgent(config_path=args.config, cache_dir=None if args.no_cache else args.cache_dir)
 
     # Run complete analysis
     results = agent.run_complete_analysis(
         csv_path=args.csv_path,
         years=args.years,
-        state=args.state
+        state=args.state,
+        store_path=args.store,
+        start=args.since,
+        end=args.until,
+        workers=args.workers
     )
 
     print(f"\n✓ Portfolio analysis complete")
     print(f"  Report: {results['report_path']}")
     print(f"  Exported: {len(results['exported_files'])} files")
+    print(f"  Stages: " + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in results['timings'].items()))
 
 
 if __name__ == '__main__':
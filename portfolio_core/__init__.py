@@ -0,0 +1,11 @@
+"""
+Portfolio Core
+Shared building blocks for the forecasting, portfolio analysis and trading analysis agents
+
+Part of astoreyai/claude-skills
+
+The agents live in hyphenated skill directories, so they put the repository
+root on sys.path before importing from this package. Modules are imported
+individually (e.g. ``from portfolio_core.config import load_portfolio_config``)
+so lightweight entry points do not pay for numpy/pandas.
+"""
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Bars
+Universe OHLCV on a shared time grid, with vectorized multi-timeframe resampling
+
+Part of astoreyai/claude-skills portfolio_core
+
+The trading scanners hold a whole universe as (symbols x bars) arrays, so
+every indicator is a NumPy operation over all symbols at once. Bars are
+aggregated into higher timeframes by segmenting the shared grid
+(np.*.reduceat), without a per-symbol groupby.
+
+ResampleCache builds each higher timeframe once from the base bars and
+then extends every cached timeframe as new base bars arrive: a bar inside
+the current bucket updates its last column, a bar in a new bucket opens
+a column. Either way the work per appended bar is O(symbols), independent
+of history length.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass
+class Bars:
+    """OHLCV for a universe on a shared time grid: (symbols x bars) arrays, NaN where a symbol has no bar"""
+    symbols: List[str]
+    timestamps: np.ndarray  # datetime64[ns], (bars,)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __post_init__(self):
+        self.timestamps = np.asarray(self.timestamps, dtype='datetime64[ns]')
+
+    def tail(self, bars: int) -> 'Bars':
+        """Most recent `bars` bars"""
+        keep = slice(max(0, len(self.timestamps) - bars), None)
+        return Bars(self.symbols, self.timestamps[keep], self.open[:, keep], self.high[:, keep],
+                    self.low[:, keep], self.close[:, keep], self.volume[:, keep])
+
+    def select(self, symbols: Sequence[str]) -> 'Bars':
+        """Subset of symbols, in the given order"""
+        rows = [self.symbols.index(s) for s in symbols]
+        return Bars(list(symbols), self.timestamps, self.open[rows], self.high[rows],
+                    self.low[rows], self.close[rows], self.volume[rows])
+
+    def bar_minutes(self) -> int:
+        """Typical spacing of the grid in minutes"""
+        if len(self.timestamps) < 2:
+            return 1
+        return max(1, int(np.median(np.diff(self.timestamps.astype(np.int64)))) // NS_PER_MINUTE)
+
+
+def load_bars(frames: Mapping[str, pd.DataFrame]) -> Bars:
+    """
+    Stack per-symbol OHLCV frames onto one time grid
+
+    Args:
+        frames: symbol -> DataFrame with open, high, low, close, volume and
+            either a DatetimeIndex or a timestamp column
+
+    Returns:
+        Bars over the union of all timestamps
+    """
+    symbols = list(frames)
+    stamps = {}
+    for symbol, frame in frames.items():
+        index = frame['timestamp'] if 'timestamp' in frame.columns else frame.index
+        stamps[symbol] = pd.to_datetime(index).to_numpy(dtype='datetime64[ns]')
+
+    grid = np.unique(np.concatenate(list(stamps.values()))) if stamps else np.array([], dtype='datetime64[ns]')
+    arrays = np.full((5, len(symbols), len(grid)), np.nan)
+    for row, symbol in enumerate(symbols):
+        position = np.searchsorted(grid, stamps[symbol])
+        for k, column in enumerate(FIELDS):
+            arrays[k, row, position] = frames[symbol][column].to_numpy(dtype=float)
+    return Bars(symbols, grid, *arrays)
+
+
+def load_bars_dir(directory: Path, symbols: Optional[Sequence[str]] = None) -> Bars:
+    """Load <SYMBOL>.csv files (timestamp, open, high, low, close, volume)"""
+    directory = Path(directory)
+    paths = [directory / f"{s}.csv" for s in symbols] if symbols else sorted(directory.glob('*.csv'))
+    frames = {}
+    for path in paths:
+        frame = pd.read_csv(path).rename(columns=str.lower)
+        if 'timestamp' not in frame.columns:
+            frame = frame.rename(columns={frame.columns[0]: 'timestamp'})
+        frames[path.stem] = frame
+    return load_bars(frames)
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN along bars; leading NaN stays"""
+    index = np.where(np.isnan(x), 0, np.arange(x.shape[1]))
+    np.maximum.accumulate(index, axis=1, out=index)
+    return x[np.arange(len(x))[:, None], index]
+
+
+def resample(bars: Bars, minutes: int) -> Bars:
+    """
+    Aggregate bars into `minutes` buckets for every symbol at once
+
+    Buckets are segments of the shared grid (np.*.reduceat), so there is
+    no per-symbol groupby. Buckets a symbol did not trade in carry its
+    previous close forward with zero volume.
+    """
+    if len(bars.timestamps) == 0:
+        return bars
+    bucket = bars.timestamps.astype(np.int64) // (minutes * NS_PER_MINUTE)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)]
+
+    bar = np.arange(len(bucket))
+    first = np.minimum.reduceat(np.where(np.isnan(bars.open), len(bucket), bar), starts, axis=1)
+    last = np.maximum.reduceat(np.where(np.isnan(bars.close), -1, bar), starts, axis=1)
+    rows = np.arange(len(bars.symbols))[:, None]
+    open_ = np.where(first < ends, bars.open[rows, np.minimum(first, len(bucket) - 1)], np.nan)
+    close = np.where(last >= starts, bars.close[rows, np.maximum(last, 0)], np.nan)
+    high = np.fmax.reduceat(bars.high, starts, axis=1)
+    low = np.fmin.reduceat(bars.low, starts, axis=1)
+    volume = np.add.reduceat(np.nan_to_num(bars.volume), starts, axis=1)
+
+    missing = np.isnan(close)
+    close = _ffill(close)
+    open_ = np.where(missing, close, open_)
+    high = np.where(missing, close, high)
+    low = np.where(missing, close, low)
+    timestamps = (bucket[starts] * minutes * NS_PER_MINUTE).astype('datetime64[ns]')
+    return Bars(bars.symbols, timestamps, open_, high, low, close, volume)
+
+
+class _BarBuffer:
+    """Growable (field x symbols x bars) storage for one timeframe"""
+
+    def __init__(self, bars: Bars, bucket_ns: int, filled: np.ndarray, fill_missing: bool = True):
+        self.bucket_ns = bucket_ns
+        self.fill_missing = fill_missing
+        self.size = len(bars.timestamps)
+        capacity = max(16, 2 * self.size)
+        self.data = np.full((5, len(bars.symbols), capacity), np.nan)
+        self.stamps = np.zeros(capacity, dtype=np.int64)
+        for k, name in enumerate(FIELDS):
+            self.data[k, :, :self.size] = getattr(bars, name)
+        self.stamps[:self.size] = bars.timestamps.astype(np.int64)
+        self.last_bucket = int(self.stamps[self.size - 1]) // bucket_ns if self.size else None
+        # Symbols whose last column is a forward-filled placeholder, not a real bar
+        self.filled = filled
+
+    def view(self, symbols: List[str]) -> Bars:
+        data = self.data[:, :, :self.size]
+        return Bars(symbols, self.stamps[:self.size].astype('datetime64[ns]'), *data)
+
+    def push(self, stamp: int, values: np.ndarray) -> bool:
+        """Add one base bar (values: 5 x symbols); True if it closed the previous bucket"""
+        open_, high, low, close, volume = values
+        valid = ~np.isnan(close)
+        bucket = stamp // self.bucket_ns
+
+        if self.size and bucket == self.last_bucket:
+            column = self.data[:, :, self.size - 1]
+            fresh = self.filled & valid
+            column[:, fresh] = values[:, fresh]
+            self.filled &= ~valid
+            update = valid & ~fresh
+            column[1, update] = np.fmax(column[1, update], high[update])
+            column[2, update] = np.fmin(column[2, update], low[update])
+            column[3, update] = close[update]
+            column[4, update] += np.nan_to_num(volume[update])
+            return False
+
+        if self.size == self.data.shape[2]:
+            self.data = np.concatenate([self.data, np.full_like(self.data, np.nan)], axis=2)
+            self.stamps = np.concatenate([self.stamps, np.zeros_like(self.stamps)])
+        column = self.data[:, :, self.size]
+        if self.fill_missing:
+            previous_close = self.data[3, :, self.size - 1] if self.size else np.full(len(close), np.nan)
+            column[:4] = np.where(valid, values[:4], previous_close)
+            column[4] = np.where(valid, np.nan_to_num(volume), 0.0)
+        else:
+            column[:] = values
+        self.stamps[self.size] = bucket * self.bucket_ns
+        self.filled = ~valid
+        self.size += 1
+        self.last_bucket = bucket
+        return self.size > 1
+
+
+class ResampleCache:
+    """Higher timeframes built once from base bars and extended bar by bar"""
+
+    def __init__(self, base: Bars):
+        self.symbols = base.symbols
+        self.base_minutes = base.bar_minutes()
+        self._base = _BarBuffer(base, 1, np.zeros(len(base.symbols), dtype=bool), fill_missing=False)
+        self._frames: Dict[int, _BarBuffer] = {}
+
+    @property
+    def base(self) -> Bars:
+        """All base bars as loaded (gaps stay NaN), including appended ones"""
+        return self._base.view(self.symbols)
+
+    def get(self, minutes: int) -> Bars:
+        """
+        Bars for a `minutes` timeframe; resampled on first use, then kept current
+
+        Gaps are forward-filled as in resample(), also on the base
+        timeframe. The last bar may still be forming (its bucket has not
+        ended yet).
+        """
+        if minutes not in self._frames:
+            base = self.base
+            frame = resample(base, minutes)
+            bucket_ns = minutes * NS_PER_MINUTE
+            if len(frame.timestamps):
+                in_last = base.timestamps.astype(np.int64) // bucket_ns == frame.timestamps[-1].astype(np.int64) // bucket_ns
+                filled = np.isnan(base.close[:, in_last]).all(axis=1)
+            else:
+                filled = np.zeros(len(self.symbols), dtype=bool)
+            self._frames[minutes] = _BarBuffer(frame, bucket_ns, filled)
+        return self._frames[minutes].view(self.symbols)
+
+    def append(self, timestamp, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+               close: np.ndarray, volume: np.ndarray) -> List[int]:
+        """
+        Add one base bar for every symbol (NaN where a symbol has no bar)
+
+        Returns:
+            Cached timeframes (minutes) whose previous bar this one closed
+        """
+        stamp = int(np.datetime64(timestamp, 'ns').astype(np.int64))
+        values = np.array([open_, high, low, close, volume], dtype=float)
+        self._base.push(stamp, values)
+        return [minutes for minutes, frame in self._frames.items() if frame.push(stamp, values)]
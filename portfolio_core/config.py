@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Portfolio Config
+Cached loading of PORTFOLIO_PARAMETERS_COMPLETE.yaml into typed parameters
+
+Part of astoreyai/claude-skills portfolio_core
+
+Loading order, cheapest first:
+1. In-process cache keyed on (path, mtime_ns, size)
+2. Pickle cache stored next to the YAML, valid while its recorded
+   mtime/size match, or while the file's SHA-256 is unchanged
+3. YAML parse with the libyaml C loader when available
+
+Parsed parameters are resolved once into frozen dataclasses; a missing
+required key raises KeyError at load time, naming the dotted key. The raw
+dict is shared between callers and must be treated as read-only.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger('portfolio_core.config')
+
+DEFAULT_CONFIG_PATH = "/home/aaron/projects/portfolio/PORTFOLIO_PARAMETERS_COMPLETE.yaml"
+
+# Bump when the cache file layout changes
+CACHE_VERSION = 1
+
+SCENARIOS = ('conservative', 'baseline', 'aggressive')
+
+
+@dataclass(frozen=True)
+class AccountParams:
+    """Account-level parameters"""
+    initial_capital: float
+    monthly_deposits: float
+
+
+@dataclass(frozen=True)
+class TradingParams:
+    """Trading parameters, percentages converted to fractions"""
+    win_rate: float
+    avg_return_pct: float
+    avg_loser_pct: float
+    trades_per_month_conservative: float
+    trades_per_month_baseline: float
+    trades_per_month_aggressive: float
+
+    def trades_per_month(self, scenario: str = 'baseline') -> float:
+        """Trades per month for a scenario; unknown names fall back to baseline"""
+        if scenario == 'conservative':
+            return self.trades_per_month_conservative
+        if scenario == 'aggressive':
+            return self.trades_per_month_aggressive
+        return self.trades_per_month_baseline
+
+
+@dataclass(frozen=True)
+class TaxParams:
+    """Tax parameters, percentages converted to fractions"""
+    quarterly_extraction_rate: float
+    ny_combined_rate: Optional[float]
+
+    def state_rate(self, state: str) -> float:
+        """State income tax rate (NY from config; FL/TX have none)"""
+        if state == 'NY':
+            if self.ny_combined_rate is None:
+                raise KeyError("tax.state_ny.combined_rate missing from config")
+            return self.ny_combined_rate
+        return 0.0
+
+
+@dataclass(frozen=True)
+class PortfolioConfig:
+    """Resolved portfolio configuration"""
+    path: str
+    sha256: str
+    raw: Dict[str, Any]
+    account: AccountParams
+    trading: TradingParams
+    tax: TaxParams
+
+
+def _yaml_loader():
+    """libyaml-backed CSafeLoader when compiled in, else the pure-Python SafeLoader"""
+    import yaml
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _lookup(raw: Dict, *keys: str, default: Any = None) -> Any:
+    """Nested dict lookup returning default when any key is missing"""
+    node = raw
+    for key in keys:
+        if not isinstance(node, dict) or key not in node:
+            return default
+        node = node[key]
+    return node
+
+
+def _require(raw: Dict, *keys: str, path: str = '') -> Any:
+    """Nested dict lookup raising KeyError naming the dotted key when it is missing"""
+    value = _lookup(raw, *keys)
+    if value is None:
+        source = f" {path}" if path else ''
+        raise KeyError(f"{'.'.join(keys)} missing from config{source}")
+    return value
+
+
+def _pct(value: Any) -> Optional[float]:
+    """Convert a percentage from config to a fraction"""
+    return None if value is None else float(value) / 100
+
+
+def resolve_config(raw: Dict, path: str = '', sha256: str = '') -> PortfolioConfig:
+    """
+    Resolve a raw config dict into typed parameters
+
+    Args:
+        raw: Parsed YAML
+        path: Source path (informational)
+        sha256: Hex digest of the source file (informational)
+
+    Returns:
+        PortfolioConfig
+
+    Raises:
+        KeyError: A required key is missing (the message names it)
+    """
+    def require(*keys: str) -> Any:
+        return _require(raw, *keys, path=path)
+
+    baseline = require('trading', 'trade_frequency', 'trades_per_month', 'baseline')
+    frequency = _lookup(raw, 'trading', 'trade_frequency', 'trades_per_month')
+
+    return PortfolioConfig(
+        path=path,
+        sha256=sha256,
+        raw=raw,
+        account=AccountParams(
+            initial_capital=require('account', 'initial_capital'),
+            monthly_deposits=require('account', 'monthly_deposits'),
+        ),
+        trading=TradingParams(
+            win_rate=_pct(require('trading', 'win_rate', 'actual')),
+            avg_return_pct=_pct(require('trading', 'return_per_trade', 'all_time_avg')),
+            avg_loser_pct=_pct(require('trading', 'loss_parameters', 'avg_loser_pct')),
+            trades_per_month_conservative=frequency.get('conservative', baseline),
+            trades_per_month_baseline=baseline,
+            trades_per_month_aggressive=frequency.get('aggressive', baseline),
+        ),
+        tax=TaxParams(
+            quarterly_extraction_rate=_pct(require('tax', 'quarterly_extraction_pct')),
+            ny_combined_rate=_pct(_lookup(raw, 'tax', 'state_ny', 'combined_rate')),
+        ),
+    )
+
+
+def cache_path_for(config_path: Path) -> Path:
+    """Location of the pickle cache for a config file"""
+    return config_path.with_name(f".{config_path.name}.cache.pkl")
+
+
+def _read_cache(cache_path: Path) -> Optional[Dict]:
+    """Load the pickle cache, ignoring missing, stale-format or corrupt files"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+        return None
+    return cached
+
+
+def _write_cache(cache_path: Path, raw: Dict, sha256: str, stat: os.stat_result) -> None:
+    """Atomically write the pickle cache; failures only cost the next cold start"""
+    payload = {
+        'version': CACHE_VERSION,
+        'sha256': sha256,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'raw': raw,
+    }
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+_memory_cache: Dict[str, Tuple[int, int, PortfolioConfig]] = {}
+
+
+def load_portfolio_config(config_path: Optional[str] = None, use_disk_cache: bool = True) -> PortfolioConfig:
+    """
+    Load and resolve the portfolio config, reusing cached parses
+
+    Args:
+        config_path: Path to PORTFOLIO_PARAMETERS_COMPLETE.yaml
+        use_disk_cache: Read and write the pickle cache next to the YAML
+
+    Returns:
+        PortfolioConfig
+    """
+    path = Path(config_path or DEFAULT_CONFIG_PATH)
+    key = str(path.resolve())
+    stat = path.stat()
+
+    cached = _memory_cache.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    cache_path = cache_path_for(path)
+    disk = _read_cache(cache_path) if use_disk_cache else None
+
+    if disk and (disk['mtime_ns'], disk['size']) == (stat.st_mtime_ns, stat.st_size):
+        raw, sha256 = disk['raw'], disk['sha256']
+    else:
+        content = path.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+        if disk and disk['sha256'] == sha256:
+            # Touched but unchanged: keep the parse, refresh the recorded mtime
+            raw = disk['raw']
+        else:
+            import yaml
+            raw = yaml.load(content, Loader=_yaml_loader()) or {}
+            logger.debug(f"Parsed config YAML: {path}")
+        if use_disk_cache:
+            _write_cache(cache_path, raw, sha256, stat)
+
+    config = resolve_config(raw, path=str(path), sha256=sha256)
+    _memory_cache[key] = (stat.st_mtime_ns, stat.st_size, config)
+    return config
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Edge Slicing
+Per-slice trade statistics over arbitrary grouping keys
+
+Part of astoreyai/claude-skills portfolio_core
+
+Round trips (TradeTable or its to_frame()) are tagged with key columns -
+symbol, entry hour, weekday, holding-time bucket, category, side and
+configurable time-of-day windows. slice_edges() gives every (dimension,
+slice) pair one integer code and aggregates all dimensions at once with
+np.bincount; slice_stats() groups by any combination of keys. Every slice
+gets trades, win rate, expectancy, profit factor and total P&L, and the
+result is an ordinary DataFrame that can be sorted or filtered.
+
+Time windows may overlap: trade/window membership is computed as one
+(trades x windows) interval test, so a trade counts in every window that
+contains its entry time.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from portfolio_core.trade_table import TradeTable
+
+DIMENSIONS = ('symbol', 'hour', 'weekday', 'time_window', 'holding_bucket', 'category', 'side')
+
+# name -> (start, end) entry time of day; hours as numbers or 'HH:MM' strings, end exclusive
+DEFAULT_TIME_WINDOWS = {
+    'premarket_0400_0500': (4, 5),
+    'market_open_0930_1000': (9, 10),
+    'late_morning_1100_1200': (11, 12),
+    'afternoon_1500_1600': (15, 16),
+}
+
+# Holding-time bucket edges in minutes (left-inclusive) and their labels
+HOLDING_BUCKETS = (
+    (0, '<5m'),
+    (5, '5-30m'),
+    (30, '30-60m'),
+    (60, '1h-1d'),
+    (1440, '1-5d'),
+    (7200, '5d+'),
+)
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+STAT_COLUMNS = ['trades', 'wins', 'win_rate', 'expectancy', 'profit_factor',
+                'total_pnl', 'gross_profit', 'gross_loss', 'avg_return_pct']
+
+TimeWindows = Dict[str, Tuple[Union[int, float, str], Union[int, float, str]]]
+
+
+def _minute_of_day(value: Union[int, float, str]) -> float:
+    """Window bound to minutes after midnight: 9.5 or '09:30' -> 570"""
+    if isinstance(value, str):
+        hours, _, minutes = value.partition(':')
+        return int(hours) * 60 + int(minutes or 0)
+    return float(value) * 60
+
+
+def _as_frame(trades: Union[TradeTable, pd.DataFrame]) -> pd.DataFrame:
+    return trades.to_frame() if isinstance(trades, TradeTable) else trades
+
+
+def edge_keys(trades: Union[TradeTable, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Single-valued grouping keys for each round trip
+
+    Args:
+        trades: TradeTable or frame with entry_time, holding_minutes, and
+            optionally symbol, category and side columns
+
+    Returns:
+        Frame aligned with trades: symbol, hour, weekday, holding_bucket,
+        category, side (those derivable from the input)
+    """
+    frame = _as_frame(trades)
+    entry = pd.to_datetime(frame['entry_time'])
+    keys = pd.DataFrame(index=frame.index)
+
+    for column in ('symbol', 'category', 'side'):
+        if column in frame.columns:
+            keys[column] = frame[column].astype(str)
+    keys['hour'] = entry.dt.hour
+    keys['weekday'] = pd.Categorical.from_codes(entry.dt.weekday.to_numpy(), categories=list(WEEKDAYS))
+    if 'holding_minutes' in frame.columns:
+        edges, labels = zip(*HOLDING_BUCKETS)
+        keys['holding_bucket'] = pd.cut(frame['holding_minutes'], bins=list(edges) + [np.inf],
+                                        labels=list(labels), right=False)
+    return keys
+
+
+def window_membership(trades: Union[TradeTable, pd.DataFrame],
+                      time_windows: Optional[TimeWindows] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (trade row, window name) pairs for every window containing a trade's entry time
+
+    Returns:
+        rows: Positional trade indices
+        names: Window name for each row index
+    """
+    time_windows = DEFAULT_TIME_WINDOWS if time_windows is None else time_windows
+    frame = _as_frame(trades)
+    if not time_windows or not len(frame):
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=object)
+
+    entry = pd.to_datetime(frame['entry_time'])
+    minutes = (entry.dt.hour * 60 + entry.dt.minute + entry.dt.second / 60).to_numpy()
+    names = np.array(list(time_windows), dtype=object)
+    starts = np.array([_minute_of_day(start) for start, _ in time_windows.values()])
+    ends = np.array([_minute_of_day(end) for _, end in time_windows.values()])
+
+    inside = (minutes[:, None] >= starts) & (minutes[:, None] < ends)
+    rows, windows = np.nonzero(inside)
+    return rows, names[windows]
+
+
+def _aggregate(long: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
+    """Grouped stats over a frame with pnl, return_pct and key columns"""
+    pnl = long['pnl']
+    long = long.assign(
+        win=(pnl > 0).astype(np.int64),
+        gross_profit=pnl.clip(lower=0),
+        gross_loss=pnl.clip(upper=0),
+    )
+    grouped = long.groupby(list(by), observed=True, sort=False).agg(
+        trades=('pnl', 'size'),
+        wins=('win', 'sum'),
+        total_pnl=('pnl', 'sum'),
+        gross_profit=('gross_profit', 'sum'),
+        gross_loss=('gross_loss', 'sum'),
+        avg_return_pct=('return_pct', 'mean'),
+    )
+
+    grouped['win_rate'] = grouped['wins'] / grouped['trades']
+    grouped['expectancy'] = grouped['total_pnl'] / grouped['trades']
+    losses = grouped['gross_loss'].abs()
+    grouped['profit_factor'] = np.where(losses > 0, grouped['gross_profit'] / losses.where(losses > 0, 1), 0.0)
+    return grouped[STAT_COLUMNS].reset_index()
+
+
+def slice_stats(trades: Union[TradeTable, pd.DataFrame],
+                by: Sequence[str],
+                time_windows: Optional[TimeWindows] = None) -> pd.DataFrame:
+    """
+    Stats for every combination of the given keys (e.g. ['symbol', 'side'])
+
+    Args:
+        trades: TradeTable or frame with realized_pnl (or pnl), return_pct,
+            entry_time and holding_minutes
+        by: Key names from DIMENSIONS, or any column of the trade frame
+        time_windows: Windows used when 'time_window' is a key
+
+    Returns:
+        One row per key combination with the keys and STAT_COLUMNS
+    """
+    frame = _as_frame(trades).reset_index(drop=True)
+    keys = edge_keys(frame)
+    data = pd.DataFrame({
+        'pnl': frame['realized_pnl'] if 'realized_pnl' in frame.columns else frame['pnl'],
+        'return_pct': frame['return_pct'],
+    })
+    for name in by:
+        if name != 'time_window':
+            data[name] = keys[name] if name in keys.columns else frame[name]
+
+    if 'time_window' in by:
+        rows, names = window_membership(frame, time_windows)
+        data = data.iloc[rows].assign(time_window=names)
+
+    return _aggregate(data, by)
+
+
+def slice_edges(trades: Union[TradeTable, pd.DataFrame],
+                dimensions: Sequence[str] = DIMENSIONS,
+                time_windows: Optional[TimeWindows] = None,
+                min_trades: int = 1,
+                sort_by: str = 'expectancy') -> pd.DataFrame:
+    """
+    Stats for every slice of every dimension in one aggregation pass
+
+    Args:
+        trades: TradeTable or trade frame (see slice_stats)
+        dimensions: Dimensions to slice by, each independently
+        time_windows: name -> (start, end) windows for 'time_window'
+        min_trades: Drop slices with fewer trades
+        sort_by: Stat column to sort by, descending
+
+    Returns:
+        Tidy frame: dimension, slice, then STAT_COLUMNS
+    """
+    frame = _as_frame(trades).reset_index(drop=True)
+    if not len(frame):
+        return pd.DataFrame(columns=['dimension', 'slice'] + STAT_COLUMNS)
+
+    keys = edge_keys(frame)
+    pnl = (frame['realized_pnl'] if 'realized_pnl' in frame.columns else frame['pnl']).to_numpy(dtype=float)
+    returns = frame['return_pct'].to_numpy(dtype=float)
+
+    # Give every (dimension, slice) pair one integer code, then aggregate
+    # all dimensions together with a single set of bincounts
+    rows, codes, dims, labels = [], [], [], []
+    offset = 0
+    for dimension in dimensions:
+        if dimension == 'time_window':
+            dimension_rows, names = window_membership(frame, time_windows)
+            dimension_codes, uniques = pd.factorize(names)
+        else:
+            dimension_rows = np.arange(len(frame))
+            dimension_codes, uniques = pd.factorize(keys[dimension], sort=True)
+        rows.append(dimension_rows)
+        codes.append(dimension_codes + offset)
+        dims.extend([dimension] * len(uniques))
+        labels.extend(str(value) for value in uniques)
+        offset += len(uniques)
+
+    rows = np.concatenate(rows)
+    codes = np.concatenate(codes)
+    slice_pnl = pnl[rows]
+
+    trades = np.bincount(codes, minlength=offset)
+    wins = np.bincount(codes, weights=slice_pnl > 0, minlength=offset)
+    total_pnl = np.bincount(codes, weights=slice_pnl, minlength=offset)
+    gross_profit = np.bincount(codes, weights=np.maximum(slice_pnl, 0), minlength=offset)
+    gross_loss = np.bincount(codes, weights=np.minimum(slice_pnl, 0), minlength=offset)
+    total_return = np.bincount(codes, weights=returns[rows], minlength=offset)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table = pd.DataFrame({
+            'dimension': dims,
+            'slice': labels,
+            'trades': trades,
+            'wins': wins.astype(np.int64),
+            'win_rate': wins / trades,
+            'expectancy': total_pnl / trades,
+            'profit_factor': np.where(gross_loss < 0, gross_profit / -gross_loss, 0.0),
+            'total_pnl': total_pnl,
+            'gross_profit': gross_profit,
+            'gross_loss': gross_loss,
+            'avg_return_pct': total_return / trades,
+        })
+
+    table = table[table['trades'] >= min_trades]
+    return table.sort_values(sort_by, ascending=False, kind='stable').reset_index(drop=True)
+
+
+def slices_for(table: pd.DataFrame, dimension: str) -> Dict[str, Dict]:
+    """One dimension of a slice_edges() table as {slice: stats}"""
+    rows = table[table['dimension'] == dimension].set_index('slice')[STAT_COLUMNS]
+    return rows.to_dict('index')
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+IB Statement Parser
+Section-aware parsing of Interactive Brokers activity statement CSVs
+
+Part of astoreyai/claude-skills portfolio_core
+
+An activity statement stacks many tables in one CSV. Every row starts with
+the section name and a row kind ('Header', 'Data', 'Total', 'SubTotal',
+...), and each 'Header' row defines the columns of the 'Data' rows that
+follow it. parse_statement() reads the file once, groups Data rows by
+section and header block, and builds one DataFrame per section. Numeric
+and date columns are converted column-wise rather than per row.
+
+Parsed statements are cached in memory (the MEMORY_CACHE_SIZE most recent)
+and on disk keyed on the SHA-256 of the file contents, so repeat loads of
+large statements skip parsing. Every load returns its own IBStatement with
+the requested path and copied section frames, so callers can modify them.
+"""
+
+import csv
+import hashlib
+import io
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger('portfolio_core.ib_statement')
+
+TRADES = 'Trades'
+DEPOSITS = 'Deposits & Withdrawals'
+ACCOUNT_INFORMATION = 'Account Information'
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-skills" / "ib_statements"
+
+# Bump when the parsed layout changes so stale disk caches are ignored
+CACHE_VERSION = 1
+
+# Parsed statements kept in memory, least recently used evicted first
+MEMORY_CACHE_SIZE = 8
+
+# Columns assumed when Data rows appear without a preceding Header row
+DEFAULT_HEADERS = {
+    TRADES: ['DataDiscriminator', 'Asset Category', 'Currency', 'Symbol', 'Date/Time',
+             'Quantity', 'T. Price', 'C. Price', 'Proceeds', 'Comm/Fee', 'Basis',
+             'Realized P/L', 'MTM P/L', 'Code'],
+    DEPOSITS: ['Currency', 'Settle Date', 'Description', 'Amount'],
+    ACCOUNT_INFORMATION: ['Field Name', 'Field Value'],
+}
+
+# IB header names -> normalized column names for the sections agents use
+COLUMN_NAMES = {
+    TRADES: {
+        'DataDiscriminator': 'discriminator',
+        'Asset Category': 'asset_category',
+        'Currency': 'currency',
+        'Symbol': 'symbol',
+        'Date/Time': 'datetime',
+        'Quantity': 'quantity',
+        'T. Price': 'price',
+        'C. Price': 'close_price',
+        'Proceeds': 'proceeds',
+        'Comm/Fee': 'commission',
+        'Basis': 'basis',
+        'Realized P/L': 'realized_pnl',
+        'MTM P/L': 'mtm_pnl',
+        'Code': 'code',
+    },
+    DEPOSITS: {
+        'Currency': 'currency',
+        'Settle Date': 'settle_date',
+        'Description': 'description',
+        'Amount': 'amount',
+    },
+    ACCOUNT_INFORMATION: {
+        'Field Name': 'field',
+        'Field Value': 'value',
+    },
+}
+
+NUMERIC_COLUMNS = {
+    TRADES: ['quantity', 'price', 'close_price', 'proceeds', 'commission',
+             'basis', 'realized_pnl', 'mtm_pnl'],
+    DEPOSITS: ['amount'],
+}
+
+DATE_COLUMNS = {
+    TRADES: ['datetime'],
+    DEPOSITS: ['settle_date'],
+}
+
+
+# Spare columns appended to each header so rows wider than their header
+# are not misread as index columns by the C parser
+_SPARE_COLUMNS = 4
+
+
+def _to_numeric(column: pd.Series) -> pd.Series:
+    """Vectorized float parsing, tolerating thousands separators and blanks"""
+    if pd.api.types.is_numeric_dtype(column):
+        return column.astype(float)
+    return pd.to_numeric(column.astype(str).str.replace(',', '', regex=False), errors='coerce').astype(float)
+
+
+def _to_datetime(column: pd.Series) -> pd.Series:
+    """Parse IB timestamps ('2025-01-02, 09:31:05') and plain dates"""
+    text = column.fillna('').astype(str).str.replace(',', '', regex=False).str.strip()
+    parsed = pd.to_datetime(text, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    missing = parsed.isna() & text.ne('')
+    if missing.any():
+        parsed[missing] = pd.to_datetime(text[missing], format='%Y-%m-%d', errors='coerce')
+    return parsed
+
+
+def _split_prefix(line: str) -> List[str]:
+    """Section name and row kind of a CSV line without parsing the rest"""
+    if line.startswith('"'):
+        return next(csv.reader([line]))[:2]
+    return line.split(',', 2)[:2]
+
+
+@dataclass
+class IBStatement:
+    """Parsed activity statement: one DataFrame per section"""
+    path: str
+    sha256: str
+    sections: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    def section(self, name: str) -> pd.DataFrame:
+        """Data rows of a section (empty DataFrame when absent)"""
+        df = self.sections.get(name)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=list(COLUMN_NAMES.get(name, {}).values()))
+        return df
+
+    @property
+    def trades(self) -> pd.DataFrame:
+        """All Trades data rows with normalized, typed columns"""
+        return self.section(TRADES)
+
+    def executions(self, asset_category: Optional[str] = None) -> pd.DataFrame:
+        """
+        Order-level trade rows (excludes ClosedLot and other detail rows)
+
+        Args:
+            asset_category: Optional filter, e.g. 'Stocks'
+        """
+        trades = self.trades
+        if 'discriminator' not in trades.columns:
+            return trades.iloc[0:0]
+        mask = trades['discriminator'] == 'Order'
+        if asset_category is not None:
+            mask &= trades['asset_category'] == asset_category
+        return trades[mask].reset_index(drop=True)
+
+    @property
+    def deposits(self) -> pd.DataFrame:
+        """Deposits & Withdrawals rows, excluding IB's 'Total' rows"""
+        deposits = self.section(DEPOSITS)
+        if 'currency' not in deposits.columns:
+            return deposits.iloc[0:0]
+        return deposits[~deposits['currency'].astype(str).str.startswith('Total')].reset_index(drop=True)
+
+    @property
+    def account_info(self) -> Dict[str, str]:
+        """Account Information section as a field -> value dict"""
+        info = self.section(ACCOUNT_INFORMATION)
+        if info.empty or 'value' not in info.columns:
+            return {}
+        return dict(zip(info['field'], info['value'].fillna('')))
+
+
+def _read_block(header: List[str], lines: List[str]) -> pd.DataFrame:
+    """Parse one header block's Data lines with the pandas C parser"""
+    names = ['_section', '_kind'] + list(header)
+    names += [f'column_{i}' for i in range(len(header), len(header) + _SPARE_COLUMNS)]
+    df = pd.read_csv(io.StringIO(''.join(lines)), header=None, names=names,
+                     thousands=',', keep_default_na=False, na_values=[''])
+    spare = [name for name in names[len(header) + 2:] if df[name].isna().all()]
+    return df.drop(columns=['_section', '_kind'] + spare)
+
+
+def _build_section(name: str, blocks: List[tuple]) -> pd.DataFrame:
+    """Assemble a section's header blocks into one typed DataFrame"""
+    frames = [_read_block(header, lines) for header, lines in blocks if lines]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df = df.rename(columns=COLUMN_NAMES.get(name, {}))
+
+    for column in NUMERIC_COLUMNS.get(name, []):
+        if column in df.columns:
+            df[column] = _to_numeric(df[column])
+    for column in DATE_COLUMNS.get(name, []):
+        if column in df.columns:
+            df[column] = _to_datetime(df[column])
+
+    return df
+
+
+def parse_statement_text(text: str, path: str = '', sha256: str = '') -> IBStatement:
+    """
+    Parse statement CSV content in a single pass
+
+    Lines are routed to their section's current header block by their
+    first two fields only; each block is then parsed in bulk by pandas.
+
+    Args:
+        text: Full CSV content
+        path: Source path (informational)
+        sha256: Content hash (informational)
+
+    Returns:
+        IBStatement
+    """
+    # section -> list of (header, data lines) blocks, in file order
+    blocks: Dict[str, List[tuple]] = {}
+
+    for line in text.splitlines(keepends=True):
+        prefix = _split_prefix(line)
+        if len(prefix) < 2:
+            continue
+        section, kind = prefix
+
+        if kind == 'Header':
+            header = next(csv.reader([line]))[2:]
+            blocks.setdefault(section, []).append((header, []))
+        elif kind == 'Data':
+            section_blocks = blocks.get(section)
+            if not section_blocks:
+                section_blocks = blocks[section] = [(DEFAULT_HEADERS.get(section, []), [])]
+            section_blocks[-1][1].append(line if line.endswith('\n') else line + '\n')
+
+    sections = {name: _build_section(name, section_blocks) for name, section_blocks in blocks.items()}
+    return IBStatement(path=path, sha256=sha256, sections=sections)
+
+
+_memory_cache: 'OrderedDict[str, IBStatement]' = OrderedDict()
+
+
+def _copy_statement(statement: IBStatement, path: str) -> IBStatement:
+    """Independent IBStatement for one load (copy-on-write, so cheap until modified)"""
+    sections = {name: df.copy() for name, df in statement.sections.items()}
+    return IBStatement(path=path, sha256=statement.sha256, sections=sections)
+
+
+def parse_statement(csv_path: str, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> IBStatement:
+    """
+    Parse an IB activity statement, reusing cached results for identical files
+
+    Args:
+        csv_path: Path to the statement CSV
+        cache_dir: Directory for the on-disk pickle cache; None disables it
+
+    Returns:
+        IBStatement for csv_path; its frames are not shared with other loads
+    """
+    content = Path(csv_path).read_bytes()
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    statement = _memory_cache.get(sha256)
+    if statement is not None:
+        _memory_cache.move_to_end(sha256)
+        return _copy_statement(statement, str(csv_path))
+
+    cache_file = Path(cache_dir) / f"{sha256}.pkl" if cache_dir is not None else None
+    if cache_file is not None and cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') == CACHE_VERSION:
+                statement = IBStatement(path=str(csv_path), sha256=sha256, sections=cached['sections'])
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable statement cache {cache_file}: {e}")
+
+    if statement is None:
+        statement = parse_statement_text(content.decode('utf-8-sig'), path=str(csv_path), sha256=sha256)
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump({'version': CACHE_VERSION, 'sections': statement.sections}, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                logger.debug(f"Could not write statement cache {cache_file}: {e}")
+
+    _memory_cache[sha256] = statement
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+    return _copy_statement(statement, str(csv_path))
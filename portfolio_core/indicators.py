@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Indicators
+Streaming and batch technical indicators for a whole universe at once
+
+Part of astoreyai/claude-skills portfolio_core
+
+Every indicator comes in two forms over the same (symbols x bars) layout
+as portfolio_core.bars:
+
+- a streaming object holding state for all symbols as arrays, whose
+  update() takes one bar per symbol - shape (symbols,) - and advances in
+  O(1) per symbol regardless of history (the rolling min/max of the
+  stochastic is O(period)). Objects use __slots__, so state for thousands
+  of symbols x timeframes is a handful of small arrays each;
+- a batch function returning the full (symbols x bars) series.
+
+Both give identical values. The recursive indicators (EMA, Wilder
+averages, RSI, ATR, ADX) compute their batch series by replaying the
+streaming update over the bars, still vectorized across symbols; SMA,
+Stochastic and VWAP have closed-form batch versions (cumulative sums and
+sliding windows).
+
+Conventions: NaN marks a missing bar and may only appear as leading
+padding (e.g. before a symbol listed); EMA and Wilder averages are seeded
+with the simple mean of their first `period` values; the first true range
+of ATR/ADX is high - low.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from portfolio_core.bars import NS_PER_DAY
+
+DEFAULT_PERIOD = 14
+
+
+class EMA:
+    """Exponential moving average seeded with the mean of the first `period` values"""
+    __slots__ = ('period', 'alpha', 'count', 'total', 'value')
+
+    def __init__(self, symbols: int, period: int, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = 2 / (period + 1) if alpha is None else alpha
+        self.count = np.zeros(symbols, dtype=np.int64)
+        self.total = np.zeros(symbols)
+        self.value = np.full(symbols, np.nan)
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(x)
+        self.count += valid
+        seeding = valid & (self.count <= self.period)
+        self.total[seeding] += x[seeding]
+        self.value = np.where(valid & (self.count == self.period), self.total / self.period, self.value)
+        smoothing = valid & (self.count > self.period)
+        self.value[smoothing] += self.alpha * (x[smoothing] - self.value[smoothing])
+        return self.value
+
+
+class WilderAverage(EMA):
+    """Wilder's smoothing: EMA with alpha = 1 / period"""
+    __slots__ = ()
+
+    def __init__(self, symbols: int, period: int = DEFAULT_PERIOD):
+        super().__init__(symbols, period, 1 / period)
+
+
+class SMA:
+    """Simple moving average over a per-symbol ring buffer"""
+    __slots__ = ('period', 'window', 'position', 'count', 'total', 'value')
+
+    def __init__(self, symbols: int, period: int):
+        self.period = period
+        self.window = np.zeros((symbols, period))
+        self.position = np.zeros(symbols, dtype=np.int64)
+        self.count = np.zeros(symbols, dtype=np.int64)
+        self.total = np.zeros(symbols)
+        self.value = np.full(symbols, np.nan)
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        rows = np.flatnonzero(~np.isnan(x))
+        slot = self.position[rows]
+        self.total[rows] += x[rows] - self.window[rows, slot]
+        self.window[rows, slot] = x[rows]
+        self.position[rows] = (slot + 1) % self.period
+        self.count[rows] += 1
+        self.value = np.where(self.count >= self.period, self.total / self.period, np.nan)
+        return self.value
+
+
+class RSI:
+    """Wilder RSI"""
+    __slots__ = ('previous', 'gain', 'loss', 'value')
+
+    def __init__(self, symbols: int, period: int = DEFAULT_PERIOD):
+        self.previous = np.full(symbols, np.nan)
+        self.gain = WilderAverage(symbols, period)
+        self.loss = WilderAverage(symbols, period)
+        self.value = np.full(symbols, np.nan)
+
+    def update(self, close: np.ndarray) -> np.ndarray:
+        change = close - self.previous
+        self.previous = np.where(np.isnan(close), self.previous, close)
+        gain = self.gain.update(np.maximum(change, 0.0))
+        loss = self.loss.update(np.maximum(-change, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.value = 100 - 100 / (1 + gain / loss)
+        return self.value
+
+
+class ATR:
+    """Wilder average true range"""
+    __slots__ = ('previous', 'average')
+
+    def __init__(self, symbols: int, period: int = DEFAULT_PERIOD):
+        self.previous = np.full(symbols, np.nan)
+        self.average = WilderAverage(symbols, period)
+
+    @property
+    def value(self) -> np.ndarray:
+        return self.average.value
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - self.previous), np.abs(low - self.previous)))
+        self.previous = np.where(np.isnan(close), self.previous, close)
+        return self.average.update(true_range)
+
+
+class ADX:
+    """Wilder ADX from smoothed true range and directional movement (starts on the second bar)"""
+    __slots__ = ('previous', 'true_range', 'plus_dm', 'minus_dm', 'adx', 'plus_di', 'minus_di', 'value')
+
+    def __init__(self, symbols: int, period: int = DEFAULT_PERIOD):
+        self.previous = np.full((3, symbols), np.nan)  # high, low, close
+        self.true_range = WilderAverage(symbols, period)
+        self.plus_dm = WilderAverage(symbols, period)
+        self.minus_dm = WilderAverage(symbols, period)
+        self.adx = WilderAverage(symbols, period)
+        self.plus_di = np.full(symbols, np.nan)
+        self.minus_di = np.full(symbols, np.nan)
+        self.value = np.full(symbols, np.nan)
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        previous_high, previous_low, previous_close = self.previous
+        up = high - previous_high
+        down = previous_low - low
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+        started = ~np.isnan(true_range)
+        plus = np.where(started, np.where((up > down) & (up > 0), up, 0.0), np.nan)
+        minus = np.where(started, np.where((down > up) & (down > 0), down, 0.0), np.nan)
+        self.previous = np.where(np.isnan(close), self.previous, np.array([high, low, close]))
+
+        smoothed_tr = self.true_range.update(true_range)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.plus_di = 100 * self.plus_dm.update(plus) / smoothed_tr
+            self.minus_di = 100 * self.minus_dm.update(minus) / smoothed_tr
+            dx = 100 * np.abs(self.plus_di - self.minus_di) / (self.plus_di + self.minus_di)
+        self.value = self.adx.update(dx)
+        return self.value
+
+
+class Stochastic:
+    """Stochastic oscillator: %K over `k_period` bars, %D = SMA of %K over `d_period`"""
+    __slots__ = ('k_period', 'highs', 'lows', 'position', 'count', 'd', 'k_value', 'd_value')
+
+    def __init__(self, symbols: int, k_period: int = DEFAULT_PERIOD, d_period: int = 3):
+        self.k_period = k_period
+        self.highs = np.full((symbols, k_period), np.nan)
+        self.lows = np.full((symbols, k_period), np.nan)
+        self.position = np.zeros(symbols, dtype=np.int64)
+        self.count = np.zeros(symbols, dtype=np.int64)
+        self.d = SMA(symbols, d_period)
+        self.k_value = np.full(symbols, np.nan)
+        self.d_value = np.full(symbols, np.nan)
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        rows = np.flatnonzero(~np.isnan(close))
+        slot = self.position[rows]
+        self.highs[rows, slot] = high[rows]
+        self.lows[rows, slot] = low[rows]
+        self.position[rows] = (slot + 1) % self.k_period
+        self.count[rows] += 1
+
+        highest = self.highs.max(axis=1)
+        lowest = self.lows.min(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = 100 * (close - lowest) / (highest - lowest)
+        self.k_value = np.where(self.count >= self.k_period, k, np.nan)
+        self.d_value = self.d.update(np.where(np.isnan(close), np.nan, self.k_value))
+        return self.k_value, self.d_value
+
+
+class VWAP:
+    """Session VWAP of the typical price and its volume-weighted standard deviation"""
+    __slots__ = ('session', 'volume', 'price_volume', 'square_volume', 'value', 'std')
+
+    def __init__(self, symbols: int):
+        self.session = None
+        self.volume = np.zeros(symbols)
+        self.price_volume = np.zeros(symbols)
+        self.square_volume = np.zeros(symbols)
+        self.value = np.full(symbols, np.nan)
+        self.std = np.full(symbols, np.nan)
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+               session: int) -> np.ndarray:
+        """session: identifier of the bar's trading session (e.g. day number); a new one resets the sums"""
+        if session != self.session:
+            self.session = session
+            self.volume[:] = 0.0
+            self.price_volume[:] = 0.0
+            self.square_volume[:] = 0.0
+        typical = (high + low + close) / 3
+        weight = np.where(np.isnan(typical), 0.0, np.nan_to_num(volume))
+        typical = np.nan_to_num(typical)
+        self.volume += weight
+        self.price_volume += typical * weight
+        self.square_volume += typical ** 2 * weight
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.value = self.price_volume / self.volume
+            self.std = np.sqrt(np.maximum(self.square_volume / self.volume - self.value ** 2, 0.0))
+        return self.value
+
+
+def _replay(indicator, *series: np.ndarray) -> np.ndarray:
+    """Batch series of a streaming indicator: its value after each bar"""
+    out = np.full(series[0].shape, np.nan)
+    for t in range(series[0].shape[1]):
+        out[:, t] = indicator.update(*(x[:, t] for x in series))
+    return out
+
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average series per row (cumulative-sum windows)"""
+    valid = ~np.isnan(x)
+    zero = np.zeros((len(x), 1))
+    total = np.concatenate([zero, np.cumsum(np.where(valid, x, 0.0), axis=1)], axis=1)
+    count = np.concatenate([zero, np.cumsum(valid, axis=1)], axis=1)
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= period:
+        window_total = total[:, period:] - total[:, :-period]
+        full = count[:, period:] - count[:, :-period] == period
+        out[:, period - 1:] = np.where(full, window_total / period, np.nan)
+    return out
+
+
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average series per row"""
+    return _replay(EMA(len(x), period), x)
+
+
+def wilder_average(x: np.ndarray, period: int = DEFAULT_PERIOD) -> np.ndarray:
+    """Wilder-smoothed series per row"""
+    return _replay(WilderAverage(len(x), period), x)
+
+
+def rsi(close: np.ndarray, period: int = DEFAULT_PERIOD) -> np.ndarray:
+    """Wilder RSI series per row"""
+    return _replay(RSI(len(close), period), close)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = DEFAULT_PERIOD) -> np.ndarray:
+    """Wilder ATR series per row"""
+    return _replay(ATR(len(close), period), high, low, close)
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = DEFAULT_PERIOD) -> np.ndarray:
+    """Wilder ADX series per row"""
+    return _replay(ADX(len(close), period), high, low, close)
+
+
+def atr_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = DEFAULT_PERIOD) -> np.ndarray:
+    """
+    Latest Wilder ATR per row, without stepping through the bars
+
+    Wilder smoothing is linear, so the last value is the seed (mean of the
+    first `period` true ranges) decayed by ((period - 1) / period) per
+    later bar, plus each later true range weighted by its own decay /
+    period. Equals atr(...)[:, -1]; rows with fewer than `period` bars get
+    NaN.
+    """
+    rows, length = close.shape
+    previous = np.concatenate([np.full((rows, 1), np.nan), close[:, :-1]], axis=1)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+
+    first = length - np.count_nonzero(~np.isnan(close), axis=1)
+    seed_end = first + period - 1
+    bar = np.arange(length)
+    decay = ((period - 1) / period) ** (length - 1 - bar)
+
+    in_seed = (bar >= first[:, None]) & (bar <= seed_end[:, None])
+    after_seed = bar > seed_end[:, None]
+    seed = np.where(in_seed, true_range, 0.0).sum(axis=1) / period
+    smoothed = np.where(after_seed, true_range * decay, 0.0).sum(axis=1) / period
+    value = seed * ((period - 1) / period) ** np.maximum(length - 1 - seed_end, 0) + smoothed
+    return np.where(seed_end < length, value, np.nan)
+
+
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               k_period: int = DEFAULT_PERIOD, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """%K and %D series per row (sliding-window extremes)"""
+    k = np.full(close.shape, np.nan)
+    if close.shape[1] >= k_period:
+        highest = np.lib.stride_tricks.sliding_window_view(high, k_period, axis=1).max(axis=2)
+        lowest = np.lib.stride_tricks.sliding_window_view(low, k_period, axis=1).min(axis=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k[:, k_period - 1:] = 100 * (close[:, k_period - 1:] - lowest) / (highest - lowest)
+    return k, sma(k, d_period)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Session VWAP and volume-weighted standard deviation series per row
+
+    Sessions are calendar days of `timestamps` (the shared bar grid);
+    cumulative sums restart at each session's first bar.
+    """
+    day = np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64) // NS_PER_DAY
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    typical = (high + low + close) / 3
+    weight = np.where(np.isnan(typical), 0.0, np.nan_to_num(volume))
+    typical = np.nan_to_num(typical)
+
+    def session_cumsum(x):
+        # Restart per session rather than subtracting offsets from one running
+        # sum, which would cancel away the precision of late sessions
+        out = np.empty_like(x)
+        for start, end in zip(starts, np.r_[starts[1:], len(day)]):
+            np.cumsum(x[:, start:end], axis=1, out=out[:, start:end])
+        return out
+
+    weight_sum = session_cumsum(weight)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = session_cumsum(typical * weight) / weight_sum
+        std = np.sqrt(np.maximum(session_cumsum(typical ** 2 * weight) / weight_sum - value ** 2, 0.0))
+    return value, std
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Lot Matching
+Build round-trip trades from execution rows with FIFO, LIFO or specific-lot matching
+
+Part of astoreyai/claude-skills portfolio_core
+
+Each symbol keeps one book of open lots. An execution on the same side as
+the open position (or into a flat book) opens a lot - scale-ins stack as
+separate lots. An execution on the opposite side closes lots in the
+book's order, splitting a lot when only part of it is matched; whatever
+quantity is left over flips the position and opens a lot on the new side.
+Every matched slice becomes one Trade, so partial fills and partial
+closes produce one Trade per (opening lot, closing execution) pair.
+
+Matching methods:
+- fifo: oldest lot first (deque, O(1) per match)
+- lifo: newest lot first (stack, O(1) per match)
+- hifo: highest-cost lot first for longs, lowest-price lot first for
+  shorts (heap, O(log n) per match) - the usual tax-minimizing choice
+  of specific lots
+- specific: a caller-supplied lot_selector picks the lot to close
+
+Commissions are allocated per share to both legs and reported as a
+positive cost; realized_pnl is net of them. Round trips are kept as row
+tuples and exposed as a columnar TradeTable; Trade objects are built only
+when asked for.
+"""
+
+import heapq
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from portfolio_core.trade_table import Trade, TradeTable
+
+logger = logging.getLogger('portfolio_core.lots')
+
+METHODS = ('fifo', 'lifo', 'hifo', 'specific')
+
+# Quantities below this are treated as fully matched (fractional shares)
+QUANTITY_EPSILON = 1e-9
+
+
+@dataclass
+class Lot:
+    """Open position lot; quantity is the unmatched remainder (always positive)"""
+    symbol: str
+    opened: datetime
+    quantity: float
+    price: float
+    fee_per_share: float
+    side: str
+    lot_id: int
+
+
+LotSelector = Callable[[List[Lot], str, datetime, float], int]
+
+
+class _LotBook:
+    """Open lots of one symbol, ordered for the matching method"""
+
+    __slots__ = ('method', 'selector', 'lots', 'side', '_selected')
+
+    def __init__(self, method: str, selector: Optional[LotSelector] = None):
+        self.method = method
+        self.selector = selector
+        self.lots = deque() if method == 'fifo' else []
+        self.side: Optional[str] = None
+        self._selected = -1
+
+    def __len__(self) -> int:
+        return len(self.lots)
+
+    def push(self, lot: Lot) -> None:
+        if self.method == 'hifo':
+            key = -lot.price if lot.side == 'long' else lot.price
+            heapq.heappush(self.lots, (key, lot.lot_id, lot))
+        else:
+            self.lots.append(lot)
+
+    def peek(self, symbol: str, timestamp: datetime, quantity: float) -> Lot:
+        if self.method == 'fifo':
+            return self.lots[0]
+        if self.method == 'lifo':
+            return self.lots[-1]
+        if self.method == 'hifo':
+            return self.lots[0][2]
+        self._selected = self.selector(list(self.lots), symbol, timestamp, quantity)
+        return self.lots[self._selected]
+
+    def pop(self) -> None:
+        """Remove the lot returned by the last peek()"""
+        if self.method == 'fifo':
+            self.lots.popleft()
+        elif self.method == 'lifo':
+            self.lots.pop()
+        elif self.method == 'hifo':
+            heapq.heappop(self.lots)
+        else:
+            self.lots.pop(self._selected)
+
+    def open_lots(self) -> List[Lot]:
+        if self.method == 'hifo':
+            return [entry[2] for entry in sorted(self.lots)]
+        return list(self.lots)
+
+
+class LotMatcher:
+    """
+    Incremental lot matcher over a stream of executions
+
+    Feed executions in time order with add(); closed round trips accumulate
+    and are available as table() or the .trades list. Executions flagged as closing (IB code 'C') that find no
+    open lot - e.g. positions opened before the statement period - are
+    recorded in .unmatched instead of opening a spurious opposite position.
+    """
+
+    def __init__(self, method: str = 'fifo', lot_selector: Optional[LotSelector] = None):
+        """
+        Args:
+            method: One of METHODS
+            lot_selector: For method='specific', called as
+                lot_selector(open_lots, symbol, timestamp, quantity) and
+                returning the index of the lot to close next
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown lot matching method: {method} (expected one of {METHODS})")
+        if method == 'specific' and lot_selector is None:
+            raise ValueError("method='specific' requires a lot_selector")
+
+        self.method = method
+        self.lot_selector = lot_selector
+        self.books: Dict[str, _LotBook] = {}
+        self.rows: List[tuple] = []
+        self.unmatched: List[Dict] = []
+        self._next_lot_id = 0
+
+    def add(self,
+            symbol: str,
+            timestamp: datetime,
+            quantity: float,
+            price: float,
+            commission: float = 0.0,
+            code: str = '') -> List[Trade]:
+        """
+        Apply one execution
+
+        Args:
+            symbol: Instrument symbol
+            timestamp: Execution time
+            quantity: Signed quantity (positive buy, negative sell)
+            price: Execution price
+            commission: Commission for the whole execution (sign ignored)
+            code: IB execution code, e.g. 'O', 'C', 'C;O'
+
+        Returns:
+            Trades closed by this execution
+        """
+        first = len(self.rows)
+        self._add(symbol, timestamp, quantity, price, commission, code)
+        return TradeTable.from_rows(self.rows[first:]).trades()
+
+    def _add(self, symbol: str, timestamp: datetime, quantity: float, price: float,
+             commission: float, code: str) -> None:
+        """add() without materializing the closed trades"""
+        if abs(quantity) <= QUANTITY_EPSILON:
+            return
+
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = _LotBook(self.method, self.lot_selector)
+
+        side = 'long' if quantity > 0 else 'short'
+        remaining = abs(quantity)
+        fee_per_share = abs(commission) / remaining if commission == commission else 0.0
+        if len(book) and book.side != side:
+            while remaining > QUANTITY_EPSILON and len(book):
+                lot = book.peek(symbol, timestamp, remaining)
+                matched = min(remaining, lot.quantity)
+                self.rows.append(self._close(lot, matched, timestamp, price, fee_per_share))
+                lot.quantity -= matched
+                remaining -= matched
+                if lot.quantity <= QUANTITY_EPSILON:
+                    book.pop()
+
+        if remaining > QUANTITY_EPSILON:
+            codes = set(str(code or '').split(';'))
+            if 'C' in codes and 'O' not in codes:
+                self.unmatched.append({
+                    'symbol': symbol, 'datetime': timestamp, 'price': price,
+                    'quantity': remaining if quantity > 0 else -remaining,
+                })
+            else:
+                book.side = side
+                book.push(Lot(symbol, timestamp, remaining, price, fee_per_share, side, self._next_lot_id))
+                self._next_lot_id += 1
+
+        if not len(book):
+            book.side = None
+
+    def _close(self, lot: Lot, quantity: float, timestamp: datetime,
+               price: float, fee_per_share: float) -> tuple:
+        """Round trip row (trade_table.ROW_FIELDS) for `quantity` shares of `lot` closed at `price`"""
+        direction = 1 if lot.side == 'long' else -1
+        commission = (lot.fee_per_share + fee_per_share) * quantity
+        realized_pnl = (price - lot.price) * quantity * direction - commission
+        cost = lot.price * quantity
+
+        return (
+            lot.symbol,
+            lot.opened,
+            lot.price,
+            timestamp,
+            price,
+            quantity,
+            commission,
+            realized_pnl,
+            int((timestamp - lot.opened).total_seconds() // 60),
+            realized_pnl / cost * 100 if cost else 0.0,
+            'intraday' if timestamp.date() == lot.opened.date() else 'swing',
+            lot.side,
+            lot.lot_id,
+        )
+
+    def table(self) -> TradeTable:
+        """Closed round trips as a columnar TradeTable"""
+        return TradeTable.from_rows(self.rows)
+
+    @property
+    def trades(self) -> List[Trade]:
+        """Closed round trips as a new list of Trade objects"""
+        return self.table().trades()
+
+    def open_lots(self) -> List[Lot]:
+        """Lots still open, grouped by symbol in matching order"""
+        return [lot for book in self.books.values() for lot in book.open_lots()]
+
+
+def match_executions(executions,
+                     method: str = 'fifo',
+                     lot_selector: Optional[LotSelector] = None) -> LotMatcher:
+    """
+    Match an execution table into round-trip trades
+
+    Args:
+        executions: DataFrame with symbol, datetime, quantity, price and
+            optionally commission and code columns (IBStatement.executions()
+            or TradeStore.executions())
+        method: One of METHODS
+        lot_selector: Lot picker for method='specific'
+
+    Returns:
+        LotMatcher holding the closed round trips, .unmatched and the open lots
+    """
+    matcher = LotMatcher(method, lot_selector)
+    if len(executions) == 0:
+        return matcher
+
+    executions = executions.sort_values('datetime', kind='stable')
+    n = len(executions)
+    commissions = executions['commission'].tolist() if 'commission' in executions else [0.0] * n
+    codes = executions['code'].tolist() if 'code' in executions else [''] * n
+
+    # Plain datetimes: Timestamp arithmetic would dominate the loop
+    timestamps = list(executions['datetime'].dt.to_pydatetime())
+
+    add = matcher._add
+    for symbol, timestamp, quantity, price, commission, code in zip(
+            executions['symbol'].tolist(), timestamps,
+            executions['quantity'].tolist(), executions['price'].tolist(),
+            commissions, codes):
+        add(symbol, timestamp, quantity, price, commission, code)
+
+    if matcher.unmatched:
+        logger.warning(f"{len(matcher.unmatched)} closing executions had no open lot to match")
+    return matcher
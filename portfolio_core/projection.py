@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Projection Kernel
+Closed-form deterministic balance projections shared by the forecasting and portfolio analysis agents
+
+Part of astoreyai/claude-skills portfolio_core
+
+Each month the balance grows by the monthly factor F, a tax_rate share of
+the gains is moved to the tax reserve and the deposit D is added:
+
+    B[t] = B[t-1] * f + D,   f = 1 + (F - 1) * (1 - tax_rate)
+
+which has the geometric-series solution
+
+    B[t] = B0 * f**t + D * (f**t - 1) / (f - 1)
+
+All functions broadcast over NumPy arrays, so one call projects any
+number of parameter combinations (accounts, scenarios, sweep cells).
+Monthly and yearly series are returned with the period as the last axis.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+def expected_monthly_factor(win_rate, avg_winner_pct, avg_loser_pct, trades_per_month) -> np.ndarray:
+    """
+    Expected monthly growth factor of independent win/loss trades
+
+    Args:
+        win_rate: Probability a trade wins (0-1)
+        avg_winner_pct: Return of a winning trade (0.0358 = 3.58%)
+        avg_loser_pct: Return of a losing trade (negative)
+        trades_per_month: Trades executed per month
+
+    Returns:
+        (1 + win_rate * avg_winner_pct + (1 - win_rate) * avg_loser_pct) ** trades_per_month
+    """
+    win_rate = np.asarray(win_rate, dtype=float)
+    expected_return = win_rate * avg_winner_pct + (1 - win_rate) * avg_loser_pct
+    return (1 + expected_return) ** np.asarray(trades_per_month, dtype=float)
+
+
+def geometric_sum(factor, months) -> np.ndarray:
+    """
+    sum(factor ** k for k in range(months)), stable as factor -> 1
+
+    Args:
+        factor: Growth factor(s)
+        months: Number of terms (broadcasts with factor)
+
+    Returns:
+        Array of geometric sums
+    """
+    factor = np.asarray(factor, dtype=float)
+    months = np.asarray(months, dtype=float)
+    rate = factor - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = np.expm1(months * np.log1p(rate)) / rate
+    return np.where(rate == 0, months, total)
+
+
+def project_final(initial_capital, monthly_deposits, monthly_factor, tax_rate, months: int) -> Dict[str, np.ndarray]:
+    """
+    End-of-horizon projection without materializing monthly rows
+
+    Args:
+        initial_capital: Starting balance(s)
+        monthly_deposits: Deposit(s) added after each month's growth
+        monthly_factor: Pre-tax monthly growth factor(s)
+        tax_rate: Share of each month's gains moved to the tax reserve, in [0, 1)
+        months: Projection length in months
+
+    Returns:
+        Dict of broadcast arrays: final_balance, total_gains, total_taxes_reserved
+    """
+    initial_capital = np.asarray(initial_capital, dtype=float)
+    monthly_deposits = np.asarray(monthly_deposits, dtype=float)
+    monthly_factor = np.asarray(monthly_factor, dtype=float)
+    tax_rate = np.asarray(tax_rate, dtype=float)
+    if np.any((tax_rate < 0) | (tax_rate >= 1)):
+        raise ValueError("tax_rate must be in [0, 1)")
+
+    net_factor = 1 + (monthly_factor - 1) * (1 - tax_rate)
+    final_balance = (initial_capital * net_factor ** months +
+                     monthly_deposits * geometric_sum(net_factor, months))
+
+    # Balance growth net of deposits is exactly the after-tax gains
+    total_gains = (final_balance - initial_capital - monthly_deposits * months) / (1 - tax_rate)
+
+    return {
+        'final_balance': final_balance,
+        'total_gains': total_gains,
+        'total_taxes_reserved': total_gains * tax_rate,
+    }
+
+
+def project_monthly(initial_capital, monthly_deposits, monthly_factor, tax_rate, months: int) -> Dict[str, np.ndarray]:
+    """
+    Month-by-month projection as columnar arrays
+
+    Args:
+        initial_capital: Starting balance(s)
+        monthly_deposits: Deposit(s) added after each month's growth
+        monthly_factor: Pre-tax monthly growth factor(s)
+        tax_rate: Share of each month's gains moved to the tax reserve, in [0, 1)
+        months: Projection length in months
+
+    Returns:
+        Dict of arrays shaped broadcast(params) + (months,): starting_balance,
+        balance_after_growth, gains, taxes, ending_balance, cumulative_gains,
+        cumulative_taxes
+    """
+    initial_capital = np.asarray(initial_capital, dtype=float)[..., None]
+    monthly_deposits = np.asarray(monthly_deposits, dtype=float)[..., None]
+    monthly_factor = np.asarray(monthly_factor, dtype=float)[..., None]
+    tax_rate = np.asarray(tax_rate, dtype=float)[..., None]
+    if np.any((tax_rate < 0) | (tax_rate >= 1)):
+        raise ValueError("tax_rate must be in [0, 1)")
+
+    t = np.arange(1, months + 1)
+    net_factor = 1 + (monthly_factor - 1) * (1 - tax_rate)
+    ending_balance = initial_capital * net_factor ** t + monthly_deposits * geometric_sum(net_factor, t)
+
+    starting_balance = np.empty_like(ending_balance)
+    starting_balance[..., 0] = initial_capital[..., 0]
+    starting_balance[..., 1:] = ending_balance[..., :-1]
+
+    gains = starting_balance * (monthly_factor - 1)
+    taxes = gains * tax_rate
+
+    return {
+        'starting_balance': starting_balance,
+        'balance_after_growth': starting_balance * monthly_factor,
+        'gains': gains,
+        'taxes': taxes,
+        'ending_balance': ending_balance,
+        'cumulative_gains': np.cumsum(gains, axis=-1),
+        'cumulative_taxes': np.cumsum(taxes, axis=-1),
+    }
+
+
+def project_yearly(initial_capital, monthly_deposits, monthly_factor, tax_rate, years: int) -> Dict[str, np.ndarray]:
+    """
+    Year-by-year projection: project_monthly() aggregated over 12-month blocks
+
+    Args:
+        initial_capital: Starting balance(s)
+        monthly_deposits: Deposit(s) added after each month's growth
+        monthly_factor: Pre-tax monthly growth factor(s)
+        tax_rate: Share of each month's gains moved to the tax reserve, in [0, 1)
+        years: Projection length in years
+
+    Returns:
+        Dict of arrays shaped broadcast(params) + (years,): starting_balance,
+        ending_balance, gains, taxes, deposits
+    """
+    monthly = project_monthly(initial_capital, monthly_deposits, monthly_factor, tax_rate, years * 12)
+    shape = monthly['gains'].shape[:-1] + (years, 12)
+    deposits = np.broadcast_to(np.asarray(monthly_deposits, dtype=float)[..., None] * 12, shape[:-1])
+
+    return {
+        'starting_balance': monthly['starting_balance'][..., ::12],
+        'ending_balance': monthly['ending_balance'][..., 11::12],
+        'gains': monthly['gains'].reshape(shape).sum(axis=-1),
+        'taxes': monthly['taxes'].reshape(shape).sum(axis=-1),
+        'deposits': deposits,
+    }
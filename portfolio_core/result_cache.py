@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Result Cache
+Content-addressed on-disk memoization of analysis stage outputs
+
+Part of astoreyai/claude-skills portfolio_core
+
+Each stage output is pickled under a key hashed from everything it depends
+on - input content hashes, parameters, the keys of upstream stages and a
+code version - so a changed input only misses the stages downstream of
+it, and stale entries are never read, just aged out.
+
+Entries are evicted least-recently-used once the directory exceeds its
+entry or byte budget; a hit refreshes the entry's mtime, which is the
+recency order. Writes go through a temp file and os.replace, so
+concurrent processes never see partial entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Union
+
+logger = logging.getLogger('portfolio_core.result_cache')
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-skills" / "analysis_results"
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the entry layout changes so stale disk caches are ignored
+CACHE_VERSION = 1
+
+
+def cache_key(*parts: Any) -> str:
+    """SHA-256 of JSON-serializable key parts (non-JSON values via str())"""
+    payload = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def source_version(*paths: str) -> str:
+    """Code version: hash of the given source files (once per process)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """Pickled stage outputs keyed by cache_key(), with LRU eviction"""
+
+    def __init__(self,
+                 directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for key, or default; a hit marks the entry recently used"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return default
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return default
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key, then evict least-recently-used entries over budget"""
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write cache entry {path}: {e}")
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least-recently-used entries beyond the budget; returns the number removed"""
+        entries = []
+        for path in self.directory.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort(reverse=True)
+
+        removed = 0
+        total_bytes = 0
+        for count, (_, size, path) in enumerate(entries, start=1):
+            total_bytes += size
+            if count > self.max_entries or total_bytes > self.max_bytes:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        for path in self.directory.glob('*.pkl'):
+            path.unlink(missing_ok=True)
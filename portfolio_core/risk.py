@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Risk Engine
+Equity-curve risk metrics in vectorized NumPy
+
+Part of astoreyai/claude-skills portfolio_core
+
+Risk is measured on time-weighted returns, so deposits and withdrawals
+move the equity curve without registering as gains or drawdowns:
+
+    r[t] = (E[t] - E[t-1] - F[t]) / E[t-1]
+
+where F[t] is the net cash flow booked at t. Drawdowns are taken on the
+compounded return index cumprod(1 + r). Every function works along the
+last axis, so a (paths, periods) matrix of simulated balances is handled
+in the same calls as one realized curve; nothing loops in Python.
+
+Metrics:
+- max drawdown and the longest time spent below a prior peak
+- Ulcer index: root-mean-square drawdown (percent)
+- Sharpe and Sortino (downside deviation), annualized
+- Calmar: CAGR / |max drawdown|
+- historical VaR and CVaR of period returns
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+# Annualization used when neither timestamps nor periods_per_year are given
+DEFAULT_PERIODS_PER_YEAR = 252
+
+
+def period_returns(equity: np.ndarray, cash_flows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Time-weighted period returns along the last axis
+
+    Args:
+        equity: (..., n) equity after each period, including that period's cash flow
+        cash_flows: (..., n) or broadcastable net cash flow booked in each period
+
+    Returns:
+        (..., n - 1) returns, floored at -1 (equity wiped out); periods
+        starting from non-positive equity return 0
+    """
+    equity = np.asarray(equity, dtype=float)
+    change = np.diff(equity, axis=-1)
+    if cash_flows is not None:
+        cash_flows = np.broadcast_to(np.asarray(cash_flows, dtype=float), equity.shape)
+        change = change - cash_flows[..., 1:]
+    previous = equity[..., :-1]
+    returns = np.divide(change, previous, out=np.zeros_like(change), where=previous > 0)
+    return np.maximum(returns, -1.0, out=returns)
+
+
+def drawdowns(returns: np.ndarray) -> np.ndarray:
+    """
+    Drawdown of the compounded return index, starting from 1.0
+
+    Returns:
+        (..., n + 1) fractional drawdowns (<= 0), the first entry being the
+        start; entry i is aligned with equity[i] of period_returns()' input
+    """
+    returns = np.asarray(returns, dtype=float)
+    start = np.ones(returns.shape[:-1] + (1,))
+    index = np.concatenate([start, np.cumprod(1 + returns, axis=-1)], axis=-1)
+    return index / np.maximum.accumulate(index, axis=-1) - 1
+
+
+def max_drawdown(returns: np.ndarray) -> np.ndarray:
+    """Deepest drawdown along the last axis (fraction, <= 0)"""
+    return drawdowns(returns).min(axis=-1)
+
+
+def underwater_duration(drawdown: np.ndarray, times: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Longest stretch spent below a prior peak, including an ongoing one
+
+    Args:
+        drawdown: (..., n) output of drawdowns()
+        times: Optional (n,) timestamps (datetime64) or numeric times; without
+            them the duration is counted in periods
+
+    Returns:
+        Longest duration (periods, or seconds when datetime64 times are given)
+    """
+    n = drawdown.shape[-1]
+    positions = np.broadcast_to(np.arange(n), drawdown.shape)
+    last_peak = np.maximum.accumulate(np.where(drawdown >= 0, positions, 0), axis=-1)
+
+    if times is None:
+        return (positions - last_peak).max(axis=-1)
+
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype('datetime64[ns]').astype(np.int64) / 1e9
+    times = times.astype(float)
+    return (times[positions] - times[last_peak]).max(axis=-1)
+
+
+def risk_metrics(equity: np.ndarray,
+                 times: Optional[np.ndarray] = None,
+                 cash_flows: Optional[np.ndarray] = None,
+                 periods_per_year: Optional[float] = None,
+                 var_level: float = 0.95) -> Dict:
+    """
+    Risk metrics of one equity curve
+
+    Args:
+        equity: (n,) equity after each period
+        times: Optional (n,) datetime64 timestamps; used for the drawdown
+            duration, CAGR and, if periods_per_year is None, annualization
+        cash_flows: Optional (n,) net deposits (+) / withdrawals (-) per period
+        periods_per_year: Annualization factor; inferred from times when
+            omitted, else DEFAULT_PERIODS_PER_YEAR
+        var_level: Confidence level for VaR/CVaR
+
+    Returns:
+        Dict of percent-denominated drawdown/return/tail metrics and ratios
+    """
+    equity = np.asarray(equity, dtype=float)
+    returns = period_returns(equity, cash_flows)
+    n = len(returns)
+    label = f"{var_level * 100:g}"
+    if n == 0:
+        return {'periods': 0}
+
+    if times is not None:
+        times = np.asarray(times).astype('datetime64[ns]')
+        elapsed_years = (times[-1] - times[0]).astype(np.int64) / 1e9 / SECONDS_PER_YEAR
+    else:
+        elapsed_years = None
+    if periods_per_year is None:
+        periods_per_year = n / elapsed_years if elapsed_years else DEFAULT_PERIODS_PER_YEAR
+    if not elapsed_years:
+        elapsed_years = n / periods_per_year
+
+    drawdown = drawdowns(returns)
+    deepest = float(drawdown.min())
+    growth = float(np.prod(1 + returns))
+    cagr = float(growth ** (1 / elapsed_years) - 1) if growth > 0 else -1.0
+
+    mean = returns.mean()
+    std = returns.std(ddof=1) if n > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    annualize = np.sqrt(periods_per_year)
+
+    cutoff = np.quantile(returns, 1 - var_level)
+    tail = returns[returns <= cutoff]
+
+    metrics = {
+        'periods': n,
+        'total_return_pct': (growth - 1) * 100,
+        'cagr_pct': cagr * 100,
+        'max_drawdown_pct': deepest * 100,
+        'ulcer_index': float(np.sqrt(np.mean((drawdown * 100) ** 2))),
+        'volatility_pct': float(std * annualize * 100),
+        'sharpe_ratio': float(mean / std * annualize) if std > 0 else 0,
+        'sortino_ratio': float(mean / downside * annualize) if downside > 0 else 0,
+        'calmar_ratio': cagr / -deepest if deepest < 0 else 0,
+        f'var_{label}_pct': float(-cutoff * 100),
+        f'cvar_{label}_pct': float(-tail.mean() * 100),
+    }
+
+    if times is not None:
+        # drawdown[i] is the state after equity[i], so it aligns with times
+        duration = underwater_duration(drawdown, times)
+        metrics['max_drawdown_duration_days'] = float(duration / 86400)
+    else:
+        metrics['max_drawdown_duration_periods'] = int(underwater_duration(drawdown))
+
+    return metrics
+
+
+def equity_curve(trades: pd.DataFrame,
+                 deposits: Optional[pd.DataFrame] = None,
+                 initial_equity: float = 0.0,
+                 freq: Optional[str] = None) -> pd.DataFrame:
+    """
+    Realized equity from closed trades and cash flows
+
+    Args:
+        trades: Round trips with exit_time and realized_pnl (or pnl)
+        deposits: Optional cash flows with settle_date and amount
+        initial_equity: Equity before the first event
+        freq: Optional pandas frequency (e.g. '1min', 'D') to sample the
+            step-function curve on a regular grid
+
+    Returns:
+        DataFrame with time, pnl, cash_flow and equity, one row per event
+        (or per grid step with freq)
+    """
+    pnl_column = 'realized_pnl' if 'realized_pnl' in trades.columns else 'pnl'
+    events = [pd.DataFrame({
+        'time': pd.to_datetime(trades['exit_time']),
+        'pnl': trades[pnl_column].to_numpy(dtype=float),
+        'cash_flow': 0.0,
+    })]
+    if deposits is not None and len(deposits):
+        events.append(pd.DataFrame({
+            'time': pd.to_datetime(deposits['settle_date']),
+            'pnl': 0.0,
+            'cash_flow': deposits['amount'].to_numpy(dtype=float),
+        }))
+
+    curve = pd.concat(events, ignore_index=True).sort_values('time', kind='stable')
+    curve = curve.groupby('time', sort=True)[['pnl', 'cash_flow']].sum()
+
+    if freq is not None and len(curve):
+        curve = curve.resample(freq).sum()
+
+    curve['equity'] = initial_equity + (curve['pnl'] + curve['cash_flow']).cumsum()
+    return curve.reset_index()
+
+
+def curve_risk_metrics(curve: pd.DataFrame,
+                       initial_equity: float,
+                       periods_per_year: Optional[float] = None,
+                       var_level: float = 0.95) -> Dict:
+    """risk_metrics() of an equity_curve() frame, starting from initial_equity"""
+    times = curve['time'].to_numpy()
+    return risk_metrics(
+        np.concatenate([[initial_equity], curve['equity'].to_numpy(dtype=float)]),
+        times=np.concatenate([times[:1], times]) if len(times) else None,
+        cash_flows=np.concatenate([[0.0], curve['cash_flow'].to_numpy(dtype=float)]),
+        periods_per_year=periods_per_year,
+        var_level=var_level,
+    )
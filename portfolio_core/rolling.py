@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Rolling Metrics
+Incremental rolling and expanding performance metrics over closed trades
+
+Part of astoreyai/claude-skills portfolio_core
+
+Each window keeps running sums (count, wins, P&L, gross profit/loss,
+return and squared return) that are adjusted as trades enter and leave,
+so appending one trade updates every window in O(1) amortized time:
+
+- trade windows (last N trades) evict exactly one trade per append
+- day windows (last D days by exit time) evict every trade older than
+  the cutoff; each trade is evicted once
+- the window's equity peak is tracked with a monotonic deque, giving the
+  current drawdown from the highest equity reached inside the window
+- the lifetime (expanding) window never evicts and also tracks the
+  maximum drawdown
+
+Sharpe is per trade: mean return / sample standard deviation of returns,
+as in the agents' lifetime risk metrics.
+"""
+
+import math
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from portfolio_core.trade_table import TradeTable
+
+DEFAULT_TRADE_WINDOWS = (20, 50, 100)
+DEFAULT_DAY_WINDOWS = (30, 90)
+
+
+class RollingWindow:
+    """Running trade statistics over the last `trades` trades or `days` days"""
+
+    __slots__ = ('trades', 'days', 'entries', 'peaks', 'count', 'wins', 'pnl',
+                 'gross_profit', 'gross_loss', 'ret', 'ret_sq', 'equity', 'max_drawdown')
+
+    def __init__(self, trades: Optional[int] = None, days: Optional[float] = None):
+        """
+        Args:
+            trades: Keep the last N trades
+            days: Keep trades closed within the last D days
+            (neither: expanding window over all trades)
+        """
+        self.trades = trades
+        self.days = days
+        self.entries = deque()  # (index, exit_time, pnl, return_pct)
+        self.peaks = deque()    # (index, equity), equity strictly decreasing
+        self.count = 0
+        self.wins = 0
+        self.pnl = 0.0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.ret = 0.0
+        self.ret_sq = 0.0
+        self.equity = 0.0
+        self.max_drawdown = 0.0
+
+    def _add(self, pnl: float, return_pct: float, sign: int) -> None:
+        self.count += sign
+        self.wins += sign * (pnl > 0)
+        self.pnl += sign * pnl
+        if pnl > 0:
+            self.gross_profit += sign * pnl
+        elif pnl < 0:
+            self.gross_loss += sign * pnl
+        self.ret += sign * return_pct
+        self.ret_sq += sign * return_pct * return_pct
+
+    def push(self, index: int, exit_time: datetime, pnl: float, return_pct: float, equity: float) -> None:
+        """Add trade number `index`, then evict trades that fell out of the window"""
+        self.entries.append((index, exit_time, pnl, return_pct))
+        self._add(pnl, return_pct, 1)
+        self.equity = equity
+
+        peaks = self.peaks
+        while peaks and peaks[-1][1] <= equity:
+            peaks.pop()
+        peaks.append((index, equity))
+
+        entries = self.entries
+        if self.trades is not None:
+            while len(entries) > self.trades:
+                _, _, old_pnl, old_return = entries.popleft()
+                self._add(old_pnl, old_return, -1)
+        elif self.days is not None:
+            cutoff = exit_time - timedelta(days=self.days)
+            while entries[0][1] < cutoff:
+                _, _, old_pnl, old_return = entries.popleft()
+                self._add(old_pnl, old_return, -1)
+
+        if self.trades is not None or self.days is not None:
+            oldest = entries[0][0]
+            while peaks[0][0] < oldest:
+                peaks.popleft()
+            # Running sums pick up rounding error as trades come and go;
+            # reset them exactly whenever the window is down to one trade
+            if self.count == 1:
+                self.pnl, self.ret, self.ret_sq = pnl, return_pct, return_pct * return_pct
+                self.gross_profit, self.gross_loss = max(pnl, 0.0), min(pnl, 0.0)
+        else:
+            self.max_drawdown = min(self.max_drawdown, self.drawdown)
+
+    @property
+    def drawdown(self) -> float:
+        """Current equity minus the highest equity inside the window (<= 0)"""
+        return self.equity - self.peaks[0][1] if self.peaks else 0.0
+
+    def metrics(self) -> Dict:
+        """Snapshot of the window's statistics"""
+        n = self.count
+        if n == 0:
+            return {'trades': 0}
+
+        mean = self.ret / n
+        variance = (self.ret_sq - n * mean * mean) / (n - 1) if n > 1 else 0.0
+        std = math.sqrt(variance) if variance > 0 else 0.0
+
+        metrics = {
+            'trades': n,
+            'win_rate': self.wins / n,
+            'expectancy': self.pnl / n,
+            'total_pnl': self.pnl,
+            'profit_factor': self.gross_profit / -self.gross_loss if self.gross_loss < 0 else 0,
+            'avg_return_pct': mean,
+            'sharpe_ratio': mean / std if std > 0 else 0,
+            'drawdown': self.drawdown,
+        }
+        if self.trades is None and self.days is None:
+            metrics['max_drawdown'] = self.max_drawdown
+        return metrics
+
+
+class RollingMetrics:
+    """
+    Lifetime plus rolling trade- and day-window metrics, updated per trade
+
+    Usage:
+        rolling = RollingMetrics()
+        for trade in closed_trades:
+            rolling.update(exit_time, realized_pnl, return_pct)
+        rolling.snapshot()  # {'lifetime': {...}, 'trades_20': {...}, 'days_30': {...}, ...}
+    """
+
+    def __init__(self,
+                 trade_windows: Iterable[int] = DEFAULT_TRADE_WINDOWS,
+                 day_windows: Iterable[float] = DEFAULT_DAY_WINDOWS):
+        self.windows: Dict[str, RollingWindow] = {'lifetime': RollingWindow()}
+        for size in trade_windows:
+            self.windows[f'trades_{size}'] = RollingWindow(trades=size)
+        for days in day_windows:
+            self.windows[f'days_{days:g}'] = RollingWindow(days=days)
+        self.index = 0
+        self.equity = 0.0
+
+    def update(self, exit_time: datetime, pnl: float, return_pct: float) -> None:
+        """Add one closed trade to every window"""
+        self.equity += pnl
+        for window in self.windows.values():
+            window.push(self.index, exit_time, pnl, return_pct, self.equity)
+        self.index += 1
+
+    def update_many(self, exit_times: Iterable[datetime], pnl: Iterable[float],
+                    return_pct: Iterable[float]) -> None:
+        """Add closed trades in exit-time order"""
+        for exit_time, trade_pnl, trade_return in zip(exit_times, pnl, return_pct):
+            self.update(exit_time, trade_pnl, trade_return)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Metrics of every window"""
+        return {name: window.metrics() for name, window in self.windows.items()}
+
+
+def rolling_metrics(table: TradeTable,
+                    trade_windows: Iterable[int] = DEFAULT_TRADE_WINDOWS,
+                    day_windows: Iterable[float] = DEFAULT_DAY_WINDOWS) -> RollingMetrics:
+    """
+    RollingMetrics fed with a TradeTable's round trips in exit-time order
+
+    The returned object can keep receiving trades via update().
+    """
+    rolling = RollingMetrics(trade_windows, day_windows)
+    order = np.argsort(table.exit_time, kind='stable')
+    rolling.update_many(table.exit_time[order].astype('datetime64[us]').tolist(),
+                        table.realized_pnl[order].tolist(), table.return_pct[order].tolist())
+    return rolling
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Stage Graph
+Run named pipeline stages in dependency order, independent stages concurrently
+
+Part of astoreyai/claude-skills portfolio_core
+
+Stages are callables with a tuple of prerequisite stage names. A stage is
+submitted to a thread pool as soon as all of its prerequisites finished,
+so e.g. edge, projection and risk stages that each read only the metrics
+stage overlap instead of running back to back. Threads suit the agents'
+stages: they share the agent's state and spend their time in NumPy/pandas
+calls and file I/O, which release the GIL.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Sequence, Tuple
+
+Stage = Tuple[Sequence[str], Callable[[], object]]
+
+
+def _check_graph(stages: Dict[str, Stage]) -> None:
+    """Raise ValueError on unknown prerequisites or cycles"""
+    for name, (requires, _) in stages.items():
+        unknown = [dep for dep in requires if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage {name} requires unknown stages: {unknown}")
+
+    done = set()
+    remaining = dict(stages)
+    while remaining:
+        ready = [name for name, (requires, _) in remaining.items() if set(requires) <= done]
+        if not ready:
+            raise ValueError(f"Stage dependency cycle among: {sorted(remaining)}")
+        done.update(ready)
+        for name in ready:
+            del remaining[name]
+
+
+def run_stages(stages: Dict[str, Stage], workers: int = 4) -> Dict[str, float]:
+    """
+    Run every stage after its prerequisites
+
+    Args:
+        stages: name -> (prerequisite names, callable)
+        workers: Thread pool size; 1 runs the stages serially in dependency
+            order (dict order among ready stages)
+
+    Returns:
+        name -> wall-clock seconds spent in that stage
+
+    Raises:
+        The first exception raised by a stage; stages not yet started are
+        cancelled
+    """
+    _check_graph(stages)
+    timings: Dict[str, float] = {}
+
+    def timed(name: str) -> None:
+        started = time.perf_counter()
+        try:
+            stages[name][1]()
+        finally:
+            timings[name] = time.perf_counter() - started
+
+    done = set()
+    pending = dict(stages)
+
+    if workers <= 1:
+        while pending:
+            name = next(name for name, (requires, _) in pending.items() if set(requires) <= done)
+            del pending[name]
+            timed(name)
+            done.add(name)
+        return timings
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            for name in [name for name, (requires, _) in pending.items() if set(requires) <= done]:
+                del pending[name]
+                running[pool.submit(timed, name)] = name
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                done.add(name)
+
+    return timings
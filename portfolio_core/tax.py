@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Tax Lots
+Holding-period classification, wash-sale adjustment and estimated tax payments
+over lot-matched round trips
+
+Part of astoreyai/claude-skills portfolio_core
+
+tax_lots() takes round trips (TradeTable or its to_frame(), e.g. from
+LotMatcher over the trade store) and:
+
+- classifies each closed lot as short- or long-term (held more than one
+  year, counting any holding period carried over from a washed lot);
+- applies the wash-sale rule: a loss is disallowed to the extent the same
+  symbol (and side) was acquired within WASH_SALE_DAYS before or after the
+  sale. The disallowed loss is added to the replacement lot's basis - it is
+  recognized when that lot is sold - and the washed lot's holding period is
+  tacked onto the replacement's. Shares of the lot that was sold (other
+  partial closes of it, or its still-open remainder) are never its own
+  replacement; lots are told apart by lot_id, or by row when it is absent.
+
+Replacement lots are found with one sorted index per (symbol, side): lot
+acquisition times are sorted once, each loss sale finds its +/- 30-day
+window with a binary search, and replacement shares already used up are
+skipped through a union-find "next free lot" pointer, so the whole pass is
+O(n log n) instead of comparing every sale with every purchase.
+
+tax_summary() nets short- and long-term results per tax year with the
+$3,000 capital loss limit and carryforward; estimated_payments() turns the
+year-to-date liability into the four IRS estimated-payment installments.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from portfolio_core.trade_table import TradeTable
+
+WASH_SALE_DAYS = 30
+
+# Net capital loss deductible against ordinary income per year
+CAPITAL_LOSS_LIMIT = 3000.0
+
+DEFAULT_FEDERAL_RATE = 0.37
+DEFAULT_LONG_TERM_RATE = 0.15
+DEFAULT_NIIT_RATE = 0.038
+DEFAULT_NIIT_THRESHOLD = 200000.0
+
+# Estimated-payment periods: (last month of the period, due month, due-year offset); due on the 15th
+PAYMENT_PERIODS = ((3, 4, 0), (5, 6, 0), (8, 9, 0), (12, 1, 1))
+
+# Quantities below this are treated as fully matched (fractional shares)
+QUANTITY_EPSILON = 1e-9
+
+TAX_LOT_COLUMNS = ['recognized_pnl', 'wash_sale_disallowed', 'basis_adjustment',
+                   'holding_days', 'term', 'tax_year']
+
+
+def _as_frame(trades: Union[TradeTable, pd.DataFrame]) -> pd.DataFrame:
+    return trades.to_frame() if isinstance(trades, TradeTable) else trades
+
+
+def _lot_ids(frame: pd.DataFrame, offset: int) -> np.ndarray:
+    """lot_id column, with missing or unknown (negative) ids replaced by unique per-row ids"""
+    rows = np.arange(len(frame))
+    if 'lot_id' not in frame.columns:
+        return -(offset + rows + 1)
+    ids = frame['lot_id'].fillna(-1).to_numpy(dtype=np.int64)
+    return np.where(ids < 0, -(offset + rows + 1), ids)
+
+
+def _find(next_free: List[int], i: int) -> int:
+    """First replacement slot >= i with shares left (path-halving union-find)"""
+    while next_free[i] != i:
+        next_free[i] = next_free[next_free[i]]
+        i = next_free[i]
+    return i
+
+
+def tax_lots(trades: Union[TradeTable, pd.DataFrame],
+             open_lots: Optional[pd.DataFrame] = None,
+             window_days: int = WASH_SALE_DAYS) -> pd.DataFrame:
+    """
+    Wash-sale adjusted, term-classified closed lots
+
+    Args:
+        trades: Round trips with symbol, entry_time, exit_time, quantity,
+            realized_pnl and optionally side and lot_id
+        open_lots: Optional lots still held (symbol, opened, quantity and
+            optionally side and lot_id, as from LotMatcher.open_lots()); they
+            can be replacement lots, and losses washed into them stay deferred
+        window_days: Wash-sale window on each side of a loss sale
+
+    Returns:
+        The trade frame plus TAX_LOT_COLUMNS: recognized_pnl (realized P&L
+        after basis adjustments and disallowed losses), wash_sale_disallowed
+        (loss deferred from this sale, >= 0), basis_adjustment (deferred loss
+        received from washed sales, >= 0), holding_days (including tacked-on
+        periods), term ('short'/'long') and tax_year. frame.attrs['deferred_loss']
+        is the disallowed loss carried into open lots.
+    """
+    frame = _as_frame(trades).reset_index(drop=True)
+    n = len(frame)
+
+    symbols = frame['symbol'].astype(str).to_numpy()
+    sides = frame['side'].astype(str).to_numpy() if 'side' in frame.columns else np.full(n, 'long')
+    entry = pd.to_datetime(frame['entry_time']).to_numpy('datetime64[ns]')
+    exit_ = pd.to_datetime(frame['exit_time']).to_numpy('datetime64[ns]')
+    quantity = frame['quantity'].to_numpy(dtype=float)
+    pnl = frame['realized_pnl'].to_numpy(dtype=float)
+    lot_id = _lot_ids(frame, 0)
+
+    # Open lots join the replacement candidates with an exit time after every sale
+    if open_lots is not None and len(open_lots):
+        m = len(open_lots)
+        symbols = np.concatenate([symbols, open_lots['symbol'].astype(str).to_numpy()])
+        sides = np.concatenate([sides, open_lots['side'].astype(str).to_numpy()
+                                if 'side' in open_lots.columns else np.full(m, 'long')])
+        entry = np.concatenate([entry, pd.to_datetime(open_lots['opened']).to_numpy('datetime64[ns]')])
+        exit_ = np.concatenate([exit_, np.full(m, np.datetime64('2262-01-01', 'ns'))])
+        quantity = np.concatenate([quantity, open_lots['quantity'].to_numpy(dtype=float)])
+        pnl = np.concatenate([pnl, np.zeros(m)])
+        lot_id = np.concatenate([lot_id, _lot_ids(open_lots.reset_index(drop=True), n)])
+
+    # Plain Python lists and int64 nanoseconds keep the matching loop cheap
+    entry_ns = entry.view(np.int64).tolist()
+    lot_ids = lot_id.tolist()
+    exit_ns = exit_.view(np.int64).tolist()
+    quantities = quantity.tolist()
+    pnl_values = pnl.tolist()
+    disallowed = [0.0] * len(pnl_values)
+    basis_adjustment = [0.0] * len(pnl_values)
+    tacked = [0] * len(pnl_values)
+    window = np.timedelta64(window_days, 'D')
+
+    groups = pd.DataFrame({'symbol': symbols, 'side': sides}).groupby(['symbol', 'side'], sort=False).indices
+    for rows in groups.values():
+        # Replacement candidates in acquisition order; sales in exit order
+        order = rows[np.argsort(entry[rows], kind='stable')]
+        candidates = order.tolist()
+        capacity = quantity[order].tolist()
+        next_free = list(range(len(candidates) + 1))
+
+        sales = rows[rows < n]
+        sales = sales[np.argsort(exit_[sales], kind='stable')]
+        lo = np.searchsorted(entry[order], exit_[sales] - window, side='left')
+        hi = np.searchsorted(entry[order], exit_[sales] + window, side='right')
+
+        windowed = lo < hi
+        for sale, start, stop in zip(sales[windowed].tolist(), lo[windowed].tolist(), hi[windowed].tolist()):
+            loss = pnl_values[sale] - basis_adjustment[sale]
+            if loss >= 0:
+                continue
+            sold_at = exit_ns[sale]
+            remaining = quantities[sale]
+
+            j = _find(next_free, start)
+            while j < stop and remaining > QUANTITY_EPSILON:
+                candidate = candidates[j]
+                if exit_ns[candidate] <= sold_at:
+                    # Closed by now, so never a replacement for this or any later sale
+                    next_free[j] = j + 1
+                elif lot_ids[candidate] != lot_ids[sale]:
+                    matched = min(remaining, capacity[j])
+                    amount = -loss * matched / quantities[sale]
+                    disallowed[sale] += amount
+                    basis_adjustment[candidate] += amount
+                    held = sold_at - entry_ns[sale] + tacked[sale]
+                    tacked[candidate] = max(tacked[candidate], held)
+                    capacity[j] -= matched
+                    remaining -= matched
+                    if capacity[j] <= QUANTITY_EPSILON:
+                        next_free[j] = j + 1
+                j = _find(next_free, j + 1)
+
+    disallowed = np.array(disallowed)
+    basis_adjustment = np.array(basis_adjustment)
+    tacked = np.array(tacked, dtype=np.int64).view('timedelta64[ns]')
+
+    result = frame.copy()
+    result['recognized_pnl'] = pnl[:n] - basis_adjustment[:n] + disallowed[:n]
+    result['wash_sale_disallowed'] = disallowed[:n]
+    result['basis_adjustment'] = basis_adjustment[:n]
+
+    # Long-term: sold after the anniversary of the (tacked-back) acquisition date
+    acquired = pd.Series(entry[:n] - tacked[:n]).dt.normalize()
+    sold = pd.Series(exit_[:n]).dt.normalize()
+    result['holding_days'] = (sold - acquired).dt.days.to_numpy()
+    long_term = (sold > acquired + pd.DateOffset(years=1)).to_numpy() & (sides[:n] == 'long')
+    result['term'] = np.where(long_term, 'long', 'short')
+    result['tax_year'] = sold.dt.year.to_numpy()
+    result.attrs['deferred_loss'] = float(basis_adjustment[n:].sum())
+    return result
+
+
+def _tax_on(short_term: float, long_term: float, carryforward: float,
+            federal_rate: float, long_term_rate: float, state_rate: float,
+            niit_rate: float, niit_threshold: float) -> Dict[str, float]:
+    """Net one period's short/long-term results and apply the rates"""
+    # Prior-year carryforward is applied as a short-term loss
+    short_term -= carryforward
+    net = short_term + long_term
+
+    if net < 0:
+        deduction = min(CAPITAL_LOSS_LIMIT, -net)
+        short_taxable = long_taxable = 0.0
+        carry = -net - deduction
+    else:
+        deduction = carry = 0.0
+        short_taxable = net if long_term < 0 else max(short_term, 0.0)
+        long_taxable = net - short_taxable
+
+    federal = short_taxable * federal_rate + long_taxable * long_term_rate
+    niit = max(net - niit_threshold, 0.0) * niit_rate
+    state = max(net, 0.0) * state_rate
+    return {
+        'net_capital_gain': net,
+        'short_term_taxable': short_taxable,
+        'long_term_taxable': long_taxable,
+        'capital_loss_deduction': deduction,
+        'carryforward': carry,
+        'federal_tax': federal,
+        'niit': niit,
+        'state_tax': state,
+        'total_tax': federal + niit + state,
+    }
+
+
+def _term_totals(lots: pd.DataFrame, keys: List[pd.Series]) -> pd.DataFrame:
+    """Recognized P&L per period key(s), one column per term"""
+    totals = lots.groupby(keys + [lots['term']])['recognized_pnl'].sum().unstack('term', fill_value=0.0)
+    return totals.reindex(columns=['short', 'long'], fill_value=0.0)
+
+
+def tax_summary(lots: pd.DataFrame,
+                federal_rate: float = DEFAULT_FEDERAL_RATE,
+                long_term_rate: float = DEFAULT_LONG_TERM_RATE,
+                state_rate: float = 0.0,
+                niit_rate: float = DEFAULT_NIIT_RATE,
+                niit_threshold: float = DEFAULT_NIIT_THRESHOLD,
+                loss_carryforward: float = 0.0) -> pd.DataFrame:
+    """
+    Realized tax liability per tax year
+
+    Args:
+        lots: tax_lots() output, or any frame with tax_year, recognized_pnl and term
+        federal_rate: Ordinary rate for short-term gains
+        long_term_rate: Rate for long-term gains
+        state_rate: State rate on net gains
+        niit_rate: Net investment income tax rate above niit_threshold
+        niit_threshold: Net gain above which NIIT applies
+        loss_carryforward: Capital loss carried into the first year
+
+    Returns:
+        One row per tax_year: short_term, long_term, wash_sale_disallowed,
+        netting results and taxes
+    """
+    if not len(lots):
+        return pd.DataFrame()
+
+    totals = _term_totals(lots, [lots['tax_year']])
+    disallowed = (lots.groupby('tax_year')['wash_sale_disallowed'].sum()
+                  if 'wash_sale_disallowed' in lots.columns else pd.Series(dtype=float))
+
+    rows = []
+    carry = loss_carryforward
+    for year, (short_term, long_term) in zip(totals.index, totals[['short', 'long']].to_numpy()):
+        taxes = _tax_on(short_term, long_term, carry, federal_rate, long_term_rate,
+                        state_rate, niit_rate, niit_threshold)
+        rows.append({'tax_year': int(year), 'short_term': short_term, 'long_term': long_term,
+                     'wash_sale_disallowed': float(disallowed.get(year, 0.0)), **taxes})
+        carry = taxes['carryforward']
+    return pd.DataFrame(rows)
+
+
+def estimated_payments(lots: pd.DataFrame,
+                       federal_rate: float = DEFAULT_FEDERAL_RATE,
+                       long_term_rate: float = DEFAULT_LONG_TERM_RATE,
+                       state_rate: float = 0.0,
+                       niit_rate: float = DEFAULT_NIIT_RATE,
+                       niit_threshold: float = DEFAULT_NIIT_THRESHOLD) -> pd.DataFrame:
+    """
+    Quarterly estimated-payment schedule (annualized installment method)
+
+    Each installment pays the tax on year-to-date recognized gains through
+    the end of its period, net of the loss carried forward from earlier
+    years, less what earlier installments of the year paid.
+
+    Args:
+        lots: tax_lots() output, or any frame with exit_time,
+            recognized_pnl and term
+        Rates as for tax_summary()
+
+    Returns:
+        One row per (tax_year, installment): period_end, due_date,
+        ytd_short_term, ytd_long_term, ytd_tax, payment
+    """
+    if not len(lots):
+        return pd.DataFrame()
+
+    sold = pd.to_datetime(lots['exit_time'])
+    ends = np.array([end for end, _, _ in PAYMENT_PERIODS])
+    installment = np.searchsorted(ends, sold.dt.month.to_numpy(), side='left')
+    totals = _term_totals(lots, [sold.dt.year.rename('year'),
+                                 pd.Series(installment, index=lots.index, name='installment')])
+
+    annual = tax_summary(lots.assign(tax_year=sold.dt.year), federal_rate, long_term_rate,
+                         state_rate, niit_rate, niit_threshold)
+    carried_in = dict(zip(annual['tax_year'] + 1, annual['carryforward']))
+
+    rows = []
+    for year in sorted(sold.dt.year.unique()):
+        carry = carried_in.get(year, 0.0)
+        short_term = long_term = paid = 0.0
+        for number, (end_month, due_month, due_offset) in enumerate(PAYMENT_PERIODS):
+            if (year, number) in totals.index:
+                short_term += totals.loc[(year, number), 'short']
+                long_term += totals.loc[(year, number), 'long']
+            ytd_tax = _tax_on(short_term, long_term, carry, federal_rate, long_term_rate,
+                              state_rate, niit_rate, niit_threshold)['total_tax']
+            payment = max(ytd_tax - paid, 0.0)
+            paid += payment
+            rows.append({
+                'tax_year': int(year),
+                'installment': number + 1,
+                'period_end': (pd.Timestamp(year, end_month, 1) + pd.offsets.MonthEnd(0)).date(),
+                'due_date': date(int(year) + due_offset, due_month, 15),
+                'ytd_short_term': short_term,
+                'ytd_long_term': long_term,
+                'ytd_tax': ytd_tax,
+                'payment': payment,
+            })
+    return pd.DataFrame(rows)
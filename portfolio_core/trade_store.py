@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Trade Store
+Append-only SQLite store of IB executions and cash flows
+
+Part of astoreyai/claude-skills portfolio_core
+
+Statements are ingested incrementally: a statement whose SHA-256 was already
+ingested is skipped outright, and every execution or deposit row carries a
+fingerprint so rows repeated across overlapping statements are stored once.
+Agents query executions and deposits by date range instead of re-parsing
+the full account history.
+
+Activity statements carry no execution IDs, so the fingerprint hashes
+(account, asset category, symbol, timestamp, quantity, price, commission)
+plus the row's occurrence number among identical keys in its statement,
+which keeps genuine duplicate fills distinct.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import pandas as pd
+
+from portfolio_core.ib_statement import IBStatement, parse_statement
+
+DEFAULT_STORE_PATH = Path.home() / ".local" / "share" / "claude-skills" / "trade_store.sqlite"
+
+EXECUTION_COLUMNS = ['account', 'asset_category', 'currency', 'symbol', 'datetime', 'quantity',
+                     'price', 'proceeds', 'commission', 'basis', 'realized_pnl', 'code']
+DEPOSIT_COLUMNS = ['account', 'currency', 'settle_date', 'description', 'amount']
+
+# Columns identifying an execution in the absence of IB execution IDs
+EXECUTION_KEY = ['account', 'asset_category', 'symbol', 'datetime', 'quantity', 'price', 'commission']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    fingerprint TEXT PRIMARY KEY,
+    account TEXT,
+    asset_category TEXT,
+    currency TEXT,
+    symbol TEXT,
+    datetime TEXT,
+    quantity REAL,
+    price REAL,
+    proceeds REAL,
+    commission REAL,
+    basis REAL,
+    realized_pnl REAL,
+    code TEXT,
+    source_sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_executions_datetime ON executions (datetime);
+CREATE INDEX IF NOT EXISTS idx_executions_symbol ON executions (symbol, datetime);
+
+CREATE TABLE IF NOT EXISTS deposits (
+    fingerprint TEXT PRIMARY KEY,
+    account TEXT,
+    currency TEXT,
+    settle_date TEXT,
+    description TEXT,
+    amount REAL,
+    source_sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_deposits_settle_date ON deposits (settle_date);
+
+CREATE TABLE IF NOT EXISTS statements (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT,
+    ingested_at TEXT,
+    executions_added INTEGER,
+    deposits_added INTEGER
+);
+"""
+
+DateLike = Union[str, datetime, pd.Timestamp, None]
+
+
+def _fingerprints(df: pd.DataFrame, key_columns: List[str]) -> pd.Series:
+    """Stable row fingerprints: hashed key columns plus occurrence number"""
+    if df.empty:
+        return pd.Series(index=df.index, dtype=object)
+    keys = df[key_columns[0]].astype(str)
+    for column in key_columns[1:]:
+        keys = keys + '|' + df[column].astype(str)
+    occurrence = keys.groupby(keys).cumcount().astype(str)
+    return (keys + '#' + occurrence).map(lambda key: hashlib.sha1(key.encode()).hexdigest())
+
+
+def _iso(value: DateLike) -> Optional[str]:
+    """Normalize a date bound to the stored ISO text format"""
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class TradeStore:
+    """Append-only execution and cash-flow store backed by SQLite"""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path or DEFAULT_STORE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection"""
+        self.conn.close()
+
+    def __enter__(self) -> 'TradeStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_ingested(self, sha256: str) -> bool:
+        """Whether a statement with this content hash was already ingested"""
+        row = self.conn.execute("SELECT 1 FROM statements WHERE sha256 = ?", (sha256,)).fetchone()
+        return row is not None
+
+    def statement_hashes(self) -> List[str]:
+        """Content hashes of every ingested statement, sorted"""
+        rows = self.conn.execute("SELECT sha256 FROM statements ORDER BY sha256").fetchall()
+        return [sha256 for sha256, in rows]
+
+    def ingest(self, statement: Union[str, Path, IBStatement]) -> dict:
+        """
+        Add a statement's new executions and deposits
+
+        Args:
+            statement: Path to an IB statement CSV or a parsed IBStatement
+
+        Returns:
+            Dict with executions_added, deposits_added and skipped flag
+        """
+        if not isinstance(statement, IBStatement):
+            statement = parse_statement(str(statement))
+
+        if self.is_ingested(statement.sha256):
+            return {'executions_added': 0, 'deposits_added': 0, 'skipped': True}
+
+        account = statement.account_info.get('Account', '')
+
+        executions = statement.executions().copy()
+        executions['account'] = account
+        executions['datetime'] = pd.to_datetime(executions['datetime']).dt.strftime('%Y-%m-%d %H:%M:%S')
+        executions = executions.reindex(columns=EXECUTION_COLUMNS)
+        executions.insert(0, 'fingerprint', _fingerprints(executions, EXECUTION_KEY))
+        executions['source_sha256'] = statement.sha256
+
+        deposits = statement.deposits.copy()
+        deposits['account'] = account
+        if 'settle_date' in deposits.columns:
+            deposits['settle_date'] = pd.to_datetime(deposits['settle_date']).dt.strftime('%Y-%m-%d')
+        deposits = deposits.reindex(columns=DEPOSIT_COLUMNS)
+        deposits.insert(0, 'fingerprint', _fingerprints(deposits, DEPOSIT_COLUMNS))
+        deposits['source_sha256'] = statement.sha256
+
+        with self.conn:
+            before = self.conn.total_changes
+            self._insert('executions', executions)
+            executions_added = self.conn.total_changes - before
+
+            before = self.conn.total_changes
+            self._insert('deposits', deposits)
+            deposits_added = self.conn.total_changes - before
+
+            self.conn.execute(
+                "INSERT INTO statements VALUES (?, ?, ?, ?, ?)",
+                (statement.sha256, statement.path, datetime.now().isoformat(),
+                 executions_added, deposits_added),
+            )
+
+        return {'executions_added': executions_added, 'deposits_added': deposits_added, 'skipped': False}
+
+    def _insert(self, table: str, df: pd.DataFrame) -> None:
+        """INSERT OR IGNORE rows; existing fingerprints are left untouched"""
+        if df.empty:
+            return
+        placeholders = ', '.join('?' * len(df.columns))
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(df.columns)}) VALUES ({placeholders})", rows
+        )
+
+    def executions(self,
+                   start: DateLike = None,
+                   end: DateLike = None,
+                   symbols: Optional[Iterable[str]] = None,
+                   asset_category: Optional[str] = None) -> pd.DataFrame:
+        """
+        Executions in [start, end), oldest first
+
+        Args:
+            start: Inclusive lower bound on execution time
+            end: Exclusive upper bound on execution time
+            symbols: Optional symbol filter
+            asset_category: Optional filter, e.g. 'Stocks'
+
+        Returns:
+            DataFrame with the same columns as IBStatement.executions()
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("datetime >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            clauses.append("datetime < ?")
+            params.append(_iso(end))
+        if symbols is not None:
+            symbols = list(symbols)
+            clauses.append(f"symbol IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if asset_category is not None:
+            clauses.append("asset_category = ?")
+            params.append(asset_category)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(EXECUTION_COLUMNS)} FROM executions {where} ORDER BY datetime, rowid",
+            self.conn, params=params,
+        )
+        df['datetime'] = pd.to_datetime(df['datetime'])
+        return df
+
+    def deposits(self, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """Deposits and withdrawals settled in [start, end), oldest first"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("settle_date >= ?")
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            clauses.append("settle_date < ?")
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(DEPOSIT_COLUMNS)} FROM deposits {where} ORDER BY settle_date, rowid",
+            self.conn, params=params,
+        )
+        df['settle_date'] = pd.to_datetime(df['settle_date'])
+        return df
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Trade Table
+Struct-of-arrays representation of round-trip trades
+
+Part of astoreyai/claude-skills portfolio_core
+
+A TradeTable holds one NumPy array per Trade field, so statistics over
+hundreds of thousands of round trips are single vectorized reductions
+instead of Python scans over Trade objects. Trade objects are only
+materialized on demand (iteration, trades()) for reports and exports that
+want them row by row.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Trade:
+    """Individual trade data"""
+    symbol: str
+    entry_date: str
+    entry_price: float
+    exit_date: str
+    exit_price: float
+    quantity: float
+    commission: float
+    realized_pnl: float
+    holding_period_minutes: int
+    return_pct: float
+    category: str  # 'intraday' or 'swing'
+    side: str = 'long'  # 'long' or 'short'
+
+
+# Row layout used by LotMatcher: Trade field order, with datetimes for the dates,
+# plus the id of the opening lot (-1 when unknown, e.g. built from Trade objects)
+ROW_FIELDS = ('symbol', 'entry_time', 'entry_price', 'exit_time', 'exit_price', 'quantity',
+              'commission', 'realized_pnl', 'holding_minutes', 'return_pct', 'category', 'side', 'lot_id')
+
+_DTYPES = {
+    'symbol': object,
+    'entry_time': 'datetime64[us]',
+    'entry_price': float,
+    'exit_time': 'datetime64[us]',
+    'exit_price': float,
+    'quantity': float,
+    'commission': float,
+    'realized_pnl': float,
+    'holding_minutes': np.int64,
+    'return_pct': float,
+    'lot_id': np.int64,
+}
+
+
+class TradeTable:
+    """Column arrays of round-trip trades; index with a mask or indices to slice"""
+
+    __slots__ = tuple(_DTYPES) + ('intraday', 'short', '_trades')
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            columns: Arrays keyed by ROW_FIELDS names, except category and
+                side which are given as the boolean 'intraday' and 'short'
+        """
+        for name in self.__slots__[:-1]:
+            setattr(self, name, columns[name])
+        self._trades = None
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> 'TradeTable':
+        """Build from ROW_FIELDS tuples (as accumulated by LotMatcher)"""
+        raw = dict(zip(ROW_FIELDS, zip(*rows))) if rows else {name: () for name in ROW_FIELDS}
+        columns = {name: np.array(raw[name], dtype=dtype) for name, dtype in _DTYPES.items()}
+        columns['intraday'] = np.array(raw['category'], dtype=object) == 'intraday'
+        columns['short'] = np.array(raw['side'], dtype=object) == 'short'
+        return cls(columns)
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Trade]) -> 'TradeTable':
+        """Build from Trade objects"""
+        return cls.from_rows([
+            (t.symbol, pd.Timestamp(t.entry_date).to_pydatetime(), t.entry_price,
+             pd.Timestamp(t.exit_date).to_pydatetime(), t.exit_price, t.quantity, t.commission,
+             t.realized_pnl, t.holding_period_minutes, t.return_pct, t.category, t.side, -1)
+            for t in trades
+        ])
+
+    def __len__(self) -> int:
+        return len(self.realized_pnl)
+
+    def __getitem__(self, index) -> 'TradeTable':
+        return TradeTable({name: getattr(self, name)[index] for name in self.__slots__[:-1]})
+
+    def __iter__(self) -> Iterator[Trade]:
+        return iter(self.trades())
+
+    def trades(self) -> List[Trade]:
+        """Materialize Trade objects (cached)"""
+        if self._trades is None:
+            entry = np.datetime_as_string(self.entry_time, unit='s')
+            exit_ = np.datetime_as_string(self.exit_time, unit='s')
+            self._trades = [
+                Trade(symbol, entry_date.replace('T', ' '), entry_price, exit_date.replace('T', ' '),
+                      exit_price, quantity, commission, pnl, holding, ret,
+                      'intraday' if intraday else 'swing', 'short' if short else 'long')
+                for symbol, entry_date, entry_price, exit_date, exit_price, quantity, commission,
+                pnl, holding, ret, intraday, short in zip(
+                    self.symbol.tolist(), entry.tolist(), self.entry_price.tolist(), exit_.tolist(),
+                    self.exit_price.tolist(), self.quantity.tolist(), self.commission.tolist(),
+                    self.realized_pnl.tolist(), self.holding_minutes.tolist(), self.return_pct.tolist(),
+                    self.intraday.tolist(), self.short.tolist())
+            ]
+        return self._trades
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with one column per field"""
+        return pd.DataFrame({
+            'symbol': self.symbol,
+            'entry_time': self.entry_time,
+            'entry_price': self.entry_price,
+            'exit_time': self.exit_time,
+            'exit_price': self.exit_price,
+            'quantity': self.quantity,
+            'commission': self.commission,
+            'realized_pnl': self.realized_pnl,
+            'holding_minutes': self.holding_minutes,
+            'return_pct': self.return_pct,
+            'category': np.where(self.intraday, 'intraday', 'swing'),
+            'side': np.where(self.short, 'short', 'long'),
+            'lot_id': self.lot_id,
+        })
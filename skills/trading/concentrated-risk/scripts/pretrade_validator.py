@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Pre-Trade Validator
+Executable version of the concentrated-risk skill rules
+
+Part of astoreyai/claude-skills trading/concentrated-risk skill
+
+Given a proposed order and recent OHLC bars, the validator:
+- computes the percentage, ATR and structure (swing) stops and keeps the
+  tightest one on the correct side of entry;
+- sizes the 95% position and its account risk;
+- runs the pre-trade checklist and regime filters from SKILL.md, with the
+  recovery-mode limits applied after a losing week or month.
+
+validate_batch() evaluates a whole watchlist at once: bars are stacked
+into (orders x bars) arrays, and stops, sizing and every check are
+computed as array operations. validate_order() is the one-order case of
+the same code path, so both always agree.
+
+Numeric inputs left as None fail their check (zero tolerance); event
+inputs (earnings date, Fed meeting, regime) pass when not supplied.
+A direction other than LONG/SHORT, a non-positive entry or non-positive
+account equity raises ValueError instead of producing a verdict.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from portfolio_core.indicators import atr_last
+
+RISK_LIMITS = {
+    # Per-trade limits
+    "max_position_pct": 0.95,
+    "max_stop_distance": 0.005,
+    "max_account_risk": 0.05,
+
+    # Daily limits
+    "max_daily_loss": 0.05,
+    "max_daily_trades": 3,
+
+    # Weekly limits
+    "max_weekly_loss": 0.10,
+
+    # Monthly limits
+    "max_monthly_loss": 0.15,
+
+    # Streak limits
+    "max_consecutive_losses": 3,
+}
+
+# Stop construction
+ATR_PERIOD = 14
+ATR_STOP_MULTIPLE = 0.75
+STRUCTURE_BUFFER = 0.10
+SWING_LOOKBACK = 20
+SWING_WINGS = 2
+
+# Only the most recent bars are used (ATR seeding and swing search)
+BAR_HISTORY = 250
+
+# Checklist thresholds
+MIN_CONFLUENCE = 0.70
+MIN_MTF_ALIGNMENT = 0.66
+MIN_ABS_ZSCORE = 2.0
+MAX_HALF_LIFE = 20
+MAX_HURST = 0.50
+MAX_ADF_PVALUE = 0.10
+MIN_TREND_SCORE = 0.75
+PULLBACK_DEPTH = (0.236, 0.618)
+MIN_RISK_REWARD = 1.5
+MAX_VIX = 25
+MAX_VIX_SPIKE = 0.30
+MAX_CHECKLIST_DAILY_LOSS = 0.03
+MAX_CHECKLIST_WEEKLY_LOSS = 0.07
+MAX_SPREAD = 0.0003
+MIN_VOLUME_RATIO = 0.5
+MIN_DAYS_TO_EARNINGS = 2
+
+NAN = float('nan')
+
+DIRECTIONS = ('LONG', 'SHORT')
+
+
+@dataclass
+class Signal:
+    """Setup statistics from the mean-reversion or pullback scanners"""
+    strategy: Optional[str] = None  # 'mean_reversion' or 'pullback'
+    confluence: Optional[float] = None
+    mtf_alignment: Optional[float] = None
+    zscore: Optional[float] = None
+    half_life: Optional[float] = None
+    hurst: Optional[float] = None
+    adf_pvalue: Optional[float] = None
+    trend_score: Optional[float] = None
+    depth: Optional[float] = None
+    target: Optional[float] = None
+    risk_reward: Optional[float] = None  # used when no target is given
+
+
+@dataclass
+class MarketState:
+    """Market conditions for one symbol"""
+    vix: Optional[float] = None
+    vix_change_1d: Optional[float] = None
+    regime: Optional[str] = None
+    spread: Optional[float] = None
+    volume: Optional[float] = None
+    avg_volume: Optional[float] = None
+    days_to_earnings: Optional[float] = None
+    fed_meeting: bool = False  # FOMC today or tomorrow
+
+
+@dataclass
+class AccountState:
+    """Account equity and P&L as fractions of equity (-0.02 = -2%)"""
+    equity: float
+    daily_pnl: float = 0.0
+    weekly_pnl: float = 0.0
+    monthly_pnl: float = 0.0
+    consecutive_losses: int = 0
+    open_positions: int = 0
+    daily_trades: int = 0
+
+
+@dataclass
+class Order:
+    """Proposed entry"""
+    symbol: str
+    direction: str  # 'LONG' or 'SHORT'
+    entry: float
+    signal: Signal = field(default_factory=Signal)
+    market: MarketState = field(default_factory=MarketState)
+
+
+def recovery_limits(account: AccountState) -> Dict:
+    """Position size, stop distance, confluence and trade count after drawdowns"""
+    if account.monthly_pnl < -0.10:
+        return {"position_size": 0.50, "stop_distance": 0.003,
+                "required_confluence": 0.80, "max_daily_trades": 1, "mode": "recovery_monthly"}
+    if account.weekly_pnl < -0.05:
+        return {"position_size": 0.75, "stop_distance": 0.004,
+                "required_confluence": 0.75, "max_daily_trades": 2, "mode": "recovery_weekly"}
+    return {"position_size": RISK_LIMITS["max_position_pct"], "stop_distance": RISK_LIMITS["max_stop_distance"],
+            "required_confluence": MIN_CONFLUENCE, "max_daily_trades": RISK_LIMITS["max_daily_trades"],
+            "mode": "normal"}
+
+
+def _value(x) -> float:
+    return NAN if x is None else float(x)
+
+
+def stack_bars(bars: Sequence, history: int = BAR_HISTORY) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Right-aligned (orders x bars) high/low/close arrays, NaN-padded on the left
+
+    Args:
+        bars: One DataFrame (or mapping of arrays) with high, low, close per order
+        history: Most recent bars kept
+    """
+    length = min(history, max((len(b['close']) for b in bars), default=0))
+    stacked = np.full((3, len(bars), length), np.nan)
+    for row, b in enumerate(bars):
+        for k, column in enumerate(('high', 'low', 'close')):
+            values = np.asarray(b[column], dtype=float)[-length:]
+            if len(values):
+                stacked[k, row, length - len(values):] = values
+    return stacked[0], stacked[1], stacked[2]
+
+
+def swing_levels(high: np.ndarray, low: np.ndarray,
+                 lookback: int = SWING_LOOKBACK, wings: int = SWING_WINGS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Most recent confirmed swing low and swing high per row
+
+    A swing low is a bar whose low is the minimum of the `wings` bars on
+    either side; only pivots within the last `lookback` bars count.
+    """
+    span = 2 * wings + 1
+    if low.shape[1] < span:
+        empty = np.full(len(low), np.nan)
+        return empty, empty.copy()
+
+    low_windows = np.lib.stride_tricks.sliding_window_view(low, span, axis=1)
+    high_windows = np.lib.stride_tricks.sliding_window_view(high, span, axis=1)
+    centre_low = low_windows[..., wings]
+    centre_high = high_windows[..., wings]
+    is_low = centre_low <= np.min(low_windows, axis=-1)
+    is_high = centre_high >= np.max(high_windows, axis=-1)
+
+    recent = slice(max(0, is_low.shape[1] - lookback), None)
+    return _last_where(is_low[:, recent], centre_low[:, recent]), _last_where(is_high[:, recent], centre_high[:, recent])
+
+
+def _last_where(mask: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """values at the last True of each row of mask, NaN when none"""
+    if mask.shape[1] == 0:
+        return np.full(len(mask), np.nan)
+    last = mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    found = mask[np.arange(len(mask)), last]
+    return np.where(found, values[np.arange(len(mask)), last], np.nan)
+
+
+def _stops(entry: np.ndarray, long: np.ndarray, atr: np.ndarray, swing_low: np.ndarray,
+           swing_high: np.ndarray, stop_distance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Tightest valid stop and its source ('percent', 'atr' or 'structure')"""
+    side = np.where(long, -1.0, 1.0)
+    candidates = np.stack([
+        entry * (1 + side * stop_distance),
+        entry + side * atr * ATR_STOP_MULTIPLE,
+        np.where(long, swing_low - STRUCTURE_BUFFER, swing_high + STRUCTURE_BUFFER),
+    ])
+    # Valid: a real price on the protective side of entry
+    distance = (entry - candidates) * -side
+    distance = np.where((distance > 0) & (candidates > 0), distance, np.inf)
+    choice = np.argmin(distance, axis=0)
+    columns = np.arange(len(entry))
+    stop = np.where(np.isfinite(distance[choice, columns]), candidates[choice, columns], np.nan)
+    return stop, np.array(['percent', 'atr', 'structure'])[choice]
+
+
+def _check_inputs(orders: Sequence[Order], account: AccountState) -> None:
+    """Reject inputs that would make the stop or sizing math meaningless"""
+    if not account.equity > 0:
+        raise ValueError(f"Account equity must be positive, got {account.equity}")
+    for order in orders:
+        if str(order.direction).upper() not in DIRECTIONS:
+            raise ValueError(f"{order.symbol}: direction must be one of {DIRECTIONS}, got {order.direction!r}")
+        if not order.entry > 0:
+            raise ValueError(f"{order.symbol}: entry price must be positive, got {order.entry}")
+
+
+def _evaluate(orders: Sequence[Order], bars: Sequence, account: AccountState) -> Dict:
+    """Stops, sizing and every check for a batch of orders, as arrays"""
+    _check_inputs(orders, account)
+    limits = recovery_limits(account)
+    high, low, close = stack_bars(bars)
+
+    entry = np.array([o.entry for o in orders], dtype=float)
+    long = np.array([o.direction.upper() == 'LONG' for o in orders])
+    atr = atr_last(high, low, close, ATR_PERIOD)
+    swing_low, swing_high = swing_levels(high, low)
+    stop, stop_source = _stops(entry, long, atr, swing_low, swing_high, limits['stop_distance'])
+
+    equity = account.equity
+    shares = np.floor(equity * limits['position_size'] / entry)
+    risk_per_share = np.abs(entry - stop)
+    total_risk = risk_per_share * shares
+    account_risk = total_risk / equity
+
+    signal = {name: np.array([_value(getattr(o.signal, name)) for o in orders])
+              for name in ('confluence', 'mtf_alignment', 'zscore', 'half_life', 'hurst',
+                           'adf_pvalue', 'trend_score', 'depth', 'target', 'risk_reward')}
+    market = {name: np.array([_value(getattr(o.market, name)) for o in orders])
+              for name in ('vix', 'vix_change_1d', 'spread', 'volume', 'avg_volume', 'days_to_earnings')}
+    strategy = np.array([o.signal.strategy or '' for o in orders])
+    regime = np.array([o.market.regime or '' for o in orders])
+    fed = np.array([bool(o.market.fed_meeting) for o in orders])
+
+    reward = np.where(long, 1.0, -1.0) * (signal['target'] - entry)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        risk_reward = np.where(np.isnan(signal['target']), signal['risk_reward'], reward / risk_per_share)
+
+    n = len(orders)
+    everyone = np.ones(n, dtype=bool)
+    mean_reversion = strategy == 'mean_reversion'
+    pullback = strategy == 'pullback'
+    earnings = market['days_to_earnings']
+    low_depth, high_depth = PULLBACK_DEPTH
+
+    def account_check(passed: bool) -> np.ndarray:
+        return np.full(n, passed)
+
+    # (name, value, passed, applies)
+    checks = [
+        (f"Confluence >= {limits['required_confluence']:.2f}", signal['confluence'],
+         signal['confluence'] >= limits['required_confluence'], everyone),
+        ("MTF Alignment >= 2/3", signal['mtf_alignment'], signal['mtf_alignment'] >= MIN_MTF_ALIGNMENT, everyone),
+        ("Z-score extreme", signal['zscore'], np.abs(signal['zscore']) >= MIN_ABS_ZSCORE, mean_reversion),
+        ("Half-life < 20", signal['half_life'], signal['half_life'] < MAX_HALF_LIFE, mean_reversion),
+        ("Hurst < 0.50", signal['hurst'], signal['hurst'] < MAX_HURST, mean_reversion),
+        ("ADF p-value <= 0.10", signal['adf_pvalue'], signal['adf_pvalue'] <= MAX_ADF_PVALUE, mean_reversion),
+        ("Trend score >= 0.75", signal['trend_score'], signal['trend_score'] >= MIN_TREND_SCORE, pullback),
+        ("Pullback depth valid", signal['depth'],
+         (signal['depth'] >= low_depth) & (signal['depth'] <= high_depth), pullback),
+        ("Stop defined", stop, ~np.isnan(stop), everyone),
+        (f"Stop distance <= {limits['stop_distance']:.1%}", risk_per_share / entry,
+         risk_per_share / entry <= limits['stop_distance'] + 1e-12, everyone),
+        ("R:R >= 1.5", risk_reward, risk_reward >= MIN_RISK_REWARD, everyone),
+        ("Account risk <= 5%", account_risk, account_risk <= RISK_LIMITS['max_account_risk'], everyone),
+        ("VIX < 25", market['vix'], market['vix'] < MAX_VIX, everyone),
+        ("No VIX spike", market['vix_change_1d'], market['vix_change_1d'] <= MAX_VIX_SPIKE, everyone),
+        ("Not trending bearish", regime, regime != 'trending_bearish', everyone),
+        ("Daily loss < 3%", np.full(n, account.daily_pnl),
+         account_check(account.daily_pnl > -MAX_CHECKLIST_DAILY_LOSS), everyone),
+        ("Weekly loss < 7%", np.full(n, account.weekly_pnl),
+         account_check(account.weekly_pnl > -MAX_CHECKLIST_WEEKLY_LOSS), everyone),
+        ("Monthly loss < 15%", np.full(n, account.monthly_pnl),
+         account_check(account.monthly_pnl > -RISK_LIMITS['max_monthly_loss']), everyone),
+        ("Consecutive losses < 3", np.full(n, account.consecutive_losses),
+         account_check(account.consecutive_losses < RISK_LIMITS['max_consecutive_losses']), everyone),
+        (f"Daily trades < {limits['max_daily_trades']}", np.full(n, account.daily_trades),
+         account_check(account.daily_trades < limits['max_daily_trades']), everyone),
+        ("No open positions", np.full(n, account.open_positions),
+         account_check(account.open_positions == 0), everyone),
+        ("Spread < 0.03%", market['spread'], market['spread'] < MAX_SPREAD, everyone),
+        ("Volume adequate", market['volume'], market['volume'] > market['avg_volume'] * MIN_VOLUME_RATIO, everyone),
+        ("No earnings < 2 days", earnings, np.isnan(earnings) | (earnings >= MIN_DAYS_TO_EARNINGS), everyone),
+        ("No Fed meeting today/tomorrow", fed, ~fed, everyone),
+    ]
+
+    return {
+        'limits': limits,
+        'entry': entry,
+        'long': long,
+        'atr': atr,
+        'stop': stop,
+        'stop_source': stop_source,
+        'shares': shares,
+        'risk_per_share': risk_per_share,
+        'total_risk': total_risk,
+        'account_risk': account_risk,
+        'risk_reward': risk_reward,
+        'checks': checks,
+    }
+
+
+def validate_batch(orders: Sequence[Order], bars: Mapping[str, object], account: AccountState) -> pd.DataFrame:
+    """
+    Validate a watchlist of proposed orders against one account state
+
+    Each order is checked on its own, as if it were the only entry taken.
+
+    Args:
+        orders: Proposed orders
+        bars: symbol -> recent bars (DataFrame or mapping with high, low, close)
+        account: Current account state
+
+    Returns:
+        One row per order: symbol, direction, approved, passed, total, stop,
+        stop_source, shares, position_value, risk_per_share, total_risk,
+        account_risk_pct, risk_reward and the names of failed checks
+    """
+    if not orders:
+        return pd.DataFrame()
+
+    result = _evaluate(orders, [bars[o.symbol] for o in orders], account)
+    applies = np.array([check[3] for check in result['checks']])
+    passed = np.array([check[2] for check in result['checks']]) & applies
+    failed = applies & ~passed
+    names = np.array([check[0] for check in result['checks']])
+
+    return pd.DataFrame({
+        'symbol': [o.symbol for o in orders],
+        'direction': [o.direction.upper() for o in orders],
+        'approved': ~failed.any(axis=0),
+        'passed': passed.sum(axis=0),
+        'total': applies.sum(axis=0),
+        'entry': result['entry'],
+        'stop': result['stop'],
+        'stop_source': np.where(np.isnan(result['stop']), None, result['stop_source']),
+        'shares': result['shares'].astype(int),
+        'position_value': result['shares'] * result['entry'],
+        'risk_per_share': result['risk_per_share'],
+        'total_risk': result['total_risk'],
+        'account_risk_pct': result['account_risk'] * 100,
+        'risk_reward': result['risk_reward'],
+        'failed_checks': ['; '.join(names[failed[:, i]]) for i in range(len(orders))],
+    })
+
+
+def validate_order(order: Order, bars, account: AccountState) -> Dict:
+    """
+    Validate one proposed order
+
+    Args:
+        order: Proposed order
+        bars: Recent bars for order.symbol (DataFrame or mapping with high, low, close)
+        account: Current account state
+
+    Returns:
+        Dict in the SKILL.md output format: result, checks (name, status,
+        value), passed/total and risk_summary
+    """
+    result = _evaluate([order], [bars], account)
+
+    checks = []
+    for name, value, passed, applies in result['checks']:
+        if not applies[0]:
+            continue
+        value = value[0].item() if hasattr(value[0], 'item') else value[0]
+        checks.append({
+            'name': name,
+            'status': 'PASS' if passed[0] else 'FAIL',
+            'value': None if isinstance(value, float) and np.isnan(value) else value,
+        })
+
+    passed = sum(check['status'] == 'PASS' for check in checks)
+    stop = float(result['stop'][0])
+    shares = int(result['shares'][0])
+    return {
+        'symbol': order.symbol,
+        'direction': order.direction.upper(),
+        'position_pct': result['limits']['position_size'],
+        'mode': result['limits']['mode'],
+        'result': 'APPROVED' if passed == len(checks) else 'REJECTED',
+        'checks': checks,
+        'passed': passed,
+        'total': len(checks),
+        'risk_summary': {
+            'entry': order.entry,
+            'stop': None if np.isnan(stop) else round(stop, 4),
+            'stop_source': None if np.isnan(stop) else str(result['stop_source'][0]),
+            'atr': None if np.isnan(result['atr'][0]) else float(result['atr'][0]),
+            'position_value': shares * order.entry,
+            'shares': shares,
+            'risk_per_share': float(result['risk_per_share'][0]),
+            'total_risk': float(result['total_risk'][0]),
+            'account_risk_pct': float(result['account_risk'][0] * 100),
+        },
+    }
+
+
+def _order_from_dict(raw: Dict) -> Order:
+    return Order(
+        symbol=raw['symbol'],
+        direction=raw.get('direction', 'LONG'),
+        entry=float(raw['entry']),
+        signal=Signal(**raw.get('signal', {})),
+        market=MarketState(**raw.get('market', {})),
+    )
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description='Concentrated-risk pre-trade validator')
+    parser.add_argument('orders', help='JSON file: {"account": {...}, "orders": [{symbol, direction, entry, signal, market}]}')
+    parser.add_argument('--bars-dir', required=True, help='Directory of <SYMBOL>.csv bars with high, low, close columns')
+    parser.add_argument('--batch', action='store_true', help='Print one summary row per order instead of full reports')
+    args = parser.parse_args()
+
+    spec = json.loads(Path(args.orders).read_text())
+    account = AccountState(**spec['account'])
+    orders = [_order_from_dict(raw) for raw in spec['orders']]
+    bars = {symbol: pd.read_csv(Path(args.bars_dir) / f"{symbol}.csv").rename(columns=str.lower)
+            for symbol in {o.symbol for o in orders}}
+
+    if args.batch:
+        print(validate_batch(orders, bars, account).to_string(index=False))
+    else:
+        reports = [validate_order(order, bars[order.symbol], account) for order in orders]
+        json.dump(reports, sys.stdout, indent=2, default=str)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Mean Reversion Scanner
+Universe-wide scoring of the mean-reversion-detector skill conditions
+
+Part of astoreyai/claude-skills trading/mean-reversion-detector skill
+
+The whole universe is held as portfolio_core.bars.Bars - (symbols x bars)
+arrays on one shared time grid - so every statistic is a handful of NumPy operations over all
+symbols at once instead of a Python loop per symbol:
+
+- z-scores on 5m / 15m / 1h bars (resampled from the base bars once) and
+  their multi-timeframe alignment;
+- OLS half-life on the primary 15m timeframe, plus DFA Hurst and ADF
+  p-values from stationarity_screen (optionally served from its
+  per-symbol cache);
+- the nine weighted conditions from SKILL.md, mirrored for shorts, summed
+  into the confluence score.
+
+Only the tail of each series that a statistic needs is touched; the
+long rolling work (RSI) steps through time once with all symbols per
+step.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from portfolio_core.bars import NS_PER_DAY, Bars, load_bars_dir, resample
+from portfolio_core import indicators
+
+from stationarity_screen import StationarityScreen, adf_pvalue, dfa_hurst
+
+TIMEFRAMES = {'5m': 5, '15m': 15, '1h': 60}
+PRIMARY_TIMEFRAME = '15m'
+
+# Z-score
+ZSCORE_PERIOD = 20
+ZSCORE_THRESHOLDS = {'5m': 2.0, '15m': 2.0, '1h': 1.5}
+MIN_ALIGNMENT = 0.66
+
+# Condition parameters (primary timeframe bars)
+RSI_PERIOD = 14
+RSI_LOOKBACK = 100
+RSI_PERCENTILE = 0.05
+DIVERGENCE_WINDOW = 10
+EXHAUSTION_BARS = 3
+STOCH_K = 14
+STOCH_D = 3
+STOCH_OVERSOLD = 20
+STOCH_OVERBOUGHT = 80
+ABSORPTION_BARS = 5
+VWAP_SIGMA = 2.0
+PREV_DAY_TOLERANCE = 0.001
+
+# Statistics (primary timeframe bars)
+HALF_LIFE_WINDOW = 100
+
+# Most recent bars kept per timeframe
+HISTORY_BARS = 400
+
+CONDITION_WEIGHTS = {
+    'zscore_extreme': 0.16,
+    'rsi_percentile': 0.11,
+    'bullish_divergence': 0.14,
+    'exhaustion_signal': 0.09,
+    'stoch_crossover': 0.07,
+    'absorption_signal': 0.09,
+    'vwap_deviation': 0.06,
+    'mtf_alignment': 0.18,
+    'prev_day_support': 0.10,
+}
+
+def latest_zscore(close: np.ndarray, period: int = ZSCORE_PERIOD) -> np.ndarray:
+    """(close - SMA) / std over the last `period` bars, per row"""
+    window = close[:, -period:]
+    std = window.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 0, (close[:, -1] - window.mean(axis=1)) / std, np.nan)
+
+
+def half_life(close: np.ndarray, window: int = HALF_LIFE_WINDOW) -> np.ndarray:
+    """OLS half-life -ln2 / ln(beta) of price_t = a + beta * price_{t-1}; inf if not mean reverting"""
+    y = close[:, -window:]
+    x = close[:, -window - 1:-1]
+    x_dev = x - x.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (x_dev * (y - y.mean(axis=1, keepdims=True))).sum(axis=1) / (x_dev ** 2).sum(axis=1)
+        result = np.where((beta > 0) & (beta < 1), -np.log(2) / np.log(beta), np.inf)
+    return np.where(np.isnan(beta), np.nan, result)
+
+
+def _session_slices(timestamps: np.ndarray) -> Dict[str, slice]:
+    """Bar ranges of the latest and the previous trading day"""
+    day = timestamps.astype(np.int64) // NS_PER_DAY
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    today = slice(starts[-1], None)
+    previous = slice(starts[-2], starts[-1]) if len(starts) > 1 else slice(0, 0)
+    return {'today': today, 'previous': previous}
+
+
+def _divergence(low: np.ndarray, high: np.ndarray, rsi: np.ndarray, window: int = DIVERGENCE_WINDOW):
+    """(bullish, bearish): new price extreme in the last window not confirmed by RSI"""
+    rows = np.arange(len(low))
+    recent = slice(-window, None)
+    prior = slice(-2 * window, -window)
+
+    def extreme(values, pick, span):
+        block = values[:, span]
+        filled = np.where(np.isnan(block), np.inf if pick is np.argmin else -np.inf, block)
+        index = pick(filled, axis=1)
+        return block[rows, index], rsi[:, span][rows, index]
+
+    recent_low, recent_low_rsi = extreme(low, np.argmin, recent)
+    prior_low, prior_low_rsi = extreme(low, np.argmin, prior)
+    recent_high, recent_high_rsi = extreme(high, np.argmax, recent)
+    prior_high, prior_high_rsi = extreme(high, np.argmax, prior)
+    bullish = (recent_low < prior_low) & (recent_low_rsi > prior_low_rsi)
+    bearish = (recent_high > prior_high) & (recent_high_rsi < prior_high_rsi)
+    return bullish, bearish
+
+
+def score_conditions(conditions: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Confluence score: weighted sum of the condition flags"""
+    return sum(weight * np.asarray(conditions[name], dtype=float) for name, weight in CONDITION_WEIGHTS.items())
+
+
+def primary_bars(bars: Bars) -> Bars:
+    """Base bars resampled to the primary timeframe (what the screen runs on)"""
+    return resample(bars, TIMEFRAMES[PRIMARY_TIMEFRAME])
+
+
+def scan(bars: Bars, screen: Optional[StationarityScreen] = None) -> pd.DataFrame:
+    """
+    Score every symbol of the universe
+
+    Args:
+        bars: Base bars (5-minute or finer) for the universe
+        screen: Serve Hurst / ADF from this per-symbol cache instead of
+            recomputing them
+
+    Returns:
+        One row per symbol, sorted by confluence_score: direction,
+        statistics, z-scores per timeframe, the nine condition flags and the
+        VWAP mean-reversion target
+    """
+    base_minutes = bars.bar_minutes()
+    frames = {name: resample(bars.tail(HISTORY_BARS * minutes // base_minutes), minutes).tail(HISTORY_BARS)
+              for name, minutes in TIMEFRAMES.items()}
+    zscores = {name: latest_zscore(frame.close) for name, frame in frames.items()}
+
+    primary = frames[PRIMARY_TIMEFRAME]
+    close, high, low = primary.close, primary.high, primary.low
+    z = zscores[PRIMARY_TIMEFRAME]
+    long = z < 0
+
+    # MTF alignment: 2 of 3 timeframes beyond their thresholds, same side
+    alignment_long = np.mean([zscores[name] < -ZSCORE_THRESHOLDS[name] for name in TIMEFRAMES], axis=0)
+    alignment_short = np.mean([zscores[name] > ZSCORE_THRESHOLDS[name] for name in TIMEFRAMES], axis=0)
+    alignment = np.where(long, alignment_long, alignment_short)
+
+    # RSI percentile within its own recent history
+    rsi = indicators.rsi(close, RSI_PERIOD)
+    history = rsi[:, -RSI_LOOKBACK:]
+    with np.errstate(invalid='ignore'):
+        rank = (history <= rsi[:, -1:]).sum(axis=1) / np.count_nonzero(~np.isnan(history), axis=1)
+        rank_short = (history >= rsi[:, -1:]).sum(axis=1) / np.count_nonzero(~np.isnan(history), axis=1)
+    bullish, bearish = _divergence(low, high, rsi)
+
+    # Exhaustion: move continuing but slower than the previous leg
+    k = EXHAUSTION_BARS
+    move_now = close[:, -1] - close[:, -1 - k]
+    move_before = close[:, -1 - k] - close[:, -1 - 2 * k]
+
+    # Stochastic %K / %D: only the last STOCH_D %K values feed the latest %D
+    span = STOCH_K + STOCH_D - 1
+    stoch_k, stoch_d = indicators.stochastic(high[:, -span:], low[:, -span:], close[:, -span:], STOCH_K, STOCH_D)
+    percent_k, percent_d = stoch_k[:, -1], stoch_d[:, -1]
+
+    # Absorption: price moving one way, bar-signed volume (delta) the other
+    delta = (np.sign(primary.close - primary.open) * primary.volume)[:, -ABSORPTION_BARS:].sum(axis=1)
+    price_move = close[:, -1] - close[:, -1 - ABSORPTION_BARS]
+
+    # Session VWAP and its volume-weighted sigma band; previous-day range
+    sessions = _session_slices(primary.timestamps)
+    today = sessions['today']
+    vwap, vwap_sigma = (series[:, -1] for series in indicators.vwap(
+        high[:, today], low[:, today], close[:, today], primary.volume[:, today], primary.timestamps[today]))
+    previous = sessions['previous']
+    with np.errstate(all='ignore'):
+        prev_low = np.nanmin(low[:, previous], axis=1) if previous.stop else np.full(len(close), np.nan)
+        prev_high = np.nanmax(high[:, previous], axis=1) if previous.stop else np.full(len(close), np.nan)
+
+    if screen is not None:
+        cached = screen.statistics(primary)
+        statistics = {'hurst': cached['hurst'].to_numpy(), 'adf_pvalue': cached['adf_pvalue'].to_numpy()}
+    else:
+        statistics = {'hurst': dfa_hurst(close), 'adf_pvalue': adf_pvalue(close)}
+
+    last = close[:, -1]
+    conditions = {
+        'zscore_extreme': np.where(long, z < -ZSCORE_THRESHOLDS[PRIMARY_TIMEFRAME],
+                                   z > ZSCORE_THRESHOLDS[PRIMARY_TIMEFRAME]),
+        'rsi_percentile': np.where(long, rank <= RSI_PERCENTILE, rank_short <= RSI_PERCENTILE),
+        'bullish_divergence': np.where(long, bullish, bearish),
+        'exhaustion_signal': np.where(long,
+                                      (move_now < 0) & (move_before < 0) & (move_now > move_before),
+                                      (move_now > 0) & (move_before > 0) & (move_now < move_before)),
+        'stoch_crossover': np.where(long,
+                                    (percent_k > percent_d) & (percent_k < STOCH_OVERSOLD) & (percent_d < STOCH_OVERSOLD),
+                                    (percent_k < percent_d) & (percent_k > STOCH_OVERBOUGHT) & (percent_d > STOCH_OVERBOUGHT)),
+        'absorption_signal': np.where(long, (price_move < 0) & (delta > 0), (price_move > 0) & (delta < 0)),
+        'vwap_deviation': np.where(long, last < vwap - VWAP_SIGMA * vwap_sigma, last > vwap + VWAP_SIGMA * vwap_sigma),
+        'mtf_alignment': alignment >= MIN_ALIGNMENT,
+        'prev_day_support': np.where(long, last <= prev_low * (1 + PREV_DAY_TOLERANCE),
+                                     last >= prev_high * (1 - PREV_DAY_TOLERANCE)),
+    }
+    no_signal = np.isnan(z)
+    conditions = {name: flags & ~no_signal for name, flags in conditions.items()}
+
+    result = pd.DataFrame({
+        'symbol': bars.symbols,
+        'direction': np.where(no_signal, None, np.where(long, 'LONG', 'SHORT')),
+        'confluence_score': score_conditions(conditions),
+        'close': last,
+        **{f"z_{name}": zscores[name] for name in TIMEFRAMES},
+        'alignment': alignment,
+        'rsi': rsi[:, -1],
+        'half_life': half_life(close),
+        'hurst': statistics['hurst'],
+        'adf_pvalue': statistics['adf_pvalue'],
+        'vwap': vwap,
+        **conditions,
+    })
+    return result.sort_values('confluence_score', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description='Mean-reversion universe scanner')
+    parser.add_argument('data_dir', help='Directory of <SYMBOL>.csv base bars (timestamp, open, high, low, close, volume)')
+    parser.add_argument('--symbols', nargs='*', help='Restrict to these symbols')
+    parser.add_argument('--min-confluence', type=float, default=0.70, help='Minimum confluence score to list')
+    parser.add_argument('--top', type=int, default=20, help='Rows to print')
+    parser.add_argument('--screen', action='store_true',
+                        help='Scan only symbols passing the Hurst / ADF / volume universe screen')
+    parser.add_argument('--screen-cache', type=Path, help='JSON file persisting screen statistics between runs')
+    args = parser.parse_args()
+
+    bars = load_bars_dir(Path(args.data_dir), args.symbols)
+    if not bars.symbols:
+        print(f"No bars found in {args.data_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    screen = StationarityScreen()
+    if args.screen_cache:
+        screen.load(args.screen_cache)
+    if args.screen:
+        candidates = screen.screen(primary_bars(bars))
+        passed = candidates.loc[candidates['passed'], 'symbol'].tolist()
+        print(f"Screen: {len(passed)}/{len(candidates)} symbols pass "
+              f"({int(candidates['refreshed'].sum())} recomputed)", file=sys.stderr)
+        bars = bars.select(passed)
+
+    result = scan(bars, screen) if bars.symbols else None
+    if args.screen_cache:
+        screen.save(args.screen_cache)
+    if result is None:
+        print("No symbols passed the screen")
+        return
+    result = result[result['confluence_score'] >= args.min_confluence].head(args.top)
+    columns = ['symbol', 'direction', 'confluence_score', 'close', 'z_5m', 'z_15m', 'z_1h',
+               'half_life', 'hurst', 'adf_pvalue', 'vwap']
+    print(result[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Stationarity Screen
+Batched Hurst / ADF universe screening with cached per-symbol statistics
+
+Part of astoreyai/claude-skills trading/mean-reversion-detector skill
+
+Step 1 of the skill workflow keeps only symbols with Hurst < 0.50,
+ADF p-value < 0.05 and average volume > 1M before any signal work. Hurst
+and ADF are the most expensive statistics and barely move from one bar to
+the next, so:
+
+- both are computed for many symbols at once: DFA fluctuations for every
+  scale as batched segment regressions, ADF as one batched
+  normal-equations solve;
+- StationarityScreen caches them per symbol with the timestamp of the
+  bar they were computed at, and only recomputes symbols that have
+  gained `refresh_bars` new bars (or were never seen). A routine re-screen
+  therefore touches a small slice of the universe.
+
+Volume is cheap and is recomputed on every screen.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Statistics window (bars of the timeframe passed in)
+STAT_WINDOW = 200
+DFA_SCALES = (8, 12, 16, 24, 32, 48)
+ADF_LAGS = 1
+
+# Universe screen (SKILL.md Step 1)
+MAX_HURST = 0.50
+MAX_ADF_PVALUE = 0.05
+MIN_AVG_VOLUME = 1_000_000
+
+# Recompute cached statistics once this many new bars arrived
+REFRESH_BARS = 10
+
+# MacKinnon (1994/2010) approximate p-value surface, constant-only ADF, one series
+_ADF_TAU_MAX = 2.74
+_ADF_TAU_MIN = -18.83
+_ADF_TAU_STAR = -1.61
+_ADF_SMALL_P = (2.1659, 1.4412, 0.038269)
+_ADF_LARGE_P = (1.7339, 0.93202, -0.12745, -0.010368)
+
+_NS_PER_DAY = 24 * 60 * 60 * 10**9
+
+
+def dfa_hurst(close: np.ndarray, window: int = STAT_WINDOW, scales: Sequence[int] = DFA_SCALES) -> np.ndarray:
+    """
+    Hurst exponent per row by detrended fluctuation analysis of log returns
+
+    The return profile is cut into non-overlapping segments of each scale;
+    every segment of every row is detrended with the same precomputed
+    linear fit, so a scale costs a few array operations over the whole
+    universe. H is the least-squares slope of log F(scale) on log scale.
+    """
+    returns = np.diff(np.log(close[:, -window:]), axis=1)
+    profile = np.cumsum(returns - returns.mean(axis=1, keepdims=True), axis=1)
+    scales = [s for s in scales if s <= profile.shape[1] // 2]
+    if len(scales) < 2:
+        return np.full(len(close), np.nan)
+
+    log_fluctuation = np.empty((len(close), len(scales)))
+    for column, scale in enumerate(scales):
+        segments = profile[:, :profile.shape[1] // scale * scale].reshape(len(close), -1, scale)
+        t = np.arange(scale) - (scale - 1) / 2
+        slope = segments @ t / (t @ t)
+        residual = segments - segments.mean(axis=2, keepdims=True) - slope[..., None] * t
+        log_fluctuation[:, column] = 0.5 * np.log((residual ** 2).mean(axis=(1, 2)))
+
+    log_scale = np.log(np.asarray(scales, dtype=float))
+    log_scale -= log_scale.mean()
+    with np.errstate(invalid='ignore'):
+        return (log_fluctuation - log_fluctuation.mean(axis=1, keepdims=True)) @ log_scale / (log_scale @ log_scale)
+
+
+def mackinnon_pvalue(tau: np.ndarray) -> np.ndarray:
+    """Approximate ADF p-value for constant-only test statistics"""
+    tau = np.asarray(tau, dtype=float)
+    poly = np.where(tau <= _ADF_TAU_STAR,
+                    np.polyval(_ADF_SMALL_P[::-1], tau),
+                    np.polyval(_ADF_LARGE_P[::-1], tau))
+    normal_cdf = np.frompyfunc(lambda z: 0.5 * math.erfc(-z / math.sqrt(2)), 1, 1)
+    p = normal_cdf(poly).astype(float)
+    p = np.where(tau > _ADF_TAU_MAX, 1.0, np.where(tau < _ADF_TAU_MIN, 0.0, p))
+    return np.where(np.isnan(tau), np.nan, p)
+
+
+def adf_pvalue(close: np.ndarray, window: int = STAT_WINDOW, lags: int = ADF_LAGS) -> np.ndarray:
+    """
+    Augmented Dickey-Fuller p-value (constant, fixed lags) of log prices per row
+
+    dy_t = a + g * y_{t-1} + sum(phi_i * dy_{t-i}) is fitted for every row
+    with one batched normal-equations solve; the statistic is g's t-value.
+    """
+    y = np.log(close[:, -window:])
+    dy = np.diff(y, axis=1)
+    target = dy[:, lags:]
+    regressors = [np.ones_like(target), y[:, lags:-1]]
+    regressors += [dy[:, lags - i:-i] for i in range(1, lags + 1)]
+    X = np.stack(regressors, axis=2)
+
+    valid = ~np.isnan(target).any(axis=1) & ~np.isnan(X).any(axis=(1, 2))
+    tau = np.full(len(close), np.nan)
+    if valid.any():
+        X, target = X[valid], target[valid]
+        xtx = np.einsum('snk,snj->skj', X, X)
+        xty = np.einsum('snk,sn->sk', X, target)
+        try:
+            inverse = np.linalg.inv(xtx)
+        except np.linalg.LinAlgError:
+            inverse = np.linalg.pinv(xtx)
+        coef = np.einsum('skj,sj->sk', inverse, xty)
+        residual = target - np.einsum('snk,sk->sn', X, coef)
+        dof = X.shape[1] - X.shape[2]
+        variance = (residual ** 2).sum(axis=1) / dof
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau[valid] = coef[:, 1] / np.sqrt(variance * inverse[:, 1, 1])
+    return mackinnon_pvalue(tau)
+
+
+def average_daily_volume(timestamps: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Mean per-day volume per row over complete days (the latest day is excluded when there are others)"""
+    day = np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64) // _NS_PER_DAY
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    daily = np.add.reduceat(np.nan_to_num(volume), starts, axis=1)
+    if daily.shape[1] > 1:
+        daily = daily[:, :-1]
+    return daily.mean(axis=1)
+
+
+class StationarityScreen:
+    """Per-symbol Hurst / ADF cache with incremental refresh"""
+
+    def __init__(self, refresh_bars: int = REFRESH_BARS, window: int = STAT_WINDOW):
+        self.refresh_bars = refresh_bars
+        self.window = window
+        # symbol -> (hurst, adf_pvalue, timestamp of the last bar used, ns)
+        self.cache: Dict[str, Tuple[float, float, int]] = {}
+
+    def statistics(self, bars) -> pd.DataFrame:
+        """
+        Hurst and ADF p-value for every symbol, recomputing only stale entries
+
+        Args:
+            bars: Bars (symbols, timestamps, close) of the screening timeframe
+
+        Returns:
+            symbol, hurst, adf_pvalue, new_bars (since the cached value) and
+            refreshed (recomputed on this call)
+        """
+        stamps = np.asarray(bars.timestamps, dtype='datetime64[ns]').astype(np.int64)
+        last_stamp = int(stamps[-1]) if len(stamps) else 0
+        cached_at = np.array([self.cache[s][2] if s in self.cache else -1 for s in bars.symbols], dtype=np.int64)
+        new_bars = len(stamps) - np.searchsorted(stamps, cached_at, side='right')
+        stale = (cached_at < 0) | (new_bars >= self.refresh_bars) | (cached_at > last_stamp)
+
+        hurst = np.array([self.cache[s][0] if s in self.cache else np.nan for s in bars.symbols])
+        pvalue = np.array([self.cache[s][1] if s in self.cache else np.nan for s in bars.symbols])
+        if stale.any():
+            close = bars.close[stale]
+            hurst[stale] = dfa_hurst(close, self.window)
+            pvalue[stale] = adf_pvalue(close, self.window)
+            for row in np.flatnonzero(stale):
+                self.cache[bars.symbols[row]] = (float(hurst[row]), float(pvalue[row]), last_stamp)
+            new_bars = np.where(stale, 0, new_bars)
+
+        return pd.DataFrame({
+            'symbol': bars.symbols,
+            'hurst': hurst,
+            'adf_pvalue': pvalue,
+            'new_bars': new_bars,
+            'refreshed': stale,
+        })
+
+    def screen(self, bars) -> pd.DataFrame:
+        """
+        Universe screen: Hurst < 0.50, ADF p < 0.05 and average daily volume > 1M
+
+        Args:
+            bars: Bars of the screening timeframe (daily volume sums are the
+                same on any intraday timeframe)
+
+        Returns:
+            statistics() plus avg_volume and passed
+        """
+        result = self.statistics(bars)
+        result['avg_volume'] = average_daily_volume(bars.timestamps, bars.volume)
+        result['passed'] = ((result['hurst'] < MAX_HURST) & (result['adf_pvalue'] < MAX_ADF_PVALUE)
+                            & (result['avg_volume'] > MIN_AVG_VOLUME))
+        return result
+
+    def save(self, path: Path) -> None:
+        """Write the cache as JSON"""
+        Path(path).write_text(json.dumps({'window': self.window, 'stats': self.cache}))
+
+    def load(self, path: Path) -> None:
+        """Read a cache written by save(); ignored if missing or for another window"""
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return
+        if data.get('window') == self.window:
+            self.cache = {symbol: tuple(entry) for symbol, entry in data['stats'].items()}
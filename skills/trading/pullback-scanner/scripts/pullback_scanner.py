@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Pullback Scanner
+Universe-wide scoring of the pullback-scanner skill, kept current bar by bar
+
+Part of astoreyai/claude-skills trading/pullback-scanner skill
+
+Base 1-minute bars for the whole universe go into a
+portfolio_core.bars.ResampleCache, which builds the 5m / 15m / 1h bars
+once and extends them as new minutes arrive; every indicator reads the
+same cached timeframes.
+
+Each timeframe keeps running indicator state for all symbols as arrays
+(the streaming classes of portfolio_core.indicators). The state is warmed up
+once from history, and then each completed bar updates it in O(1) per
+symbol instead of recomputing the look-back. Indicators use completed
+bars only: the last bar of a timeframe counts once the next one starts.
+
+scan() evaluates the trend gate (1h), the eight weighted conditions
+(15m pullback, support and volume; MTF alignment across all three), the
+5m entry triggers and the trade plan for every symbol at once. Setups
+are scored for longs: pullbacks inside uptrends, as in the skill.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from portfolio_core.bars import FIELDS, NS_PER_DAY, Bars, ResampleCache, load_bars_dir
+from portfolio_core.indicators import ADX, ATR, EMA, RSI, SMA
+
+TIMEFRAMES = {'5m': 5, '15m': 15, '1h': 60}
+TREND_TIMEFRAME = '1h'
+PULLBACK_TIMEFRAME = '15m'
+TRIGGER_TIMEFRAME = '5m'
+
+# Completed bars replayed per timeframe to warm up indicator state
+WARMUP_BARS = 400
+
+# Trend gate (1h)
+MIN_TREND_SCORE = 0.75
+MIN_ADX = 20
+HIGHER_LOWS_LOOKBACK = 60
+SWING_WINGS = 2
+
+# Pullback conditions (15m)
+PULLBACK_WINDOW = 30
+PULLBACK_DEPTH = (0.236, 0.618)
+RSI_COOLING = (35, 50)
+MAX_VOLUME_RATIO = 0.70
+DELTA_BARS = 5
+SUPPORT_TOLERANCE = 0.003
+MIN_SUPPORT_SCORE = 0.40
+PROFILE_BINS = 20
+MIN_ALIGNMENT = 0.50
+
+# Trade plan
+STRUCTURE_ATR_BUFFER = 0.30
+MAX_STOP_ATR = 2.0
+EXTENSION = 1.618
+
+CONDITION_WEIGHTS = {
+    'trend_confirmed': 0.18,
+    'ma_stack_intact': 0.10,
+    'pullback_depth': 0.14,
+    'rsi_cooling': 0.10,
+    'volume_declining': 0.10,
+    'delta_stabilized': 0.14,
+    'support_confluence': 0.12,
+    'mtf_alignment': 0.12,
+}
+
+SUPPORT_WEIGHTS = {
+    'near_ema_20': 0.25,
+    'near_fib_382': 0.20,
+    'near_prior_swing': 0.25,
+    'near_vwap': 0.15,
+    'volume_profile_poc': 0.15,
+}
+
+
+class _TimeframeState:
+    """Indicator state for one timeframe, all symbols"""
+    __slots__ = ('ema_9', 'ema_20', 'ema_50', 'sma_50', 'sma_200', 'rsi', 'atr', 'adx',
+                 'previous_rsi', 'previous_ema_9', 'bars')
+
+    def __init__(self, symbols: int):
+        self.ema_9 = EMA(symbols, 9)
+        self.ema_20 = EMA(symbols, 20)
+        self.ema_50 = EMA(symbols, 50)
+        self.sma_50 = SMA(symbols, 50)
+        self.sma_200 = SMA(symbols, 200)
+        self.rsi = RSI(symbols)
+        self.atr = ATR(symbols)
+        self.adx = ADX(symbols)
+        self.previous_rsi = np.full(symbols, np.nan)
+        self.previous_ema_9 = np.full(symbols, np.nan)
+        self.bars = 0
+
+    def update(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        self.previous_rsi = self.rsi.value
+        self.previous_ema_9 = self.ema_9.value
+        for average in (self.ema_9, self.ema_20, self.ema_50, self.sma_50, self.sma_200):
+            average.update(close)
+        self.rsi.update(close)
+        self.atr.update(high, low, close)
+        self.adx.update(high, low, close)
+        self.bars += 1
+
+
+def _last_pivots(low: np.ndarray, count: int, wings: int = SWING_WINGS) -> List[np.ndarray]:
+    """The `count` most recent confirmed pivot lows per row, newest first (NaN when fewer)"""
+    span = 2 * wings + 1
+    rows = np.arange(len(low))
+    if low.shape[1] < span:
+        return [np.full(len(low), np.nan) for _ in range(count)]
+    windows = np.lib.stride_tricks.sliding_window_view(low, span, axis=1)
+    centre = windows[..., wings]
+    mask = centre <= windows.min(axis=-1)
+
+    pivots = []
+    for _ in range(count):
+        last = mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+        found = mask[rows, last]
+        pivots.append(np.where(found, centre[rows, last], np.nan))
+        mask[rows[found], last[found]] = False
+    return pivots
+
+
+def _volume_poc(typical: np.ndarray, volume: np.ndarray, bins: int = PROFILE_BINS) -> np.ndarray:
+    """Volume-profile point of control: centre of the price bin with most volume, per row"""
+    low = np.nanmin(typical, axis=1, keepdims=True)
+    high = np.nanmax(typical, axis=1, keepdims=True)
+    width = np.where(high > low, (high - low) / bins, 1.0)
+    index = np.clip(np.nan_to_num((typical - low) / width), 0, bins - 1).astype(np.int64)
+    profile = np.zeros((len(typical), bins))
+    np.add.at(profile, (np.repeat(np.arange(len(typical)), typical.shape[1]), index.ravel()),
+              np.nan_to_num(volume).ravel())
+    return low[:, 0] + (profile.argmax(axis=1) + 0.5) * width[:, 0]
+
+
+def _near(price: np.ndarray, level: np.ndarray, tolerance: float = SUPPORT_TOLERANCE) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return np.abs(price / level - 1) <= tolerance
+
+
+def score_conditions(conditions: Dict[str, np.ndarray]) -> np.ndarray:
+    """Confluence score: weighted sum of the condition flags"""
+    return sum(weight * np.asarray(conditions[name], dtype=float) for name, weight in CONDITION_WEIGHTS.items())
+
+
+class PullbackScanner:
+    """Pullback setups for a universe, with indicator state kept current bar by bar"""
+
+    def __init__(self, base: Bars, warmup_bars: int = WARMUP_BARS):
+        """
+        Args:
+            base: 1-minute (or other base) bars for the universe
+            warmup_bars: Completed bars per timeframe replayed into the indicator state
+        """
+        self.symbols = base.symbols
+        self.cache = ResampleCache(base)
+        self.states: Dict[str, _TimeframeState] = {}
+        for name, minutes in TIMEFRAMES.items():
+            frame = self.cache.get(minutes).tail(warmup_bars + 1)
+            state = _TimeframeState(len(self.symbols))
+            for column in range(len(frame.timestamps) - 1):
+                state.update(frame.open[:, column], frame.high[:, column],
+                             frame.low[:, column], frame.close[:, column])
+            self.states[name] = state
+
+    def update(self, timestamp, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+               close: np.ndarray, volume: np.ndarray) -> List[str]:
+        """
+        Add one base bar for every symbol
+
+        Returns:
+            Timeframes whose indicator state advanced (a bar completed)
+        """
+        names = {minutes: name for name, minutes in TIMEFRAMES.items()}
+        advanced = []
+        for minutes in self.cache.append(timestamp, open_, high, low, close, volume):
+            frame = self.cache.get(minutes)
+            self.states[names[minutes]].update(frame.open[:, -2], frame.high[:, -2],
+                                               frame.low[:, -2], frame.close[:, -2])
+            advanced.append(names[minutes])
+        return advanced
+
+    def _completed(self, name: str, bars: int) -> Bars:
+        """Last `bars` completed bars of a timeframe"""
+        frame = self.cache.get(TIMEFRAMES[name])
+        end = len(frame.timestamps) - 1
+        keep = slice(max(0, end - bars), end)
+        return Bars(frame.symbols, frame.timestamps[keep], *(getattr(frame, field)[:, keep] for field in FIELDS))
+
+    def _trend(self, price: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Trend score, MA stack and uptrend flag on the trend timeframe"""
+        state = self.states[TREND_TIMEFRAME]
+        ema_20, ema_50 = state.ema_20.value, state.ema_50.value
+        sma_50, sma_200 = state.sma_50.value, state.sma_200.value
+
+        newest, middle, oldest = _last_pivots(self._completed(TREND_TIMEFRAME, HIGHER_LOWS_LOOKBACK).low, 3)
+        higher_lows = (newest > middle).astype(int) + ((newest > middle) & (middle > oldest))
+
+        trend_score = (0.25 * (price > sma_50) + 0.30 * (sma_50 > sma_200)
+                       + 0.20 * ((state.adx.value > MIN_ADX) | (state.rsi.value > 50))
+                       + 0.25 * (higher_lows >= 2))
+        ma_stack = (price > ema_20).astype(int) + (ema_20 > sma_50) + (sma_50 > sma_200)
+        return trend_score, ma_stack, ema_20 > ema_50
+
+    def scan(self) -> pd.DataFrame:
+        """
+        Score every symbol
+
+        Returns:
+            One row per symbol, sorted by confluence_score: trend gate, the
+            eight condition flags, pullback / support measures, the 5m
+            trigger and the trade plan (entry, stop, targets, risk_reward)
+        """
+        # Latest price: close of the forming trigger bar (gaps forward-filled)
+        price = self.cache.get(TIMEFRAMES[TRIGGER_TIMEFRAME]).close[:, -1]
+        rows = np.arange(len(self.symbols))
+
+        trend_score, ma_stack, uptrend = self._trend(price)
+
+        # Pullback leg on the 15m closes: swing low -> swing high -> now
+        pullback = self._completed(PULLBACK_TIMEFRAME, PULLBACK_WINDOW)
+        state = self.states[PULLBACK_TIMEFRAME]
+        closes = np.where(np.isnan(pullback.close), -np.inf, pullback.close)
+        high_index = closes.argmax(axis=1)
+        swing_high = pullback.close[rows, high_index]
+        bar = np.arange(pullback.close.shape[1])
+        before_high = bar <= high_index[:, None]
+        low_index = np.where(before_high, np.nan_to_num(pullback.close, nan=np.inf), np.inf).argmin(axis=1)
+        swing_low = pullback.close[rows, low_index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            depth = (swing_high - price) / (swing_high - swing_low)
+
+        advance = (bar > low_index[:, None]) & before_high
+        retrace = bar > high_index[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = ((np.where(retrace, pullback.volume, 0).sum(axis=1) / retrace.sum(axis=1))
+                            / (np.where(advance, pullback.volume, 0).sum(axis=1) / advance.sum(axis=1)))
+
+        delta = (np.sign(pullback.close - pullback.open) * pullback.volume)[:, -DELTA_BARS:]
+        t = np.arange(delta.shape[1]) - (delta.shape[1] - 1) / 2
+        delta_slope = delta @ t / (t @ t)
+
+        # Support confluence
+        base = self.cache.base
+        stamps = base.timestamps.astype(np.int64)
+        today = slice(np.searchsorted(stamps, stamps[-1] // NS_PER_DAY * NS_PER_DAY), None)
+        typical = (base.high[:, today] + base.low[:, today] + base.close[:, today]) / 3
+        session_volume = np.nan_to_num(base.volume[:, today])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.nansum(typical * session_volume, axis=1) / session_volume.sum(axis=1)
+        fib_382 = swing_high - 0.382 * (swing_high - swing_low)
+        prior_swing = _last_pivots(pullback.low, 1)[0]
+        poc = _volume_poc((pullback.high + pullback.low + pullback.close) / 3, pullback.volume)
+        support = {
+            'near_ema_20': _near(price, state.ema_20.value),
+            'near_fib_382': _near(price, fib_382),
+            'near_prior_swing': _near(price, prior_swing),
+            'near_vwap': _near(price, vwap),
+            'volume_profile_poc': _near(price, poc),
+        }
+        support_score = sum(weight * support[name] for name, weight in SUPPORT_WEIGHTS.items())
+
+        alignment = np.mean([self.states[name].ema_20.value > self.states[name].sma_50.value
+                             for name in TIMEFRAMES], axis=0)
+
+        conditions = {
+            'trend_confirmed': trend_score >= MIN_TREND_SCORE,
+            'ma_stack_intact': ma_stack >= 2,
+            'pullback_depth': (depth >= PULLBACK_DEPTH[0]) & (depth <= PULLBACK_DEPTH[1]),
+            'rsi_cooling': (state.rsi.value >= RSI_COOLING[0]) & (state.rsi.value <= RSI_COOLING[1]),
+            'volume_declining': volume_ratio < MAX_VOLUME_RATIO,
+            'delta_stabilized': delta_slope >= 0,
+            'support_confluence': support_score > MIN_SUPPORT_SCORE,
+            'mtf_alignment': alignment >= MIN_ALIGNMENT,
+        }
+
+        # Entry triggers on the last two completed 5m bars
+        trigger_bars = self._completed(TRIGGER_TIMEFRAME, 2)
+        trigger_state = self.states[TRIGGER_TIMEFRAME]
+        o0, o1 = trigger_bars.open[:, -2], trigger_bars.open[:, -1]
+        c0, c1 = trigger_bars.close[:, -2], trigger_bars.close[:, -1]
+        h1, l1 = trigger_bars.high[:, -1], trigger_bars.low[:, -1]
+        body = np.abs(c1 - o1)
+        triggers = {
+            'bullish_engulfing': (c0 < o0) & (c1 > o1) & (o1 <= c0) & (c1 >= o0),
+            'hammer': (np.minimum(o1, c1) - l1 >= 2 * body) & (h1 - np.maximum(o1, c1) <= body) & (h1 > l1),
+            'rsi_cross_above_30': (trigger_state.previous_rsi < 30) & (trigger_state.rsi.value >= 30),
+            'price_reclaim_ema_9': (c0 < trigger_state.previous_ema_9) & (c1 > trigger_state.ema_9.value),
+            'delta_flip_positive': (np.sign(c0 - o0) < 0) & (np.sign(c1 - o1) > 0),
+        }
+        names = np.array(list(triggers))
+        fired = np.array(list(triggers.values()))
+        trigger = np.where(fired.any(axis=0), names[fired.argmax(axis=0)], None)
+
+        # Trade plan: structure stop under the pullback low, capped at 2 ATR
+        atr = state.atr.value
+        pullback_low = np.fmin(np.where(retrace, pullback.low, np.inf).min(axis=1), price)
+        stop = np.maximum(pullback_low - STRUCTURE_ATR_BUFFER * atr, price - MAX_STOP_ATR * atr)
+        swing_range = swing_high - swing_low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            risk_reward = (swing_high - price) / (price - stop)
+
+        result = pd.DataFrame({
+            'symbol': self.symbols,
+            'direction': np.where(uptrend, 'LONG', None),
+            'confluence_score': score_conditions(conditions),
+            'trend_score': trend_score,
+            'ma_stack': ma_stack,
+            'depth': depth,
+            'rsi': state.rsi.value,
+            'adx': self.states[TREND_TIMEFRAME].adx.value,
+            'volume_ratio': volume_ratio,
+            'support_score': support_score,
+            'alignment': alignment,
+            'trigger': trigger,
+            'entry': price,
+            'stop': stop,
+            'target_1': swing_high,
+            'target_2': pullback_low + swing_range,
+            'target_3': pullback_low + EXTENSION * swing_range,
+            'risk_reward': risk_reward,
+            **conditions,
+        })
+        return result.sort_values('confluence_score', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description='Pullback universe scanner')
+    parser.add_argument('data_dir', help='Directory of <SYMBOL>.csv 1-minute bars (timestamp, open, high, low, close, volume)')
+    parser.add_argument('--symbols', nargs='*', help='Restrict to these symbols')
+    parser.add_argument('--min-confluence', type=float, default=0.70, help='Minimum confluence score to list')
+    parser.add_argument('--top', type=int, default=20, help='Rows to print')
+    parser.add_argument('--all', action='store_true', help='Include symbols failing the trend gate')
+    args = parser.parse_args()
+
+    bars = load_bars_dir(Path(args.data_dir), args.symbols)
+    if not bars.symbols:
+        print(f"No bars found in {args.data_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    result = PullbackScanner(bars).scan()
+    if not args.all:
+        result = result[result['trend_confirmed']]
+    result = result[result['confluence_score'] >= args.min_confluence].head(args.top)
+    columns = ['symbol', 'direction', 'confluence_score', 'trend_score', 'depth', 'rsi',
+               'volume_ratio', 'support_score', 'trigger', 'entry', 'stop', 'target_1', 'risk_reward']
+    print(result[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Tests for portfolio_core.bars resampling and the incremental ResampleCache
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.bars import Bars, ResampleCache, load_bars, resample
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def minute_bars(periods=90, seed=0) -> Bars:
+    """
+    Three symbols of 1-minute bars: AAA trades every minute, BBB skips
+    minutes 20-49 (two whole 15m buckets) and CCC lists at minute 37
+    """
+    rng = np.random.default_rng(seed)
+    grid = pd.date_range('2026-09-01 09:30', periods=periods, freq='1min')
+    frames = {}
+    for symbol, keep in (('AAA', slice(None)), ('BBB', np.r_[0:20, 50:periods]), ('CCC', slice(37, None))):
+        close = 100 + np.cumsum(rng.normal(0, 0.2, periods))
+        frame = pd.DataFrame({'timestamp': grid, 'open': close - 0.05, 'high': close + 0.1,
+                              'low': close - 0.1, 'close': close, 'volume': rng.integers(100, 1000, periods)})
+        frames[symbol] = frame.iloc[keep]
+    return load_bars(frames)
+
+
+def head(bars: Bars, count: int) -> Bars:
+    """First `count` bars"""
+    keep = slice(0, count)
+    return Bars(bars.symbols, bars.timestamps[keep], bars.open[:, keep], bars.high[:, keep],
+                bars.low[:, keep], bars.close[:, keep], bars.volume[:, keep])
+
+
+def assert_same_bars(actual: Bars, expected: Bars):
+    assert actual.symbols == expected.symbols
+    np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+    for field in FIELDS:
+        np.testing.assert_allclose(getattr(actual, field), getattr(expected, field), equal_nan=True, err_msg=field)
+
+
+def test_resample_matches_per_symbol_pandas_on_complete_buckets():
+    bars = minute_bars()
+    frame = resample(bars, 15)
+    row = bars.symbols.index('AAA')
+    reference = pd.DataFrame({field: getattr(bars, field)[row] for field in FIELDS},
+                             index=pd.DatetimeIndex(bars.timestamps)).resample('15min').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    np.testing.assert_array_equal(frame.timestamps, reference.index.to_numpy(dtype='datetime64[ns]'))
+    for field in FIELDS:
+        np.testing.assert_allclose(getattr(frame, field)[row], reference[field].to_numpy(), err_msg=field)
+
+
+def test_resample_fills_gaps_with_previous_close_and_zero_volume():
+    bars = minute_bars()
+    frame = resample(bars, 15)
+    row = bars.symbols.index('BBB')
+    # Buckets 09:45 (minutes 15-29) partly traded, 10:00 (30-44) not at all, 10:15 (45-59) partly
+    assert frame.volume[row, 2] == 0
+    assert frame.close[row, 2] == frame.close[row, 1]
+    assert frame.open[row, 2] == frame.high[row, 2] == frame.low[row, 2] == frame.close[row, 1]
+    # A partly traded bucket aggregates only the bars that exist
+    assert frame.close[row, 1] == bars.close[row, 19]
+    assert frame.open[row, 3] == bars.open[row, 50]
+    assert frame.volume[row, 3] == bars.volume[row, 50:60].sum()
+
+
+def test_resample_keeps_leading_gap_of_late_listing():
+    bars = minute_bars()
+    frame = resample(bars, 15)
+    row = bars.symbols.index('CCC')
+    # Listed at minute 37: nothing to carry forward before that
+    for field in ('open', 'high', 'low', 'close'):
+        assert np.isnan(getattr(frame, field)[row, :2]).all()
+        assert not np.isnan(getattr(frame, field)[row, 2:]).any()
+    assert frame.volume[row, :2].tolist() == [0, 0]
+    assert frame.open[row, 2] == bars.open[row, 37]
+    assert frame.volume[row, 2] == bars.volume[row, 37:45].sum()
+
+
+@pytest.mark.parametrize('loaded', [1, 20, 37, 44, 45])
+def test_cache_append_matches_full_resample(loaded):
+    full = minute_bars()
+    cache = ResampleCache(head(full, loaded))
+    for minutes in (5, 15, 60):
+        cache.get(minutes)
+
+    for bar in range(loaded, len(full.timestamps)):
+        cache.append(full.timestamps[bar], *(getattr(full, field)[:, bar] for field in FIELDS))
+
+    assert_same_bars(cache.base, full)
+    for minutes in (5, 15, 60):
+        assert_same_bars(cache.get(minutes), resample(full, minutes))
+
+
+def test_append_reports_closed_timeframes():
+    full = minute_bars(periods=31)
+    cache = ResampleCache(head(full, 29))
+    cache.get(15)
+    cache.get(5)
+    closed = [cache.append(full.timestamps[bar], *(getattr(full, field)[:, bar] for field in FIELDS))
+              for bar in (29, 30)]
+    # 09:59 still belongs to the 09:45 bucket; 10:00 closes both the 5m and the 15m bar
+    assert closed[0] == []
+    assert sorted(closed[1]) == [5, 15]
@@ -0,0 +1,61 @@
+"""
+Tests for portfolio_core.config
+"""
+
+import copy
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.config import load_portfolio_config, resolve_config
+
+RAW = {
+    'account': {'initial_capital': 2000, 'monthly_deposits': 500},
+    'trading': {
+        'win_rate': {'actual': 90.0},
+        'return_per_trade': {'all_time_avg': 3.58},
+        'loss_parameters': {'avg_loser_pct': -5.0},
+        'trade_frequency': {'trades_per_month': {'baseline': 18.5, 'aggressive': 25}},
+    },
+    'tax': {'quarterly_extraction_pct': 30},
+}
+
+
+def test_resolves_percentages_and_scenario_fallback():
+    config = resolve_config(RAW)
+    assert config.trading.win_rate == pytest.approx(0.90)
+    assert config.tax.quarterly_extraction_rate == pytest.approx(0.30)
+    assert config.trading.trades_per_month('aggressive') == 25
+    assert config.trading.trades_per_month('conservative') == 18.5
+    with pytest.raises(KeyError, match='tax.state_ny.combined_rate'):
+        config.tax.state_rate('NY')
+    assert config.tax.state_rate('FL') == 0.0
+
+
+@pytest.mark.parametrize('keys', [
+    ('account', 'initial_capital'),
+    ('account', 'monthly_deposits'),
+    ('trading', 'win_rate', 'actual'),
+    ('trading', 'return_per_trade'),
+    ('trading', 'loss_parameters', 'avg_loser_pct'),
+    ('trading', 'trade_frequency', 'trades_per_month', 'baseline'),
+    ('tax',),
+])
+def test_missing_required_key_is_named(keys):
+    raw = copy.deepcopy(RAW)
+    node = raw
+    for key in keys[:-1]:
+        node = node[key]
+    del node[keys[-1]]
+    with pytest.raises(KeyError, match=r'\.'.join(keys)):
+        resolve_config(raw)
+
+
+def test_missing_key_fails_at_load_time(tmp_path):
+    path = tmp_path / 'portfolio.yaml'
+    path.write_text("account:\n  initial_capital: 2000\n")
+    with pytest.raises(KeyError, match=f'missing from config {re.escape(str(path))}'):
+        load_portfolio_config(str(path), use_disk_cache=False)
@@ -0,0 +1,40 @@
+"""
+Tests for portfolio_core.ib_statement caching
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core import ib_statement
+from portfolio_core.ib_statement import parse_statement
+
+STATEMENT = """\
+Account Information,Header,Field Name,Field Value
+Account Information,Data,Account,U1234567
+Deposits & Withdrawals,Header,Currency,Settle Date,Description,Amount
+Deposits & Withdrawals,Data,USD,2026-09-02,Electronic Fund Transfer,5000
+"""
+
+
+def test_identical_files_get_their_own_statements(tmp_path):
+    first_path, second_path = tmp_path / 'first.csv', tmp_path / 'second.csv'
+    first_path.write_text(STATEMENT)
+    second_path.write_text(STATEMENT)
+
+    first = parse_statement(str(first_path), cache_dir=None)
+    second = parse_statement(str(second_path), cache_dir=None)
+    assert (first.path, second.path) == (str(first_path), str(second_path))
+    assert first.sha256 == second.sha256
+
+    first.sections[ib_statement.DEPOSITS].loc[:, 'amount'] = -1.0
+    assert second.deposits['amount'].tolist() == [5000.0]
+    assert parse_statement(str(first_path), cache_dir=None).deposits['amount'].tolist() == [5000.0]
+
+
+def test_memory_cache_is_bounded(tmp_path):
+    for i in range(ib_statement.MEMORY_CACHE_SIZE + 3):
+        path = tmp_path / f'statement_{i}.csv'
+        path.write_text(STATEMENT.replace('U1234567', f'U{i:07d}'))
+        assert parse_statement(str(path), cache_dir=None).account_info['Account'] == f'U{i:07d}'
+    assert len(ib_statement._memory_cache) == ib_statement.MEMORY_CACHE_SIZE
@@ -0,0 +1,152 @@
+"""
+Parity tests for portfolio_core.indicators
+
+Every streaming indicator, fed one bar at a time, must reproduce its batch
+function; the batch functions are checked against straightforward
+per-symbol reference implementations.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core import indicators
+
+SYMBOLS = 6
+BARS = 300
+LEADING_NAN = 40  # symbol 1 lists late
+
+
+@pytest.fixture(scope='module')
+def bars():
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (SYMBOLS, BARS)), axis=1))
+    open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, close.shape))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, close.shape))
+    volume = rng.integers(100, 10_000, close.shape).astype(float)
+    for series in (high, low, close, volume):
+        series[1, :LEADING_NAN] = np.nan
+    timestamps = pd.date_range('2026-09-01 09:30', periods=BARS, freq='15min').to_numpy()
+    return {'high': high, 'low': low, 'close': close, 'volume': volume, 'timestamps': timestamps}
+
+
+def stream(indicator, *series):
+    """Values after each bar from a streaming indicator"""
+    out = []
+    for t in range(series[0].shape[1]):
+        value = indicator.update(*(x[:, t] for x in series))
+        out.append(np.array(value, copy=True))
+    return np.stack(out, axis=-1)
+
+
+def wilder_reference(values, period):
+    out = np.full(len(values), np.nan)
+    start = np.flatnonzero(~np.isnan(values))[0]
+    if len(values) - start < period:
+        return out
+    average = values[start:start + period].mean()
+    out[start + period - 1] = average
+    for t in range(start + period, len(values)):
+        average = (average * (period - 1) + values[t]) / period
+        out[t] = average
+    return out
+
+
+def test_sma_parity(bars):
+    close = bars['close']
+    batch = indicators.sma(close, 20)
+    np.testing.assert_allclose(stream(indicators.SMA(SYMBOLS, 20), close), batch, rtol=1e-12)
+    expected = pd.DataFrame(close.T).rolling(20).mean().to_numpy().T
+    np.testing.assert_allclose(batch, expected, rtol=1e-12)
+
+
+def test_ema_parity(bars):
+    close = bars['close']
+    batch = indicators.ema(close, 20)
+    np.testing.assert_array_equal(stream(indicators.EMA(SYMBOLS, 20), close), batch)
+    row = close[0]
+    value = row[:20].mean()
+    for x in row[20:]:
+        value += 2 / 21 * (x - value)
+    assert batch[0, -1] == pytest.approx(value, rel=1e-12)
+    assert np.isnan(batch[1, LEADING_NAN + 18]) and not np.isnan(batch[1, LEADING_NAN + 19])
+
+
+def test_rsi_parity(bars):
+    close = bars['close']
+    batch = indicators.rsi(close)
+    np.testing.assert_array_equal(stream(indicators.RSI(SYMBOLS), close), batch)
+    for row in (0, 1):
+        change = np.diff(close[row])
+        gain = wilder_reference(np.maximum(change, 0), 14)
+        loss = wilder_reference(np.maximum(-change, 0), 14)
+        np.testing.assert_allclose(batch[row, 1:], 100 - 100 / (1 + gain / loss), rtol=1e-12)
+
+
+def test_atr_parity(bars):
+    high, low, close = bars['high'], bars['low'], bars['close']
+    batch = indicators.atr(high, low, close)
+    np.testing.assert_array_equal(stream(indicators.ATR(SYMBOLS), high, low, close), batch)
+    np.testing.assert_allclose(indicators.atr_last(high, low, close), batch[:, -1], rtol=1e-12)
+    previous = np.r_[np.nan, close[0, :-1]]
+    true_range = np.fmax(high[0] - low[0], np.fmax(np.abs(high[0] - previous), np.abs(low[0] - previous)))
+    np.testing.assert_allclose(batch[0], wilder_reference(true_range, 14), rtol=1e-12)
+
+
+def test_atr_last_short_history(bars):
+    high, low, close = (bars[k][:, -10:] for k in ('high', 'low', 'close'))
+    assert np.isnan(indicators.atr_last(high, low, close)).all()
+
+
+def test_adx_parity(bars):
+    high, low, close = bars['high'], bars['low'], bars['close']
+    batch = indicators.adx(high, low, close)
+    np.testing.assert_array_equal(stream(indicators.ADX(SYMBOLS), high, low, close), batch)
+
+    h, l = high[0], low[0]
+    up, down = np.diff(h), -np.diff(l)
+    plus = wilder_reference(np.where((up > down) & (up > 0), up, 0.0), 14)
+    minus = wilder_reference(np.where((down > up) & (down > 0), down, 0.0), 14)
+    # DI+ and DI- share the smoothed true range, which cancels out of DX
+    dx = 100 * np.abs(plus - minus) / (plus + minus)
+    np.testing.assert_allclose(batch[0, 1:], wilder_reference(dx, 14), rtol=1e-10)
+    assert 0 <= np.nanmin(batch) and np.nanmax(batch) <= 100
+
+
+def test_stochastic_parity(bars):
+    high, low, close = bars['high'], bars['low'], bars['close']
+    k, d = indicators.stochastic(high, low, close)
+    streaming = indicators.Stochastic(SYMBOLS)
+    values = [streaming.update(high[:, t], low[:, t], close[:, t]) for t in range(BARS)]
+    np.testing.assert_allclose(np.stack([v[0] for v in values], axis=1), k, rtol=1e-12)
+    np.testing.assert_allclose(np.stack([v[1] for v in values], axis=1), d, rtol=1e-12)
+
+    frame = pd.DataFrame({'high': high[0], 'low': low[0], 'close': close[0]})
+    lowest, highest = frame['low'].rolling(14).min(), frame['high'].rolling(14).max()
+    expected_k = 100 * (frame['close'] - lowest) / (highest - lowest)
+    np.testing.assert_allclose(k[0], expected_k, rtol=1e-12)
+    np.testing.assert_allclose(d[0], expected_k.rolling(3).mean(), rtol=1e-12)
+
+
+def test_vwap_parity(bars):
+    high, low, close, volume = bars['high'], bars['low'], bars['close'], bars['volume']
+    timestamps = bars['timestamps']
+    value, std = indicators.vwap(high, low, close, volume, timestamps)
+
+    streaming = indicators.VWAP(SYMBOLS)
+    day = timestamps.astype('datetime64[D]').astype(np.int64)
+    for t in range(BARS):
+        streaming.update(high[:, t], low[:, t], close[:, t], volume[:, t], int(day[t]))
+        np.testing.assert_allclose(streaming.value, value[:, t], rtol=1e-12)
+        np.testing.assert_allclose(streaming.std, std[:, t], rtol=1e-12)
+
+    frame = pd.DataFrame({'typical': (high[0] + low[0] + close[0]) / 3, 'volume': volume[0], 'day': day})
+    frame['pv'] = frame['typical'] * frame['volume']
+    grouped = frame.groupby('day')
+    expected = grouped['pv'].cumsum() / grouped['volume'].cumsum()
+    np.testing.assert_allclose(value[0], expected, rtol=1e-12)
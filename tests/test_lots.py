@@ -0,0 +1,137 @@
+"""
+Tests for portfolio_core.lots round-trip matching
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.lots import LotMatcher, match_executions
+
+
+def executions(*rows) -> pd.DataFrame:
+    """(datetime, symbol, quantity, price[, code]) rows"""
+    rows = [row + ('',) * (5 - len(row)) for row in rows]
+    frame = pd.DataFrame(rows, columns=['datetime', 'symbol', 'quantity', 'price', 'code'])
+    frame['datetime'] = pd.to_datetime(frame['datetime'])
+    return frame
+
+
+def summary(trades):
+    return [(t.symbol, t.side, t.quantity, t.entry_price, t.exit_price) for t in trades]
+
+
+# Three buys at different prices, then one partial and one full sell
+SCALE_IN = executions(
+    ('2026-03-02 10:00', 'AAA', 100, 10.0),
+    ('2026-03-02 11:00', 'AAA', 100, 12.0),
+    ('2026-03-02 12:00', 'AAA', 100, 11.0),
+    ('2026-03-02 14:00', 'AAA', -150, 13.0),
+)
+
+
+@pytest.mark.parametrize('method, closed, still_open', [
+    ('fifo', [('AAA', 'long', 100, 10.0, 13.0), ('AAA', 'long', 50, 12.0, 13.0)], [(11.0, 100), (12.0, 50)]),
+    ('lifo', [('AAA', 'long', 100, 11.0, 13.0), ('AAA', 'long', 50, 12.0, 13.0)], [(10.0, 100), (12.0, 50)]),
+    ('hifo', [('AAA', 'long', 100, 12.0, 13.0), ('AAA', 'long', 50, 11.0, 13.0)], [(10.0, 100), (11.0, 50)]),
+])
+def test_methods_pick_different_lots(method, closed, still_open):
+    matcher = match_executions(SCALE_IN, method=method)
+    assert summary(matcher.trades) == closed
+    assert sorted((lot.price, lot.quantity) for lot in matcher.open_lots()) == still_open
+
+
+def test_specific_lot_selector():
+    # Always close the cheapest lot first (lowest-cost relief)
+    def cheapest(lots, symbol, timestamp, quantity):
+        return min(range(len(lots)), key=lambda i: lots[i].price)
+
+    matcher = match_executions(SCALE_IN, method='specific', lot_selector=cheapest)
+    assert summary(matcher.trades) == [('AAA', 'long', 100, 10.0, 13.0), ('AAA', 'long', 50, 11.0, 13.0)]
+    assert sorted((lot.price, lot.quantity) for lot in matcher.open_lots()) == [(11.0, 50), (12.0, 100)]
+
+
+def test_specific_requires_selector_and_methods_are_checked():
+    with pytest.raises(ValueError):
+        LotMatcher('specific')
+    with pytest.raises(ValueError):
+        LotMatcher('average')
+
+
+def test_partial_fills_close_pro_rata():
+    matcher = match_executions(executions(
+        ('2026-03-02 10:00', 'AAA', 100, 10.0),
+        ('2026-03-02 10:30', 'AAA', -30, 11.0),
+        ('2026-03-02 10:31', 'AAA', -30, 11.5),
+        ('2026-03-03 10:00', 'AAA', -40, 9.0),
+    ))
+    trades = matcher.trades
+    assert [t.quantity for t in trades] == [30, 30, 40]
+    assert [t.realized_pnl for t in trades] == pytest.approx([30.0, 45.0, -40.0])
+    assert [t.category for t in trades] == ['intraday', 'intraday', 'swing']
+    assert matcher.open_lots() == []
+
+
+def test_commissions_are_split_per_share():
+    matcher = LotMatcher()
+    matcher.add('AAA', datetime(2026, 3, 2, 10), 100, 10.0, commission=-2.0)
+    closed = matcher.add('AAA', datetime(2026, 3, 2, 11), -50, 11.0, commission=-1.0)
+    # Half of the opening commission plus the whole closing one
+    assert closed[0].commission == pytest.approx(2.0)
+    assert closed[0].realized_pnl == pytest.approx(50.0 - 2.0)
+
+
+def test_short_round_trip():
+    matcher = match_executions(executions(
+        ('2026-03-02 10:00', 'AAA', -100, 20.0),
+        ('2026-03-02 15:00', 'AAA', 100, 19.0),
+    ))
+    (trade,) = matcher.trades
+    assert trade.side == 'short'
+    assert trade.realized_pnl == pytest.approx(100.0)
+    assert trade.return_pct == pytest.approx(5.0)
+
+
+def test_position_flip_closes_then_opens_remainder():
+    matcher = match_executions(executions(
+        ('2026-03-02 10:00', 'AAA', 100, 10.0),
+        ('2026-03-02 11:00', 'AAA', -150, 11.0),   # closes 100 long, opens 50 short
+        ('2026-03-02 12:00', 'AAA', 50, 10.5),
+    ))
+    assert summary(matcher.trades) == [('AAA', 'long', 100, 10.0, 11.0), ('AAA', 'short', 50, 11.0, 10.5)]
+    assert [t.realized_pnl for t in matcher.trades] == pytest.approx([100.0, 25.0])
+    assert matcher.open_lots() == []
+
+
+def test_unmatched_closing_execution_is_recorded():
+    matcher = match_executions(executions(
+        ('2026-03-02 10:00', 'AAA', -100, 10.0, 'C'),   # opened before the statement
+        ('2026-03-02 11:00', 'BBB', -100, 10.0, 'C;O'),  # a genuine opening short
+    ))
+    assert matcher.trades == []
+    assert [(u['symbol'], u['quantity']) for u in matcher.unmatched] == [('AAA', -100)]
+    assert [(lot.symbol, lot.side) for lot in matcher.open_lots()] == [('BBB', 'short')]
+
+
+def test_closing_execution_larger_than_position():
+    matcher = match_executions(executions(
+        ('2026-03-02 10:00', 'AAA', 60, 10.0),
+        ('2026-03-02 11:00', 'AAA', -100, 11.0, 'C'),
+    ))
+    assert [t.quantity for t in matcher.trades] == [60]
+    assert [u['quantity'] for u in matcher.unmatched] == [-40]
+    assert matcher.open_lots() == []
+
+
+def test_symbols_are_matched_independently():
+    matcher = match_executions(executions(
+        ('2026-03-02 10:00', 'AAA', 100, 10.0),
+        ('2026-03-02 10:00', 'BBB', -100, 50.0),
+        ('2026-03-02 11:00', 'BBB', 100, 49.0),
+        ('2026-03-02 12:00', 'AAA', -100, 10.5),
+    ))
+    assert summary(matcher.trades) == [('BBB', 'short', 100, 50.0, 49.0), ('AAA', 'long', 100, 10.0, 10.5)]
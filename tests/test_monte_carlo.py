@@ -0,0 +1,70 @@
+"""
+Tests for the forecasting-agent Monte Carlo engine
+
+The vectorized engine must agree with the per-trade reference loop, and
+seeded runs must not depend on how they are sharded across workers.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'forecasting-agent'))
+from monte_carlo import DEFAULT_CHUNK_SIZE, MonteCarloParams, run_simulation
+
+
+def make_params(**overrides) -> MonteCarloParams:
+    values = dict(paths=2000, months=24, trades_per_month=20, win_probability=0.55,
+                  avg_winner_pct=0.02, avg_loser_pct=-0.015, monthly_deposits=500,
+                  initial_capital=10_000)
+    values.update(overrides)
+    return MonteCarloParams(**values)
+
+
+@pytest.mark.parametrize('win_probability', [0.0, 1.0])
+def test_vectorized_matches_reference_when_deterministic(win_probability):
+    params = make_params(paths=50, win_probability=win_probability)
+    vectorized = run_simulation(params, method='vectorized', seed=3, keep_paths=True)
+    reference = run_simulation(params, method='reference', seed=4, keep_paths=True)
+    # Every path is identical; log-space compounding only adds rounding
+    np.testing.assert_allclose(vectorized['all_paths'], reference['all_paths'], rtol=1e-10)
+    for key, value in reference['final_balance'].items():
+        assert vectorized['final_balance'][key] == pytest.approx(value, rel=1e-10, abs=1e-6)
+
+
+def test_vectorized_matches_reference_distribution():
+    params = make_params(paths=4000, months=12, trades_per_month=10)
+    vectorized = run_simulation(params, method='vectorized', seed=11)['final_balance']
+    reference = run_simulation(params, method='reference', seed=12)['final_balance']
+
+    # Two independent samples: difference of means within 4 standard errors
+    standard_error = np.sqrt((vectorized['std'] ** 2 + reference['std'] ** 2) / params.paths)
+    assert abs(vectorized['mean'] - reference['mean']) < 4 * standard_error
+    assert vectorized['std'] == pytest.approx(reference['std'], rel=0.1)
+    for key in ('percentile_5', 'percentile_25', 'median', 'percentile_75', 'percentile_95'):
+        assert vectorized[key] == pytest.approx(reference[key], rel=0.05), key
+
+
+def without_workers(results):
+    return {key: value for key, value in results.items() if key != 'workers'}
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_in_memory_results_do_not_depend_on_workers(workers):
+    # More than two default chunks, so the pool really shards the run
+    params = make_params(paths=2 * DEFAULT_CHUNK_SIZE + 1000, months=6)
+    serial = run_simulation(params, seed=1, keep_paths=True)
+    sharded = run_simulation(params, seed=1, keep_paths=True, workers=workers)
+    assert sharded['chunk_size'] is None
+    assert without_workers(sharded) == without_workers(serial)
+
+
+def test_streaming_results_do_not_depend_on_workers():
+    params = make_params(paths=5000)
+    serial = run_simulation(params, seed=7, chunk_size=700)
+    sharded = run_simulation(params, seed=7, chunk_size=700, workers=3)
+    assert without_workers(sharded) == without_workers(serial)
+    np.testing.assert_allclose(serial['final_balance']['mean'],
+                               run_simulation(params, seed=7)['final_balance']['mean'], rtol=0.05)
@@ -0,0 +1,131 @@
+"""
+Tests for the concentrated-risk pre-trade validator
+
+Stops, sizing and checks come from one batched code path; the single-order
+report must agree with the watchlist row for the same order.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'trading' / 'concentrated-risk' / 'scripts'))
+from pretrade_validator import (ATR_STOP_MULTIPLE, STRUCTURE_BUFFER, AccountState, MarketState, Order, Signal,
+                                validate_batch, validate_order)
+
+
+def flat_bars(close=100.0, spread=0.2, bars=60) -> pd.DataFrame:
+    """Constant bars: ATR equals spread and every bar is a swing pivot"""
+    return pd.DataFrame({'high': np.full(bars, close + spread / 2),
+                         'low': np.full(bars, close - spread / 2),
+                         'close': np.full(bars, close)})
+
+
+def passing_order(symbol='AAA', direction='LONG', entry=100.0) -> Order:
+    """Order whose signal and market inputs pass every checklist item"""
+    target = entry * (1.01 if direction == 'LONG' else 0.99)
+    return Order(symbol=symbol, direction=direction, entry=entry,
+                 signal=Signal(strategy='pullback', confluence=0.9, mtf_alignment=1.0, trend_score=0.8,
+                               depth=0.5, target=target),
+                 market=MarketState(vix=15, vix_change_1d=0.0, regime='trending_bullish', spread=0.0001,
+                                    volume=2_000_000, avg_volume=1_000_000, days_to_earnings=30))
+
+
+def test_percent_stop_when_atr_and_structure_are_wide():
+    report = validate_order(passing_order(), flat_bars(spread=4.0), AccountState(equity=10_000))
+    assert report['risk_summary']['stop_source'] == 'percent'
+    assert report['risk_summary']['stop'] == pytest.approx(99.5)
+
+
+def test_atr_stop_when_tightest():
+    # ATR 0.2 -> 0.15 below entry; swing low 99.9 - buffer is 0.2 below
+    report = validate_order(passing_order(), flat_bars(spread=0.2), AccountState(equity=10_000))
+    assert report['risk_summary']['stop_source'] == 'atr'
+    assert report['risk_summary']['stop'] == pytest.approx(100 - 0.2 * ATR_STOP_MULTIPLE)
+    assert report['result'] == 'APPROVED'
+
+
+def test_structure_stop_when_tightest():
+    # ATR 0.4 -> 0.3 below entry; swing low 99.8 - buffer is 0.25 below 99.95
+    report = validate_order(passing_order(entry=99.95), flat_bars(spread=0.4), AccountState(equity=10_000))
+    assert report['risk_summary']['stop_source'] == 'structure'
+    assert report['risk_summary']['stop'] == pytest.approx(99.8 - STRUCTURE_BUFFER)
+
+
+def test_short_stops_sit_above_entry():
+    report = validate_order(passing_order(direction='SHORT', entry=99.95), flat_bars(spread=0.2),
+                            AccountState(equity=10_000))
+    # Swing high 100.1 + buffer is further than the 0.15 ATR stop
+    assert report['risk_summary']['stop_source'] == 'atr'
+    assert report['risk_summary']['stop'] == pytest.approx(99.95 + 0.2 * ATR_STOP_MULTIPLE)
+
+
+def test_percent_stop_without_atr_history():
+    report = validate_order(passing_order(), flat_bars(bars=3), AccountState(equity=10_000))
+    # The percent stop is always available
+    assert report['risk_summary']['stop_source'] == 'percent'
+    assert report['risk_summary']['atr'] is None
+
+
+@pytest.mark.parametrize('account, mode, position_pct, max_trades', [
+    (AccountState(equity=10_000), 'normal', 0.95, 3),
+    (AccountState(equity=10_000, weekly_pnl=-0.06), 'recovery_weekly', 0.75, 2),
+    (AccountState(equity=10_000, weekly_pnl=-0.06, monthly_pnl=-0.11), 'recovery_monthly', 0.50, 1),
+])
+def test_recovery_limits(account, mode, position_pct, max_trades):
+    report = validate_order(passing_order(), flat_bars(spread=4.0), account)
+    assert report['mode'] == mode
+    assert report['position_pct'] == position_pct
+    assert report['risk_summary']['shares'] == int(10_000 * position_pct // 100)
+    names = [check['name'] for check in report['checks']]
+    assert f"Daily trades < {max_trades}" in names
+
+
+def test_recovery_mode_tightens_stop_and_trade_count():
+    account = AccountState(equity=10_000, weekly_pnl=-0.06, monthly_pnl=-0.11, daily_trades=1)
+    report = validate_order(passing_order(), flat_bars(spread=4.0), account)
+    assert report['risk_summary']['stop'] == pytest.approx(99.7)
+    failed = {check['name'] for check in report['checks'] if check['status'] == 'FAIL'}
+    assert "Daily trades < 1" in failed
+    assert report['result'] == 'REJECTED'
+
+
+def test_batch_matches_single_orders():
+    bars = {'AAA': flat_bars(spread=0.2), 'BBB': flat_bars(close=50.0, spread=4.0), 'CCC': flat_bars(spread=0.4)}
+    orders = [
+        passing_order('AAA'),
+        passing_order('BBB', direction='SHORT', entry=50.0),
+        Order(symbol='CCC', direction='long', entry=99.95, signal=Signal(strategy='mean_reversion', zscore=-2.5)),
+    ]
+    account = AccountState(equity=25_000)
+    batch = validate_batch(orders, bars, account)
+    assert len(batch) == len(orders)
+
+    for row, order in zip(batch.itertuples(index=False), orders):
+        report = validate_order(order, bars[order.symbol], account)
+        assert row.approved == (report['result'] == 'APPROVED')
+        assert (row.passed, row.total) == (report['passed'], report['total'])
+        assert row.direction == report['direction']
+        assert row.stop_source == report['risk_summary']['stop_source']
+        assert row.stop == pytest.approx(report['risk_summary']['stop'], abs=1e-4)
+        assert row.shares == report['risk_summary']['shares']
+        failed = [check['name'] for check in report['checks'] if check['status'] == 'FAIL']
+        assert row.failed_checks == '; '.join(failed)
+
+    assert batch['approved'].tolist() == [True, True, False]
+
+
+@pytest.mark.parametrize('order, equity, message', [
+    (Order(symbol='AAA', direction='BUY', entry=100.0), 10_000, 'direction'),
+    (Order(symbol='AAA', direction='LONG', entry=0.0), 10_000, 'entry'),
+    (Order(symbol='AAA', direction='SHORT', entry=-5.0), 10_000, 'entry'),
+    (Order(symbol='AAA', direction='LONG', entry=100.0), 0, 'equity'),
+])
+def test_invalid_inputs_raise(order, equity, message):
+    with pytest.raises(ValueError, match=message):
+        validate_order(order, flat_bars(), AccountState(equity=equity))
+    with pytest.raises(ValueError, match=message):
+        validate_batch([order], {'AAA': flat_bars()}, AccountState(equity=equity))
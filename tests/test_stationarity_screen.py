@@ -0,0 +1,97 @@
+"""
+Tests for the mean-reversion stationarity screen and its refresh cache
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'trading' / 'mean-reversion-detector' / 'scripts'))
+from stationarity_screen import REFRESH_BARS, STAT_WINDOW, StationarityScreen, adf_pvalue, dfa_hurst
+
+SYMBOLS = ['WALK', 'REVERT']
+
+
+def closes(bars=STAT_WINDOW + 60, seed=0) -> np.ndarray:
+    """Row 0 a random walk, row 1 a strongly mean-reverting AR(1), both in log space"""
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0, 0.01, (2, bars))
+    reverting = np.zeros(bars)
+    for t in range(1, bars):
+        reverting[t] = 0.5 * reverting[t - 1] + shocks[1, t]
+    return 100 * np.exp(np.vstack([np.cumsum(shocks[0]), reverting]))
+
+
+def universe(close: np.ndarray, bars: int) -> SimpleNamespace:
+    """First `bars` 5-minute bars of every symbol"""
+    timestamps = pd.date_range('2026-09-01 09:30', periods=close.shape[1], freq='5min').to_numpy()
+    return SimpleNamespace(symbols=SYMBOLS, timestamps=timestamps[:bars], close=close[:, :bars],
+                           volume=np.full((len(SYMBOLS), bars), 50_000.0))
+
+
+def test_statistics_separate_walk_from_mean_reversion():
+    close = closes()
+    hurst, pvalue = dfa_hurst(close), adf_pvalue(close)
+    assert hurst[1] < 0.4 < hurst[0]
+    assert pvalue[1] < 0.01 < 0.1 < pvalue[0]
+
+
+def test_cached_until_refresh_bars_arrive():
+    close = closes()
+    screen = StationarityScreen()
+    first = screen.statistics(universe(close, STAT_WINDOW))
+    assert first['refreshed'].all()
+    assert first['new_bars'].tolist() == [0, 0]
+
+    # Fewer than REFRESH_BARS new bars: cached values come back unchanged
+    partial = screen.statistics(universe(close, STAT_WINDOW + REFRESH_BARS - 1))
+    assert not partial['refreshed'].any()
+    assert partial['new_bars'].tolist() == [REFRESH_BARS - 1] * 2
+    assert partial['hurst'].tolist() == first['hurst'].tolist()
+
+    refreshed = screen.statistics(universe(close, STAT_WINDOW + REFRESH_BARS))
+    assert refreshed['refreshed'].all()
+    assert refreshed['new_bars'].tolist() == [0, 0]
+    expected = dfa_hurst(close[:, :STAT_WINDOW + REFRESH_BARS])
+    assert refreshed['hurst'].to_numpy() == pytest.approx(expected)
+
+
+def test_only_stale_symbols_are_recomputed():
+    close = closes()
+    screen = StationarityScreen()
+    screen.statistics(universe(close, STAT_WINDOW))
+    del screen.cache['REVERT']
+    result = screen.statistics(universe(close, STAT_WINDOW + 1))
+    assert result['refreshed'].tolist() == [False, True]
+    assert result['new_bars'].tolist() == [1, 0]
+
+
+def test_cache_ahead_of_data_is_invalidated():
+    # Bars reloaded from an earlier point (e.g. a backtest rewind)
+    close = closes()
+    screen = StationarityScreen()
+    screen.statistics(universe(close, STAT_WINDOW + 30))
+    result = screen.statistics(universe(close, STAT_WINDOW + 5))
+    assert result['refreshed'].all()
+    assert result['hurst'].to_numpy() == pytest.approx(dfa_hurst(close[:, :STAT_WINDOW + 5]))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    close = closes()
+    screen = StationarityScreen()
+    screen.statistics(universe(close, STAT_WINDOW))
+    screen.save(tmp_path / 'stats.json')
+
+    restored = StationarityScreen()
+    restored.load(tmp_path / 'stats.json')
+    result = restored.statistics(universe(close, STAT_WINDOW + 1))
+    assert not result['refreshed'].any()
+
+    # A cache for another window is ignored
+    other = StationarityScreen(window=STAT_WINDOW // 2)
+    other.load(tmp_path / 'stats.json')
+    assert other.cache == {}
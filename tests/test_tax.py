@@ -0,0 +1,147 @@
+"""
+Tests for portfolio_core.tax wash-sale matching and term classification
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.lots import match_executions
+from portfolio_core.tax import tax_lots
+
+
+def executions(*rows) -> pd.DataFrame:
+    """(datetime, symbol, quantity, price) rows"""
+    frame = pd.DataFrame(rows, columns=['datetime', 'symbol', 'quantity', 'price'])
+    frame['datetime'] = pd.to_datetime(frame['datetime'])
+    return frame
+
+
+def lots_for(*rows) -> pd.DataFrame:
+    matcher = match_executions(executions(*rows))
+    open_lots = pd.DataFrame([vars(lot) for lot in matcher.open_lots()])
+    return tax_lots(matcher.table(), open_lots)
+
+
+def test_loss_is_washed_into_replacement_lot():
+    lots = lots_for(
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-12 10:00', 'AAA', -100, 8.0),   # -200 loss
+        ('2026-01-22 10:00', 'AAA', 100, 8.0),    # replacement within 30 days
+        ('2026-03-02 10:00', 'AAA', -100, 9.0),   # +100 before the adjustment
+    )
+    assert lots['wash_sale_disallowed'].tolist() == pytest.approx([200.0, 0.0])
+    assert lots['basis_adjustment'].tolist() == pytest.approx([0.0, 200.0])
+    assert lots['recognized_pnl'].tolist() == pytest.approx([0.0, -100.0])
+    # The washed lot's 10 days are tacked onto the replacement's 39
+    assert lots['holding_days'].tolist() == [10, 49]
+    assert lots.attrs['deferred_loss'] == 0.0
+
+
+def test_loss_outside_window_is_recognized():
+    lots = lots_for(
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-12 10:00', 'AAA', -100, 8.0),
+        ('2026-02-20 10:00', 'AAA', 100, 8.0),
+        ('2026-03-02 10:00', 'AAA', -100, 9.0),
+    )
+    assert lots['wash_sale_disallowed'].sum() == 0
+    assert lots['recognized_pnl'].tolist() == pytest.approx([-200.0, 100.0])
+
+
+def test_wash_sale_chain_carries_loss_forward():
+    lots = lots_for(
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-05 10:00', 'AAA', -100, 9.0),   # -100, washed into lot 2
+        ('2026-01-10 10:00', 'AAA', 100, 9.0),
+        ('2026-01-15 10:00', 'AAA', -100, 8.5),   # -50 - 100 carried, washed into lot 3
+        ('2026-01-20 10:00', 'AAA', 100, 8.5),
+        ('2026-03-31 10:00', 'AAA', -100, 8.0),   # -50 - 150 carried, no replacement
+    )
+    assert lots['wash_sale_disallowed'].tolist() == pytest.approx([100.0, 150.0, 0.0])
+    assert lots['basis_adjustment'].tolist() == pytest.approx([0.0, 100.0, 150.0])
+    assert lots['recognized_pnl'].tolist() == pytest.approx([0.0, 0.0, -200.0])
+    assert lots['recognized_pnl'].sum() == pytest.approx(lots['realized_pnl'].sum())
+
+
+def test_partial_replacement_disallows_pro_rata():
+    lots = lots_for(
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-12 10:00', 'AAA', -100, 8.0),
+        ('2026-01-20 10:00', 'AAA', 40, 8.0),
+        ('2026-03-02 10:00', 'AAA', -40, 8.0),
+    )
+    assert lots['wash_sale_disallowed'].tolist() == pytest.approx([80.0, 0.0])
+    assert lots['recognized_pnl'].tolist() == pytest.approx([-120.0, -80.0])
+
+
+def test_same_timestamp_lots_are_replacements_for_each_other():
+    # Two purchases at the same instant are separate lots
+    lots = lots_for(
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-12 10:00', 'AAA', -100, 8.0),   # closes the first lot at -200
+    )
+    assert len(lots) == 1
+    assert lots['wash_sale_disallowed'].iloc[0] == pytest.approx(200.0)
+    assert lots.attrs['deferred_loss'] == pytest.approx(200.0)
+
+
+def test_rest_of_the_sold_lot_is_not_a_replacement():
+    # Selling part of one lot at a loss: the remaining shares came from the same purchase
+    lots = lots_for(
+        ('2026-01-02 10:00', 'AAA', 100, 10.0),
+        ('2026-01-12 10:00', 'AAA', -50, 8.0),
+        ('2026-01-20 10:00', 'AAA', -50, 7.0),
+    )
+    assert lots['wash_sale_disallowed'].sum() == 0
+    assert lots['recognized_pnl'].tolist() == pytest.approx([-100.0, -150.0])
+    assert lots.attrs['deferred_loss'] == 0.0
+
+
+def test_rows_without_lot_ids_are_distinct_lots():
+    trades = pd.DataFrame({
+        'symbol': ['AAA', 'AAA'],
+        'entry_time': pd.to_datetime(['2026-01-02', '2026-01-02']),
+        'exit_time': pd.to_datetime(['2026-01-12', '2026-03-02']),
+        'quantity': [100.0, 100.0],
+        'realized_pnl': [-200.0, 50.0],
+    })
+    lots = tax_lots(trades)
+    assert lots['wash_sale_disallowed'].tolist() == pytest.approx([200.0, 0.0])
+    assert lots['recognized_pnl'].tolist() == pytest.approx([0.0, -150.0])
+
+
+@pytest.mark.parametrize('sold, term', [
+    ('2027-01-04 10:00', 'short'),   # exactly one year
+    ('2027-01-05 10:00', 'long'),    # more than one year
+])
+def test_holding_period_term(sold, term):
+    lots = lots_for(
+        ('2026-01-04 10:00', 'AAA', 100, 10.0),
+        (sold, 'AAA', -100, 12.0),
+    )
+    assert lots['term'].tolist() == [term]
+    assert lots['tax_year'].tolist() == [2027]
+
+
+def test_short_sales_are_always_short_term():
+    lots = lots_for(
+        ('2026-01-04 10:00', 'AAA', -100, 10.0),
+        ('2027-06-01 10:00', 'AAA', 100, 8.0),
+    )
+    assert lots['side'].tolist() == ['short']
+    assert lots['term'].tolist() == ['short']
+
+
+def test_tacked_holding_period_can_make_replacement_long_term():
+    lots = lots_for(
+        ('2025-01-02 10:00', 'AAA', 100, 10.0),
+        ('2025-12-01 10:00', 'AAA', -100, 8.0),   # 333 days, washed
+        ('2025-12-10 10:00', 'AAA', 100, 8.0),
+        ('2026-02-02 10:00', 'AAA', -100, 9.0),   # 54 days + 333 tacked on
+    )
+    assert lots['term'].tolist() == ['short', 'long']
@@ -0,0 +1,31 @@
+"""
+Tests for portfolio_core.trade_store
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.ib_statement import parse_statement_text
+from portfolio_core.trade_store import TradeStore
+
+DEPOSITS_ONLY = """\
+Account Information,Header,Field Name,Field Value
+Account Information,Data,Account,U1234567
+Deposits & Withdrawals,Header,Currency,Settle Date,Description,Amount
+Deposits & Withdrawals,Data,USD,2026-09-02,Electronic Fund Transfer,5000
+Deposits & Withdrawals,Data,USD,2026-09-16,Electronic Fund Transfer,2500
+Deposits & Withdrawals,Data,Total,,,7500
+"""
+
+
+def test_ingest_statement_without_trades(tmp_path):
+    statement = parse_statement_text(DEPOSITS_ONLY, path='deposits.csv', sha256='deposits-only')
+    with TradeStore(tmp_path / 'store.sqlite') as store:
+        result = store.ingest(statement)
+        assert result == {'executions_added': 0, 'deposits_added': 2, 'skipped': False}
+        assert store.executions().empty
+        deposits = store.deposits()
+        assert deposits['amount'].tolist() == [5000.0, 2500.0]
+        assert deposits['account'].unique().tolist() == ['U1234567']
+        assert store.ingest(statement)['skipped']
@@ -0,0 +1,43 @@
+"""
+Tests for the trading-analysis agent's list-style trade accessors
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'trading-analysis'))
+from trading_analysis_agent import Trade, TradingAnalysisAgent
+
+
+def make_trade(symbol, pnl, category) -> Trade:
+    return Trade(symbol=symbol, entry_date='2026-03-02 10:00:00', entry_price=10.0,
+                 exit_date='2026-03-02 11:00:00' if category == 'intraday' else '2026-03-04 11:00:00',
+                 exit_price=10.0 + pnl / 100, quantity=100, commission=0.0, realized_pnl=pnl,
+                 holding_period_minutes=60, return_pct=pnl / 10, category=category)
+
+
+def test_trades_round_trip_through_the_table():
+    agent = TradingAnalysisAgent('unused.csv')
+    trades = [make_trade('AAA', 50.0, 'intraday'), make_trade('BBB', -20.0, 'swing')]
+    agent.trades = trades
+
+    assert len(agent.trade_table) == 2
+    assert agent.trades == trades
+    assert agent.calculate_metrics()['net_pnl'] == pytest.approx(30.0)
+
+    # The returned list is a copy
+    agent.trades.append(make_trade('CCC', 10.0, 'swing'))
+    assert len(agent.trades) == 2
+
+
+def test_edge_category_trades_are_lists():
+    agent = TradingAnalysisAgent('unused.csv')
+    agent.trades = [make_trade('AAA', 50.0, 'intraday'), make_trade('BBB', -20.0, 'swing'),
+                    make_trade('AAA', 10.0, 'intraday')]
+    edge = agent.analyze_edge()
+    assert isinstance(edge['intraday_trades'], list)
+    assert [t.realized_pnl for t in edge['intraday_trades']] == [50.0, 10.0]
+    assert [t.symbol for t in edge['swing_trades']] == ['BBB']
+    assert edge['intraday_stats']['count'] == 2
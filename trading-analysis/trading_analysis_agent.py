@@ -9,190 +9,206 @@ Part of astoreyai/claude-skills trading-analysis skill
 
 import csv
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
 
+import numpy as np
 
-@dataclass
-class Trade:
-    """Individual trade data"""
-    symbol: str
-    entry_date: str
-    entry_price: float
-    exit_date: str
-    exit_price: float
-    quantity: int
-    commission: float
-    realized_pnl: float
-    holding_period_minutes: int
-    return_pct: float
-    category: str  # 'intraday' or 'swing'
+# Shared portfolio_core package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from portfolio_core.edge import slice_edges, slices_for
+from portfolio_core.ib_statement import parse_statement
+from portfolio_core.lots import LotMatcher, match_executions
+from portfolio_core.rolling import RollingMetrics, rolling_metrics
+from portfolio_core.trade_table import Trade, TradeTable
+from portfolio_core.trade_store import TradeStore
 
 
 class TradingAnalysisAgent:
     """Main trading analysis agent"""
 
-    def __init__(self, csv_path: str):
-        """Initialize with IB statement CSV"""
+    def __init__(self, csv_path: str, lot_method: str = 'fifo'):
+        """
+        Initialize with IB statement CSV
+
+        Args:
+            csv_path: Path to IB statement CSV
+            lot_method: Lot matching for round trips ('fifo', 'lifo', 'hifo')
+        """
         self.csv_path = Path(csv_path)
-        self.trades: List[Trade] = []
+        self.lot_method = lot_method
+        self.trade_table = TradeTable.from_rows([])
+        self.matcher = LotMatcher(lot_method)
+        self.rolling = RollingMetrics()
+        self.open_lots = []
+        self.executions = None
         self.account_info = {}
         self.capital = 0
         self.deposits = 0
 
-    def parse_csv(self) -> bool:
-        """Parse IB CSV statement"""
+    def parse_csv(self,
+                  store_path: Optional[str] = None,
+                  start: Optional[str] = None,
+                  end: Optional[str] = None) -> bool:
+        """
+        Parse IB CSV statement
+
+        Args:
+            store_path: Trade store to ingest the statement into; executions
+                and deposits are then read back from the store, so history
+                from earlier statements is included
+            start: Inclusive start date for store queries
+            end: Exclusive end date for store queries
+        """
         try:
-            with open(self.csv_path, 'r') as f:
-                reader = csv.reader(f)
-                section = None
-
-                for row in reader:
-                    if len(row) < 3:
-                        continue
-
-                    # Parse account info
-                    if row[0] == 'Account Information' and row[1] == 'Data':
-                        self.account_info[row[2]] = row[3]
-
-                    # Parse trades
-                    if row[0] == 'Trades' and row[1] == 'Data':
-                        self._parse_trade_row(row)
-
-                    # Parse deposits
-                    if row[0] == 'Deposits & Withdrawals' and row[1] == 'Data':
-                        self._parse_deposit_row(row)
-
-                return True
+            statement = parse_statement(str(self.csv_path))
+
+            # Parse account info
+            self.account_info = statement.account_info
+
+            if store_path is not None:
+                with TradeStore(store_path) as store:
+                    store.ingest(statement)
+                    self.executions = store.executions(start, end, asset_category='Stocks')
+                    deposits = store.deposits(start, end)
+            else:
+                # Parse trades (order-level stock executions)
+                self.executions = statement.executions(asset_category='Stocks')
+                deposits = statement.deposits
+
+            # Match executions into round-trip trades
+            self.matcher = match_executions(self.executions, method=self.lot_method)
+            self.trade_table = self.matcher.table()
+            self.open_lots = self.matcher.open_lots()
+            self.rolling = rolling_metrics(self.trade_table)
+
+            # Parse deposits
+            amounts = deposits['amount']
+            self.deposits = float(amounts[amounts > 0].sum())
+
+            return True
         except Exception as e:
             print(f"Error parsing CSV: {e}")
             return False
 
-    def _parse_trade_row(self, row: List) -> None:
-        """Parse individual trade row"""
-        if len(row) < 10:
-            return
-        if row[2] != 'Order' or row[3] != 'Stocks':
-            return
-
-        symbol = row[5]
-        try:
-            quantity = int(row[7])
-            entry_price = float(row[8])
-            # Parse more fields as needed
-            # This is a simplified version
-        except (ValueError, IndexError):
-            pass
-
-    def _parse_deposit_row(self, row: List) -> None:
-        """Parse deposit/withdrawal"""
-        try:
-            amount = float(row[3])
-            if amount > 0:
-                self.deposits += amount
-        except (ValueError, IndexError):
-            pass
+    def on_execution(self,
+                     symbol: str,
+                     timestamp: datetime,
+                     quantity: float,
+                     price: float,
+                     commission: float = 0.0,
+                     code: str = '') -> List[Trade]:
+        """
+        Apply one new fill without re-running the analysis
+
+        Lot matching and the rolling windows update incrementally; call
+        refresh_trade_table() before lifetime reports that need the full table.
+
+        Returns:
+            Trades closed by the fill
+        """
+        closed = self.matcher.add(symbol, timestamp, quantity, price, commission, code)
+        for trade in closed:
+            self.rolling.update(timestamp, trade.realized_pnl, trade.return_pct)
+        return closed
+
+    def refresh_trade_table(self) -> None:
+        """Rebuild trade_table from every round trip matched so far"""
+        self.trade_table = self.matcher.table()
+        self.open_lots = self.matcher.open_lots()
+
+    def rolling_metrics(self) -> Dict[str, Dict]:
+        """Lifetime, last 20/50/100-trade and last 30/90-day metrics"""
+        return self.rolling.snapshot()
+
+    @property
+    def trades(self) -> List[Trade]:
+        """
+        Round-trip trades as Trade objects, materialized from trade_table
+
+        Returns a new list; changing it does not change the analysis. Assign
+        a list of Trade objects to replace trade_table instead.
+        """
+        return list(self.trade_table.trades())
+
+    @trades.setter
+    def trades(self, trades: List[Trade]) -> None:
+        self.trade_table = TradeTable.from_trades(trades)
 
     def calculate_metrics(self) -> Dict:
         """Calculate all trading metrics"""
-        if not self.trades:
+        table = self.trade_table
+        if not len(table):
             return {}
 
-        metrics = {
-            'total_trades': len(self.trades),
-            'winning_trades': len([t for t in self.trades if t.realized_pnl > 0]),
-            'losing_trades': len([t for t in self.trades if t.realized_pnl < 0]),
-            'win_rate': 0,
-            'total_gross_wins': 0,
-            'total_gross_losses': 0,
-            'profit_factor': 0,
-            'avg_winner': 0,
-            'avg_loser': 0,
-            'largest_win': 0,
-            'largest_loss': 0,
-            'net_pnl': 0,
-            'avg_holding_minutes': 0,
+        pnl = table.realized_pnl
+        wins = pnl > 0
+        losses = pnl < 0
+        win_count = int(np.count_nonzero(wins))
+        loss_count = int(np.count_nonzero(losses))
+
+        gross_wins = float(pnl.sum(where=wins))
+        gross_losses = float(pnl.sum(where=losses))
+
+        return {
+            'total_trades': len(table),
+            'winning_trades': win_count,
+            'losing_trades': loss_count,
+            'win_rate': win_count / len(table),
+            'total_gross_wins': gross_wins,
+            'total_gross_losses': gross_losses,
+            'profit_factor': gross_wins / abs(gross_losses) if gross_losses != 0 else 0,
+            'avg_winner': gross_wins / win_count if win_count else 0,
+            'avg_loser': gross_losses / loss_count if loss_count else 0,
+            'largest_win': float(pnl.max(where=wins, initial=-np.inf)) if win_count else 0,
+            'largest_loss': float(pnl.min(where=losses, initial=np.inf)) if loss_count else 0,
+            'net_pnl': gross_wins + gross_losses,
+            'avg_holding_minutes': float(table.holding_minutes.mean()),
         }
 
-        wins = [t for t in self.trades if t.realized_pnl > 0]
-        losses = [t for t in self.trades if t.realized_pnl < 0]
-
-        if wins:
-            metrics['total_gross_wins'] = sum(t.realized_pnl for t in wins)
-            metrics['avg_winner'] = metrics['total_gross_wins'] / len(wins)
-            metrics['largest_win'] = max(t.realized_pnl for t in wins)
-
-        if losses:
-            metrics['total_gross_losses'] = sum(t.realized_pnl for t in losses)
-            metrics['avg_loser'] = metrics['total_gross_losses'] / len(losses)
-            metrics['largest_loss'] = min(t.realized_pnl for t in losses)
-
-        if len(self.trades) > 0:
-            metrics['win_rate'] = len(wins) / len(self.trades)
-
-        if metrics['total_gross_losses'] != 0:
-            metrics['profit_factor'] = metrics['total_gross_wins'] / abs(metrics['total_gross_losses'])
-
-        metrics['net_pnl'] = metrics['total_gross_wins'] + metrics['total_gross_losses']
+    @staticmethod
+    def _category_stats(stats: Optional[Dict]) -> Dict:
+        """Count, win rate, P&L and average return of a category slice"""
+        if not stats:
+            return {}
+        return {
+            'count': stats['trades'],
+            'win_rate': stats['win_rate'],
+            'total_pnl': stats['total_pnl'],
+            'avg_return': stats['avg_return_pct'],
+        }
 
-        if len(self.trades) > 0:
-            metrics['avg_holding_minutes'] = sum(t.holding_period_minutes for t in self.trades) / len(self.trades)
+    def analyze_edge(self, time_windows: Optional[Dict] = None) -> Dict:
+        """
+        Identify trading edges
 
-        return metrics
+        Args:
+            time_windows: name -> (start, end) time-of-day windows
+                (defaults to portfolio_core.edge.DEFAULT_TIME_WINDOWS)
+        """
+        table = self.trade_table
+        slices = slice_edges(table, time_windows=time_windows)
+        categories = slices_for(slices, 'category')
 
-    def analyze_edge(self) -> Dict:
-        """Identify trading edges"""
         edge_analysis = {
-            'intraday_trades': [],
-            'swing_trades': [],
-            'intraday_stats': {},
-            'swing_stats': {},
-            'symbol_stats': {},
-            'time_analysis': {},
+            'intraday_trades': table[table.intraday].trades(),
+            'swing_trades': table[~table.intraday].trades(),
+            'intraday_stats': self._category_stats(categories.get('intraday')),
+            'swing_stats': self._category_stats(categories.get('swing')),
+            'symbol_stats': {
+                symbol: {
+                    'trades': stats['trades'],
+                    'total_pnl': stats['total_pnl'],
+                    'avg_return': stats['avg_return_pct'],
+                }
+                for symbol, stats in slices_for(slices, 'symbol').items()
+            },
+            'time_analysis': slices_for(slices, 'time_window'),
+            'slices': slices,
         }
 
-        # Categorize trades
-        intraday = [t for t in self.trades if t.category == 'intraday']
-        swing = [t for t in self.trades if t.category == 'swing']
-
-        edge_analysis['intraday_trades'] = intraday
-        edge_analysis['swing_trades'] = swing
-
-        # Calculate stats by category
-        if intraday:
-            edge_analysis['intraday_stats'] = {
-                'count': len(intraday),
-                'win_rate': len([t for t in intraday if t.realized_pnl > 0]) / len(intraday),
-                'total_pnl': sum(t.realized_pnl for t in intraday),
-                'avg_return': sum(t.return_pct for t in intraday) / len(intraday),
-            }
-
-        if swing:
-            edge_analysis['swing_stats'] = {
-                'count': len(swing),
-                'win_rate': len([t for t in swing if t.realized_pnl > 0]) / len(swing),
-                'total_pnl': sum(t.realized_pnl for t in swing),
-                'avg_return': sum(t.return_pct for t in swing) / len(swing),
-            }
-
-        # Symbol stats
-        symbols = {}
-        for trade in self.trades:
-            if trade.symbol not in symbols:
-                symbols[trade.symbol] = {'count': 0, 'pnl': 0, 'returns': []}
-            symbols[trade.symbol]['count'] += 1
-            symbols[trade.symbol]['pnl'] += trade.realized_pnl
-            symbols[trade.symbol]['returns'].append(trade.return_pct)
-
-        for symbol, data in symbols.items():
-            edge_analysis['symbol_stats'][symbol] = {
-                'trades': data['count'],
-                'total_pnl': data['pnl'],
-                'avg_return': sum(data['returns']) / len(data['returns']),
-            }
-
         return edge_analysis
 
     def generate_markdown_report(self) -> str:
@@ -269,7 +285,8 @@ def main():
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python trading_analysis_agent.py <csv_path> [--output markdown|latex|csv]")
+        print("Usage: python trading_analysis_agent.py <csv_path> [--output markdown|latex|csv] "
+              "[--store PATH] [--since DATE] [--until DATE] [--lots fifo|lifo|hifo]")
         sys.exit(1)
 
     csv_path = sys.argv[1]
@@ -280,8 +297,15 @@ def main():
         if idx + 1 < len(sys.argv):
             output_format = sys.argv[idx + 1]
 
-    agent = TradingAnalysisAgent(csv_path)
-    if agent.parse_csv():
+    def option(name: str) -> Optional[str]:
+        if name in sys.argv:
+            idx = sys.argv.index(name)
+            if idx + 1 < len(sys.argv):
+                return sys.argv[idx + 1]
+        return None
+
+    agent = TradingAnalysisAgent(csv_path, lot_method=option('--lots') or 'fifo')
+    if agent.parse_csv(store_path=option('--store'), start=option('--since'), end=option('--until')):
         if output_format == 'markdown':
             report = agent.generate_markdown_report()
             print(report)